@@ -4,15 +4,71 @@ This package provides implementations of the Huffman compression algorithm
 using test-driven development principles.
 """
 
-from .compression.compressor import HuffmanCompressor
+from .compression.adaptive_compressor import AdaptiveCompressor
+from .compression.async_compressor import compress_async
+from .compression.batch_compressor import PackedBatch, compress_batch, compress_many
+from .compression.block_compressor import BlockCompressor
+from .compression.compressor import HuffmanCompressor, compress_bytes
+from .compression.context_compressor import ContextCompressor
+from .compression.dictionary_compressor import DictionaryCompressor
 from .compression.frequency_counter import create_frequency_map
-from .compression.huffman_tree_builder import HuffmanNode, build_huffman_tree
-from .decompression.decompressor import HuffmanDecompressor
+from .compression.huffman_tree_builder import (
+    FlatTree,
+    HuffmanNode,
+    build_flat_tree,
+    build_huffman_tree,
+)
+from .compression.run_length_compressor import RunLengthCompressor
+from .compression.stage_metrics import MetricsCollector, StageMetrics
+from .compression.static_table import (
+    StaticCodeTable,
+    train_static_table,
+    write_static_table,
+)
+from .compression.wide_compressor import WideCompressor
+from .decompression.async_decompressor import decompress_async
+from .decompression.batch_decompressor import decompress_batch, decompress_many
+from .decompression.block_decompressor import BlockDecompressor
+from .decompression.decompressor import (
+    HuffmanDecompressor,
+    decompress_bytes,
+    decompress_range,
+    iter_decompress,
+)
+from .decompression.dictionary_decompressor import DictionaryDecompressor
+from .decompression.static_table_reader import read_static_table
 
 __all__ = [
     "HuffmanCompressor",
     "HuffmanDecompressor",
+    "BlockCompressor",
+    "BlockDecompressor",
+    "AdaptiveCompressor",
+    "ContextCompressor",
+    "WideCompressor",
+    "RunLengthCompressor",
+    "iter_decompress",
+    "compress_bytes",
+    "decompress_bytes",
+    "decompress_range",
+    "DictionaryCompressor",
+    "DictionaryDecompressor",
+    "StaticCodeTable",
+    "train_static_table",
+    "write_static_table",
+    "read_static_table",
+    "compress_many",
+    "decompress_many",
+    "compress_batch",
+    "decompress_batch",
+    "PackedBatch",
+    "compress_async",
+    "decompress_async",
+    "MetricsCollector",
+    "StageMetrics",
     "create_frequency_map",
     "HuffmanNode",
     "build_huffman_tree",
+    "FlatTree",
+    "build_flat_tree",
 ]
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Huffman Throughput Benchmark
+
+Times compression and decompression separately for each corpus and size,
+alongside zlib, bz2 and lzma for context, and flags regressions against a
+stored baseline. Throughput is compared as a multiple of zlib's on the same
+input, so a baseline recorded on one machine holds on another.
+
+Usage:
+    python -m tdd_ai_py.benchmark [--sizes 1K,64K,1M] [--corpora text,random]
+        [--output results.json] [--baseline baseline.json] [--save-baseline]
+
+Examples:
+    # Default sizes and corpora, compared with the committed baseline
+    python -m tdd_ai_py.benchmark --baseline benchmarks/baseline.json
+
+    # Regenerate the committed baseline (make benchmark-baseline)
+    python -m tdd_ai_py.benchmark --baseline benchmarks/baseline.json --save-baseline
+
+    # Up to 1 GiB, Huffman only
+    python -m tdd_ai_py.benchmark --sizes 1K,1M,1G --codecs huffman
+
+    # One-pass adaptive mode against the two-pass default
+    python -m tdd_ai_py.benchmark --codecs huffman,huffman-adaptive
+
+    # Order-1 context model against the single table on text
+    python -m tdd_ai_py.benchmark --codecs huffman,huffman-context --corpora text
+
+    # 16-bit symbols against bytes on skewed data
+    python -m tdd_ai_py.benchmark --codecs huffman,huffman-wide --corpora skewed
+
+    # Run-length tokens against bytes on a single repeated byte
+    python -m tdd_ai_py.benchmark --codecs huffman,huffman-rle --corpora single_byte
+"""
+
+import argparse
+import bz2
+import json
+import lzma
+import platform
+import random
+import struct
+import sys
+import time
+import zlib
+from io import BytesIO
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .compression.adaptive_compressor import AdaptiveCompressor
+from .compression.compressor import compress_bytes
+from .compression.context_compressor import ContextCompressor
+from .compression.numpy_engine import NUMPY_AVAILABLE
+from .compression.run_length_compressor import RunLengthCompressor
+from .compression.stream_utils import ByteBuffer
+from .compression.wide_compressor import WideCompressor
+from .decompression.decompressor import decompress_bytes
+
+# Corpora are generated once at this size and tiled for larger inputs, which
+# leaves order-0 statistics unchanged while keeping generation cheap.
+CORPUS_TILE_SIZE = 1 << 20
+DEFAULT_SIZES = "1K,64K,1M"
+DEFAULT_MIN_TIME = 0.2
+MAX_REPEATS = 20
+DEFAULT_TOLERANCE = 0.5
+# Throughput is measured against this codec, run on the same input and machine
+REFERENCE_CODEC = "zlib"
+RATIO_TOLERANCE = 0.001
+SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+_WORDS = (
+    "the of and to in a is that for it as was with be by on not he this are or "
+    "his from at which but have an they you were her she there been one all we "
+    "their has would when if so no will more can out up into other time only "
+    "huffman tree code length symbol frequency stream block table decode encode"
+).split()
+
+
+class BenchmarkResult(NamedTuple):
+    codec: str
+    corpus: str
+    size: int
+    ratio: float
+    compress_mbps: float
+    decompress_mbps: float
+
+
+def _text_tile(rng: random.Random) -> bytes:
+    weights = [1 / (rank + 1) for rank in range(len(_WORDS))]
+    words = rng.choices(_WORDS, weights, k=CORPUS_TILE_SIZE // 4)
+    lines = [" ".join(words[start : start + 12]) for start in range(0, len(words), 12)]
+    return (".\n".join(lines)).encode()
+
+
+def _binary_tile(rng: random.Random) -> bytes:
+    records = bytearray()
+    while len(records) < CORPUS_TILE_SIZE:
+        records += struct.pack(
+            "<IHhfQ",
+            len(records),
+            rng.randrange(64),
+            rng.randrange(-300, 300),
+            rng.gauss(0, 100),
+            rng.getrandbits(rng.choice((8, 16, 64))),
+        )
+    return bytes(records)
+
+
+_TILES: Dict[str, Callable[[random.Random], bytes]] = {
+    "text": _text_tile,
+    "random": lambda rng: rng.randbytes(CORPUS_TILE_SIZE),
+    "single_byte": lambda rng: b"a" * CORPUS_TILE_SIZE,
+    "skewed": lambda rng: bytes(
+        min(int(rng.expovariate(0.05)), 255) for _ in range(CORPUS_TILE_SIZE)
+    ),
+    "binary": _binary_tile,
+}
+CORPORA = tuple(_TILES)
+
+
+def _compress_adaptive(data: bytes) -> bytes:
+    output_stream = BytesIO()
+    AdaptiveCompressor().compress_buffer(data, output_stream)
+    return output_stream.getvalue()
+
+
+def _compress_context(data: bytes) -> bytes:
+    output_stream = BytesIO()
+    ContextCompressor().compress_buffer(data, output_stream)
+    return output_stream.getvalue()
+
+
+def _compress_wide(data: bytes) -> bytes:
+    output_stream = BytesIO()
+    WideCompressor().compress_buffer(data, output_stream)
+    return output_stream.getvalue()
+
+
+def _compress_run_length(data: bytes) -> bytes:
+    output_stream = BytesIO()
+    RunLengthCompressor().compress_buffer(data, output_stream)
+    return output_stream.getvalue()
+
+
+CODECS: Dict[str, Codec] = {
+    "huffman": (compress_bytes, decompress_bytes),
+    "huffman-adaptive": (_compress_adaptive, decompress_bytes),
+    "huffman-context": (_compress_context, decompress_bytes),
+    "huffman-wide": (_compress_wide, decompress_bytes),
+    "huffman-rle": (_compress_run_length, decompress_bytes),
+    "zlib": (zlib.compress, zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+# The adaptive coder runs well under 1 MB/s, so it is opt-in via --codecs
+DEFAULT_CODECS = (
+    "huffman",
+    "huffman-context",
+    "huffman-wide",
+    "huffman-rle",
+    "zlib",
+    "bz2",
+    "lzma",
+)
+
+
+def generate_corpus(name: str, size: int) -> bytes:
+    """Return ``size`` deterministic bytes of the named corpus."""
+    tile = _TILES[name](random.Random(name))
+    repeats = -(-size // len(tile))
+    return (tile * repeats)[:size]
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as ``512``, ``64K``, ``1M`` or ``1G`` (binary units)."""
+    text = text.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    number = int(text[: len(text) - len(unit)])
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive size, got {text}")
+    return number * SIZE_UNITS[unit]
+
+
+def format_size(size: int) -> str:
+    for unit in ("G", "M", "K"):
+        if size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}"
+    return str(size)
+
+
+def _best_time(function: Callable[[], ByteBuffer], min_time: float) -> float:
+    """Shortest of repeated runs, repeating until ``min_time`` has elapsed."""
+    best = float("inf")
+    elapsed = 0.0
+    for _ in range(MAX_REPEATS):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        best = min(best, duration)
+        elapsed += duration
+        if elapsed >= min_time:
+            break
+    return max(best, 1e-9)
+
+
+def time_codec(
+    name: str, codec: Codec, corpus: str, data: bytes, min_time: float
+) -> BenchmarkResult:
+    compress, decompress = codec
+    compressed = compress(data)
+    if decompress(compressed) != data:
+        raise AssertionError(f"{name} failed to round-trip {corpus}")
+    megabytes = len(data) / 1e6
+    return BenchmarkResult(
+        name,
+        corpus,
+        len(data),
+        len(compressed) / len(data),
+        megabytes / _best_time(lambda: compress(data), min_time),
+        megabytes / _best_time(lambda: decompress(compressed), min_time),
+    )
+
+
+def run_benchmarks(
+    corpora: Sequence[str],
+    sizes: Sequence[int],
+    codecs: Sequence[str],
+    min_time: float = DEFAULT_MIN_TIME,
+) -> List[BenchmarkResult]:
+    results = []
+    for corpus in corpora:
+        for size in sizes:
+            data = generate_corpus(corpus, size)
+            for name in codecs:
+                results.append(time_codec(name, CODECS[name], corpus, data, min_time))
+    return results
+
+
+def results_to_json(results: Sequence[BenchmarkResult]) -> Dict[str, object]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": NUMPY_AVAILABLE,
+        "results": [result._asdict() for result in results],
+    }
+
+
+def results_from_json(document: Dict[str, object]) -> List[BenchmarkResult]:
+    entries = document["results"]
+    assert isinstance(entries, list)
+    return [BenchmarkResult(**entry) for entry in entries]
+
+
+ResultKey = Tuple[str, str, int]
+
+
+def relative_throughput(
+    results: Sequence[BenchmarkResult],
+) -> Dict[ResultKey, Tuple[float, float]]:
+    """Compress and decompress MB/s of each result as multiples of the reference.
+
+    The reference is ``REFERENCE_CODEC`` on the same corpus and size. Results
+    without one are left out.
+    """
+    references = {
+        (result.corpus, result.size): result
+        for result in results
+        if result.codec == REFERENCE_CODEC
+    }
+    relative = {}
+    for result in results:
+        reference = references.get((result.corpus, result.size))
+        if reference is not None:
+            relative[(result.codec, result.corpus, result.size)] = (
+                result.compress_mbps / reference.compress_mbps,
+                result.decompress_mbps / reference.decompress_mbps,
+            )
+    return relative
+
+
+def find_regressions(
+    results: Sequence[BenchmarkResult],
+    baseline: Sequence[BenchmarkResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """Describe every Huffman result that is worse than its baseline.
+
+    Throughput is compared relative to ``REFERENCE_CODEC``, so a faster or
+    slower machine does not read as a change, and may drop by up to
+    ``tolerance`` (a fraction) to absorb timing noise. Results without a
+    reference in both runs are compared on ratio alone. Ratios are
+    deterministic and are flagged on any real increase. Other codecs are
+    context only and never flagged.
+    """
+    expected = {(entry.codec, entry.corpus, entry.size): entry for entry in baseline}
+    expected_speed = relative_throughput(baseline)
+    speed = relative_throughput(results)
+    regressions = []
+    for result in results:
+        key = (result.codec, result.corpus, result.size)
+        base = expected.get(key)
+        if base is None or not result.codec.startswith("huffman"):
+            continue
+        label = f"{result.codec} {result.corpus} {format_size(result.size)}"
+        if key in speed and key in expected_speed:
+            fields = ("compress_mbps", "decompress_mbps")
+            for field, now, before in zip(fields, speed[key], expected_speed[key]):
+                if now < before * (1 - tolerance):
+                    regressions.append(
+                        f"{label}: {field} {now:.3f}x {REFERENCE_CODEC} "
+                        f"< baseline {before:.3f}x {REFERENCE_CODEC}"
+                    )
+        if result.ratio > base.ratio * (1 + RATIO_TOLERANCE):
+            regressions.append(
+                f"{label}: ratio {result.ratio:.4f} > baseline {base.ratio:.4f}"
+            )
+    return regressions
+
+
+def format_table(results: Sequence[BenchmarkResult]) -> str:
+    lines = [
+        f"{'codec':<16} {'corpus':<12} {'size':>6} {'ratio':>7} "
+        f"{'comp MB/s':>10} {'decomp MB/s':>12}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.codec:<16} {result.corpus:<12} {format_size(result.size):>6} "
+            f"{result.ratio:>7.3f} {result.compress_mbps:>10.2f} "
+            f"{result.decompress_mbps:>12.2f}"
+        )
+    return "\n".join(lines)
+
+
+def _names(choices: Sequence[str]) -> Callable[[str], List[str]]:
+    def parse(text: str) -> List[str]:
+        names = [name.strip() for name in text.split(",")]
+        unknown = [name for name in names if name not in choices]
+        if unknown:
+            raise argparse.ArgumentTypeError(
+                f"unknown {', '.join(unknown)}; choose from {', '.join(choices)}"
+            )
+        return names
+
+    return parse
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="huffman-benchmark", description="Measure Huffman codec throughput."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: [parse_size(size) for size in text.split(",")],
+        default=[parse_size(size) for size in DEFAULT_SIZES.split(",")],
+        help=f"comma-separated input sizes, e.g. 1K,1M,1G (default {DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "--corpora", type=_names(CORPORA), default=list(CORPORA), help="corpora to run"
+    )
+    parser.add_argument(
+        "--codecs",
+        type=_names(tuple(CODECS)),
+        default=list(DEFAULT_CODECS),
+        help=f"codecs (default {','.join(DEFAULT_CODECS)})",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help="seconds to spend repeating each measurement",
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="overwrite --baseline with these results instead of comparing",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=(
+            f"allowed fractional drop in throughput relative to {REFERENCE_CODEC} "
+            "before flagging a regression"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmarks; exit with status 1 if any regression is flagged."""
+    args = parse_args(argv)
+    results = run_benchmarks(args.corpora, args.sizes, args.codecs, args.min_time)
+    print(format_table(results))
+
+    document = results_to_json(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(document, output_file, indent=2)
+    if not args.baseline:
+        return
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(document, baseline_file, indent=2)
+        return
+
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = results_from_json(json.load(baseline_file))
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,58 +4,299 @@
 Huffman Compression Script
 
 Usage:
-    python -m tdd_ai_py.compress <input_file | ->
+    python -m tdd_ai_py.compress [--jobs N] [--block-size BYTES] [--sample-chunks N]
+        [--adaptive | --context | --wide | --run-length] [--stats] <input_file | ->
 
 Examples:
     # From file to stdout
     python -m tdd_ai_py.compress input.txt > compressed.bin
 
-    # From stdin to stdout
+    # From stdin to stdout, streamed in 1 MiB blocks
     cat input.txt | python -m tdd_ai_py.compress - > compressed.bin
+
+    # Block container compressed on 8 processes
+    python -m tdd_ai_py.compress --jobs 8 input.bin > compressed.bin
+
+    # Build the code from 64 sampled chunks and read the file only once
+    python -m tdd_ai_py.compress --sample-chunks 64 input.bin > compressed.bin
+
+    # One pass with adaptive Huffman: no rewind, no header, streams from stdin
+    producer | python -m tdd_ai_py.compress --adaptive - > compressed.bin
+
+    # Order-1 context model: a code table per preceding byte, for text and logs
+    python -m tdd_ai_py.compress --context server.log > compressed.bin
+
+    # Code byte pairs as 16-bit symbols: half the per-symbol work
+    python -m tdd_ai_py.compress --wide samples.raw > compressed.bin
+
+    # Code runs of equal bytes as single tokens, for sparse and zero-filled files
+    python -m tdd_ai_py.compress --run-length disk.img > compressed.bin
+
+    # Print the time spent in each stage to stderr
+    python -m tdd_ai_py.compress --stats input.txt > compressed.bin
 """
 
+import argparse
 import sys
-from io import BytesIO
-from typing import BinaryIO, Optional
+from shutil import copyfileobj
+from tempfile import TemporaryFile
+from typing import BinaryIO, Callable, Dict, List, Optional, Protocol, Union
+
+from .compression.adaptive_compressor import AdaptiveCompressor
+from .compression.block_compressor import BlockCompressor
+from .compression.block_format import DEFAULT_BLOCK_SIZE
+from .compression.compressor import MAX_INPUT_LENGTH, HuffmanCompressor
+from .compression.context_compressor import ContextCompressor
+from .compression.run_length_compressor import RunLengthCompressor
+from .compression.stage_metrics import MetricsCallback, MetricsCollector, stage_recorder
+from .compression.stream_utils import (
+    ByteBuffer,
+    ByteCounter,
+    iter_chunks,
+    map_file,
+    mapped_view,
+)
+from .compression.wide_compressor import WideCompressor
+
+
+class ModeCompressor(Protocol):
+    """The interface ``compress_stream`` and ``compress_file`` drive for a mode."""
+
+    def compress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        ...
+
+    def compress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        ...
 
-from .compression.compressor import HuffmanCompressor
 
+# Compressor factories, taking the metrics callback, by ``mode`` name
+MODE_COMPRESSORS: Dict[str, Callable[[Optional[MetricsCallback]], ModeCompressor]] = {
+    "adaptive": lambda metrics: AdaptiveCompressor(),
+    "context": lambda metrics: ContextCompressor(metrics=metrics),
+    "wide": lambda metrics: WideCompressor(metrics=metrics),
+    "run_length": lambda metrics: RunLengthCompressor(metrics=metrics),
+}
+MODES = tuple(MODE_COMPRESSORS)
 
-def validate_args() -> Optional[str]:
-    """Validate args and return input filename or '-' for stdin, or None."""
-    return sys.argv[1] if len(sys.argv) == 2 else None
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
 
-def compress_stream(input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse args: an input filename or '-' for stdin, plus options."""
+    parser = argparse.ArgumentParser(
+        prog="huffman-compress", description="Compress a file or stdin to stdout."
+    )
+    parser.add_argument("input_filename", help="file to compress, or '-' for stdin")
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=None,
+        help="write the block container format, compressing blocks on N processes",
+    )
+    parser.add_argument(
+        "--block-size",
+        type=positive_int,
+        default=None,
+        help="write the block container format with blocks of BYTES (default 1 MiB)",
+    )
+    parser.add_argument(
+        "--sample-chunks",
+        type=positive_int,
+        default=None,
+        help="build the code from N sampled chunks and encode in a single pass",
+    )
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--adaptive",
+        dest="mode",
+        action="store_const",
+        const="adaptive",
+        help="code in one pass with adaptive Huffman: no rewind and no header",
+    )
+    modes.add_argument(
+        "--context",
+        dest="mode",
+        action="store_const",
+        const="context",
+        help="code each byte with a table for its preceding byte (order-1 model)",
+    )
+    modes.add_argument(
+        "--wide",
+        dest="mode",
+        action="store_const",
+        const="wide",
+        help="code byte pairs as 16-bit symbols instead of single bytes",
+    )
+    modes.add_argument(
+        "--run-length",
+        dest="mode",
+        action="store_const",
+        const="run_length",
+        help="code runs of equal bytes as single tokens, for sparse input",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print the time, bytes, symbols and bits of each stage to stderr",
+    )
+    args = parser.parse_args(argv)
+    blocks = args.jobs is not None or args.block_size is not None
+    if args.mode is not None and (blocks or args.sample_chunks is not None):
+        flag = "--" + args.mode.replace("_", "-")
+        parser.error(
+            f"{flag} cannot be combined with --jobs, --block-size or --sample-chunks"
+        )
+    if args.sample_chunks is not None and blocks:
+        parser.error("--sample-chunks cannot be combined with --jobs or --block-size")
+    return args
+
+
+def _compress_mode(
+    mode: str,
+    source: Union[BinaryIO, memoryview],
+    output_stream: BinaryIO,
+    metrics: Optional[MetricsCallback],
+) -> None:
+    """Compress a stream or mapped view with the compressor ``mode`` selects.
+
+    ``MODE_COMPRESSORS`` other than adaptive need two passes, so a
+    non-seekable stream is first spooled to a temporary file.
+    """
+    if mode not in MODE_COMPRESSORS:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+    recorder = stage_recorder(metrics)
+    compressor = MODE_COMPRESSORS[mode](metrics)
+    if isinstance(source, memoryview):
+        compressor.compress_buffer(source, output_stream)
+    elif mode == "adaptive" or source.seekable():
+        compressor.compress(source, output_stream)
+    else:
+        with TemporaryFile() as spool:
+            copyfileobj(source, spool)
+            spool.seek(0)
+            compressor.compress(spool, output_stream)
+    if mode == "adaptive":
+        length = len(source) if isinstance(source, memoryview) else 0
+        recorder.lap("compress_adaptive", length, length)
+
+
+def compress_stream(
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    jobs: Optional[int] = None,
+    block_size: Optional[int] = None,
+    sample_chunks: Optional[int] = None,
+    metrics: Optional[MetricsCallback] = None,
+    mode: Optional[str] = None,
+) -> None:
     """Compress a binary stream using Huffman compression.
 
-    If the input stream is not seekable (e.g., stdin), it will be fully read into
-    memory first so the compressor can perform two passes without relying on seek().
+    Seekable inputs get the two-pass single-table format unless ``jobs`` or
+    ``block_size`` is set; ``sample_chunks`` replaces its first pass with a
+    sample, and is rejected for non-seekable input, which cannot be sampled.
+    Non-seekable inputs (e.g., stdin), ``jobs`` and ``block_size`` use the block
+    container instead: each ``block_size`` window (``DEFAULT_BLOCK_SIZE`` if
+    unset) gets its own table and is written as a self-describing block, in a
+    single pass with memory bounded by the window.
+    ``mode`` selects one of ``MODES`` instead: ``"adaptive"`` writes an
+    ``AdaptiveCompressor`` stream from any input, and ``"context"``,
+    ``"wide"`` and ``"run_length"`` write ``ContextCompressor``,
+    ``WideCompressor`` and ``RunLengthCompressor`` streams. Those need two
+    passes, so non-seekable input is first spooled to a temporary file.
+    The block container and adaptive streams are reported to ``metrics`` as a
+    single ``compress_blocks`` or ``compress_adaptive`` stage.
     """
-    if not input_stream.seekable():
-        input_stream = BytesIO(input_stream.read())
-    HuffmanCompressor().compress(input_stream, output_stream)
+    if mode is not None:
+        _compress_mode(mode, input_stream, output_stream, metrics)
+        return
+    if sample_chunks is not None and not input_stream.seekable():
+        raise ValueError("sample_chunks needs a seekable input")
+    if jobs is None and block_size is None and input_stream.seekable():
+        HuffmanCompressor(sample_chunks=sample_chunks, metrics=metrics).compress(
+            input_stream, output_stream
+        )
+        return
+    recorder = stage_recorder(metrics)
+    if block_size is None:
+        block_size = DEFAULT_BLOCK_SIZE
+    chunks = ByteCounter(iter_chunks(input_stream, block_size))
+    BlockCompressor(block_size=block_size, jobs=jobs or 1).compress_chunks(
+        chunks, output_stream
+    )
+    recorder.lap("compress_blocks", chunks.byte_count, chunks.byte_count)
+
 
+def compress_file(
+    input_filename: str,
+    output_stream: BinaryIO,
+    jobs: Optional[int] = None,
+    block_size: Optional[int] = None,
+    sample_chunks: Optional[int] = None,
+    metrics: Optional[MetricsCallback] = None,
+    mode: Optional[str] = None,
+) -> None:
+    """Compress a file using Huffman compression.
 
-def compress_file(input_filename: str, output_stream: BinaryIO) -> None:
-    """Compress a file using Huffman compression."""
+    Options are as for ``compress_stream``. Regular files are memory-mapped and
+    compressed from zero-copy memoryview slices. Files too large for the
+    single-table format's 4-byte length header are written as a block
+    container, whose lengths are varints.
+    """
     with open(input_filename, "rb") as input_file:
-        compress_stream(input_file, output_stream)
+        mapped = map_file(input_file)
+        if mapped is None:
+            compress_stream(
+                input_file, output_stream, jobs, block_size, sample_chunks, metrics, mode
+            )
+            return
+        with mapped_view(mapped) as view:
+            if mode is not None:
+                _compress_mode(mode, view, output_stream, metrics)
+            elif jobs is None and block_size is None and len(view) <= MAX_INPUT_LENGTH:
+                HuffmanCompressor(
+                    sample_chunks=sample_chunks, metrics=metrics
+                ).compress_buffer(view, output_stream)
+            else:
+                recorder = stage_recorder(metrics)
+                BlockCompressor(
+                    block_size=DEFAULT_BLOCK_SIZE if block_size is None else block_size,
+                    jobs=jobs or 1,
+                ).compress_buffer(view, output_stream)
+                recorder.lap("compress_blocks", len(view), len(view))
 
 
 def main() -> None:
     """Main function to compress a file or stdin and output to stdout."""
-    input_filename = validate_args()
-
-    if not input_filename:
-        print("Usage: python -m tdd_ai_py.compress <input_file | ->", file=sys.stderr)
-        sys.exit(1)
+    args = parse_args()
+    input_filename = args.input_filename
+    collector = MetricsCollector() if args.stats else None
 
     try:
         if input_filename == "-":
-            compress_stream(sys.stdin.buffer, sys.stdout.buffer)
+            compress_stream(
+                sys.stdin.buffer,
+                sys.stdout.buffer,
+                args.jobs,
+                args.block_size,
+                args.sample_chunks,
+                collector,
+                args.mode,
+            )
         else:
-            compress_file(input_filename, sys.stdout.buffer)
+            compress_file(
+                input_filename,
+                sys.stdout.buffer,
+                args.jobs,
+                args.block_size,
+                args.sample_chunks,
+                collector,
+                args.mode,
+            )
     except FileNotFoundError:
         print(f"Error: File '{input_filename}' not found.", file=sys.stderr)
         sys.exit(1)
@@ -65,6 +306,8 @@ def main() -> None:
     except (OSError, IOError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    if collector is not None:
+        print(collector.format_report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+from typing import BinaryIO, Iterable
+
+from .adaptive_huffman import ADAPTIVE_MAGIC, END_OF_STREAM, AdaptiveHuffmanTree
+from .bit_writer import BitWriter
+from .stream_utils import ByteBuffer, iter_chunks, iter_slices
+
+DEFAULT_ADAPTIVE_CHUNK_SIZE = 8192
+
+
+class AdaptiveCompressor:
+    """One-pass adaptive Huffman compressor.
+
+    The code adapts as bytes arrive (see ``AdaptiveHuffmanTree``), so there
+    is no frequency pass, no ``seek``, no serialized tree and no length
+    header: the output is ``ADAPTIVE_MAGIC`` followed by the bit stream, which
+    ends with an end-of-stream escape. Input is read ``chunk_size`` bytes at a
+    time, and the complete output bytes are written after every chunk.
+    ``HuffmanDecompressor`` recognises the stream by its magic.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_ADAPTIVE_CHUNK_SIZE) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self._chunk_size = chunk_size
+
+    def compress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        self._write(iter_chunks(input_stream, self._chunk_size), output_stream)
+
+    def compress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        self._write(iter_slices(memoryview(data), self._chunk_size), output_stream)
+
+    @staticmethod
+    def _write(chunks: Iterable[ByteBuffer], output_stream: BinaryIO) -> None:
+        output_stream.write(ADAPTIVE_MAGIC)
+        bit_writer = BitWriter(output_stream)
+        encode = AdaptiveHuffmanTree().encode
+        for chunk in chunks:
+            for byte in chunk:
+                encode(byte, bit_writer)
+            bit_writer.emit_complete_bytes()
+        encode(END_OF_STREAM, bit_writer)
+        bit_writer.flush()
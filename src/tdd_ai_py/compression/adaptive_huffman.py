@@ -0,0 +1,220 @@
+from typing import Callable, List, Tuple
+
+from .bit_writer import BitWriter
+
+ADAPTIVE_MAGIC = b"\x89HA\x01"
+END_OF_STREAM = 256
+SYMBOL_BITS = 9
+
+# Every byte value plus the not-yet-transmitted (NYT) leaf
+_MAX_NODES = 2 * (END_OF_STREAM + 1) - 1
+_TOP = _MAX_NODES - 1
+_ROOT = 0
+# Numbered just above the root with an impossible weight, so block scans stop
+# there without a bounds check.
+_SENTINEL = _MAX_NODES
+
+# ``BitReader.read_bit``/``read_bits``; passed in so compression need not import
+# the decompression package.
+ReadBit = Callable[[], int]
+ReadBits = Callable[[int], int]
+
+
+class AdaptiveHuffmanTree:
+    """Dynamic Huffman tree updated after every symbol (Vitter's algorithm V).
+
+    Encoder and decoder start from the same empty tree and apply the same
+    ``update`` after each symbol, so the code never has to be transmitted. A
+    byte seen for the first time is sent as the NYT leaf's code followed by
+    its ``SYMBOL_BITS``-bit value. ``END_OF_STREAM`` is sent the same way and
+    never enters the tree.
+
+    Nodes live in flat lists indexed by node ID. ``_number``/``_node_at`` hold
+    Vitter's implicit numbering: weights never decrease with the number, and
+    within a weight all leaves come before all internal nodes.
+    """
+
+    def __init__(self) -> None:
+        size = _MAX_NODES + 1
+        self._weight = [0] * size
+        self._parent = [-1] * size
+        self._left = [-1] * size
+        self._right = [-1] * size
+        self._symbol = [-1] * size
+        self._number = [0] * size
+        self._node_at = [0] * size
+        self._leaf_of = [-1] * END_OF_STREAM
+        self._number[_ROOT] = _TOP
+        self._node_at[_TOP] = _ROOT
+        self._weight[_SENTINEL] = -1
+        self._number[_SENTINEL] = _TOP + 1
+        self._node_at[_TOP + 1] = _SENTINEL
+        self._nyt = _ROOT
+        self._next_node = _ROOT + 1
+
+    def _code(self, node: int) -> Tuple[int, int]:
+        """``(code, length)`` of the path from the root to ``node``."""
+        parent = self._parent
+        right = self._right
+        code = 0
+        length = 0
+        while node != _ROOT:
+            up = parent[node]
+            if right[up] == node:
+                code |= 1 << length
+            length += 1
+            node = up
+        return code, length
+
+    def encode(self, symbol: int, bit_writer: BitWriter) -> None:
+        """Write the code for ``symbol`` (a byte or ``END_OF_STREAM``)."""
+        leaf = self._leaf_of[symbol] if symbol < END_OF_STREAM else -1
+        if leaf >= 0:
+            bit_writer.write_code(*self._code(leaf))
+        else:
+            bit_writer.write_code(*self._code(self._nyt))
+            bit_writer.write_code(symbol, SYMBOL_BITS)
+        if symbol != END_OF_STREAM:
+            self.update(symbol)
+
+    def decode(self, read_bit: ReadBit, read_bits: ReadBits) -> int:
+        """Read one symbol, update the tree and return it.
+
+        Returns ``END_OF_STREAM`` at the end marker.
+        """
+        left = self._left
+        right = self._right
+        node = _ROOT
+        while left[node] >= 0:
+            node = right[node] if read_bit() else left[node]
+        if node != self._nyt:
+            symbol = self._symbol[node]
+        else:
+            symbol = read_bits(SYMBOL_BITS)
+            if symbol == END_OF_STREAM:
+                return symbol
+            if symbol > END_OF_STREAM or self._leaf_of[symbol] >= 0:
+                raise ValueError("Corrupt adaptive Huffman stream")
+        self.update(symbol)
+        return symbol
+
+    def update(self, symbol: int) -> None:
+        """Count one more ``symbol`` and restore the sibling property."""
+        leaf_to_increment = -1
+        node = self._leaf_of[symbol]
+        if node < 0:
+            node, leaf_to_increment = self._split_nyt(symbol)
+        else:
+            self._swap_with_leader(node)
+            if self._parent[node] == self._parent[self._nyt]:
+                leaf_to_increment = node
+                node = self._parent[node]
+        weight, parent, left = self._weight, self._parent, self._left
+        number, node_at = self._number, self._node_at
+        while node >= 0:
+            # Most nodes have no block to slide past and are just incremented
+            node_weight = weight[node]
+            following = node_at[number[node] + 1]
+            if left[node] < 0:
+                slides = weight[following] == node_weight and left[following] >= 0
+            else:
+                slides = weight[following] == node_weight + 1 and left[following] < 0
+            if slides:
+                node = self._slide_and_increment(node)
+            else:
+                weight[node] = node_weight + 1
+                node = parent[node]
+        if leaf_to_increment >= 0:
+            self._slide_and_increment(leaf_to_increment)
+
+    def _split_nyt(self, symbol: int) -> Tuple[int, int]:
+        """Give the NYT leaf two children: a new NYT and a leaf for ``symbol``.
+
+        Returns the old NYT, now internal, and the new leaf.
+        """
+        internal = self._nyt
+        nyt = self._next_node
+        leaf = nyt + 1
+        self._next_node += 2
+        number = self._number[internal]
+        self._left[internal] = nyt
+        self._right[internal] = leaf
+        self._parent[nyt] = self._parent[leaf] = internal
+        self._symbol[leaf] = symbol
+        self._leaf_of[symbol] = leaf
+        self._number[nyt] = number - 2
+        self._node_at[number - 2] = nyt
+        self._number[leaf] = number - 1
+        self._node_at[number - 1] = leaf
+        self._nyt = nyt
+        return internal, leaf
+
+    def _swap(self, first: int, second: int) -> None:
+        """Exchange the tree positions (and numbers) of two nodes."""
+        parent, left, right = self._parent, self._left, self._right
+        first_parent = parent[first]
+        second_parent = parent[second]
+        if first_parent == second_parent:
+            left[first_parent], right[first_parent] = (
+                right[first_parent],
+                left[first_parent],
+            )
+        else:
+            if left[first_parent] == first:
+                left[first_parent] = second
+            else:
+                right[first_parent] = second
+            if left[second_parent] == second:
+                left[second_parent] = first
+            else:
+                right[second_parent] = first
+            parent[first] = second_parent
+            parent[second] = first_parent
+        number, node_at = self._number, self._node_at
+        first_number = number[first]
+        second_number = number[second]
+        number[first] = second_number
+        number[second] = first_number
+        node_at[first_number] = second
+        node_at[second_number] = first
+
+    def _swap_with_leader(self, leaf: int) -> None:
+        """Move ``leaf`` to the highest-numbered leaf of its weight."""
+        weight, left, node_at = self._weight, self._left, self._node_at
+        leaf_weight = weight[leaf]
+        leader = self._number[leaf]
+        following = node_at[leader + 1]
+        while weight[following] == leaf_weight and left[following] < 0:
+            leader += 1
+            following = node_at[leader + 1]
+        if leader != self._number[leaf]:
+            self._swap(leaf, node_at[leader])
+
+    def _slide_and_increment(self, node: int) -> int:
+        """Slide ``node`` past the next block, increment it, return the next node.
+
+        A leaf of weight w slides past the internal nodes of weight w; an
+        internal node of weight w past the leaves of weight w + 1.
+        """
+        weight, left, node_at = self._weight, self._left, self._node_at
+        node_weight = weight[node]
+        is_leaf = left[node] < 0
+        former_parent = self._parent[node]
+        block_weight = node_weight if is_leaf else node_weight + 1
+        number = self._number[node]
+        while True:
+            following = node_at[number + 1]
+            if weight[following] != block_weight or (left[following] < 0) == is_leaf:
+                break
+            self._swap(node, following)
+            number += 1
+        weight[node] = node_weight + 1
+        return self._parent[node] if is_leaf else former_parent
+
+    def ordered_weights(self) -> List[Tuple[int, bool]]:
+        """``(weight, is_leaf)`` of every live node in implicit-number order."""
+        lowest = self._number[self._nyt]
+        return [
+            (self._weight[node], self._left[node] < 0)
+            for node in self._node_at[lowest : _TOP + 1]
+        ]
@@ -0,0 +1,82 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import Deque, List, Optional
+
+from .block_encoder import encode_block
+from .block_format import (
+    BLOCK_END,
+    BLOCK_MAGIC,
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_MAX_CODE_LENGTH,
+    DEFAULT_SYNC_INTERVAL,
+    BlockIndexEntry,
+    EncodedBlock,
+    encode_block_index,
+    encode_frame_header,
+)
+from .stream_utils import AsyncByteWriter, read_up_to
+
+DEFAULT_MAX_IN_FLIGHT = 2
+
+
+async def compress_async(
+    reader: asyncio.StreamReader,
+    writer: AsyncByteWriter,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    max_code_length: int = DEFAULT_MAX_CODE_LENGTH,
+    use_numpy: Optional[bool] = None,
+    sync_interval: Optional[int] = DEFAULT_SYNC_INTERVAL,
+) -> None:
+    """Compress ``reader`` into a block container on ``writer``.
+
+    Produces the same bytes as ``BlockCompressor`` with the same options. Blocks
+    are read as they arrive and encoded in ``executor`` (the loop's default
+    executor if None; pass a ``ProcessPoolExecutor`` for CPU parallelism). At
+    most ``max_in_flight`` blocks are encoding at once, and the writer is
+    drained after every block, so a slow peer holds back reading.
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be positive")
+    loop = asyncio.get_running_loop()
+    encode = partial(
+        encode_block,
+        max_code_length=max_code_length,
+        use_numpy=use_numpy,
+        sync_interval=sync_interval,
+    )
+    pending: Deque["asyncio.Future[EncodedBlock]"] = deque()
+    index: List[BlockIndexEntry] = []
+    offset = len(BLOCK_MAGIC)
+
+    async def write_oldest() -> None:
+        nonlocal offset
+        block = await pending.popleft()
+        frame_header = encode_frame_header(block)
+        writer.write(frame_header)
+        writer.write(block.payload)
+        frame_length = len(frame_header) + len(block.payload)
+        index.append(BlockIndexEntry(offset, frame_length, block.uncompressed_length))
+        offset += frame_length
+        await writer.drain()
+
+    writer.write(BLOCK_MAGIC)
+    try:
+        while chunk := await read_up_to(reader, block_size):
+            pending.append(loop.run_in_executor(executor, encode, chunk))
+            if len(pending) >= max_in_flight:
+                await write_oldest()
+        while pending:
+            await write_oldest()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    writer.write(bytes([BLOCK_END]))
+    writer.write(encode_block_index(index, offset + 1))
+    await writer.drain()
@@ -0,0 +1,69 @@
+from io import BytesIO
+from itertools import accumulate
+from typing import Iterable, List, NamedTuple, Optional
+
+from .compressor import HuffmanCompressor
+from .dictionary_compressor import DictionaryCompressor
+from .static_table import StaticCodeTable, train_static_table
+from .stream_utils import ByteBuffer
+
+
+class PackedBatch(NamedTuple):
+    """Compressed frames stored back to back in one buffer.
+
+    Frame ``i`` is ``buffer[offsets[i] : offsets[i + 1]]``. ``table`` is the
+    shared code table the frames were compressed against, if any.
+    """
+
+    buffer: bytes
+    offsets: List[int]
+    table: Optional[StaticCodeTable] = None
+
+
+def compress_many(
+    messages: Iterable[ByteBuffer],
+    canonical: bool = False,
+    table: Optional[StaticCodeTable] = None,
+) -> List[bytes]:
+    """Compress each message into its own frame.
+
+    One compressor and one output buffer serve the whole batch. Without
+    ``table`` every frame is what ``HuffmanCompressor(canonical=canonical)``
+    writes for the message alone; with it, frames are ``DictionaryCompressor``
+    frames and skip the per-message frequency pass and header.
+    """
+    compressor = (
+        HuffmanCompressor(canonical=canonical)
+        if table is None
+        else DictionaryCompressor(table)
+    )
+    output_stream = BytesIO()
+    frames = []
+    for message in messages:
+        compressor.compress_buffer(message, output_stream)
+        frames.append(output_stream.getvalue())
+        output_stream.seek(0)
+        output_stream.truncate()
+    return frames
+
+
+def pack_frames(
+    frames: List[bytes], table: Optional[StaticCodeTable] = None
+) -> PackedBatch:
+    return PackedBatch(b"".join(frames), [0, *accumulate(map(len, frames))], table)
+
+
+def compress_batch(
+    messages: Iterable[ByteBuffer],
+    canonical: bool = False,
+    shared_table: bool = False,
+    table_id: int = 0,
+) -> PackedBatch:
+    """Compress messages into one contiguous ``PackedBatch``.
+
+    With ``shared_table`` a code table is trained on the batch itself and every
+    message is compressed against it; the table travels in the batch.
+    """
+    messages = list(messages)
+    table = train_static_table(messages, table_id) if shared_table else None
+    return pack_frames(compress_many(messages, canonical, table), table)
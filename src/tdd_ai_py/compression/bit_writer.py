@@ -1,40 +1,104 @@
-from itertools import chain, islice, repeat
-from typing import BinaryIO, Iterator, List
+from typing import BinaryIO, Iterable, Tuple
 
+ACCUMULATOR_BITS = 256
 
-def chunk_bits(bits: Iterator[int], size: int = 8) -> Iterator[List[int]]:
-    """Chunk bits into groups of specified size."""
-    bit_iter = iter(bits)
-    while True:
-        chunk = list(islice(bit_iter, size))
-        if not chunk:
-            break
-        yield chunk
 
+class BitWriter:
+    """MSB-first bit writer that shifts whole codewords into an integer accumulator.
 
-def bits_to_byte(bit_chunk: List[int]) -> int:
-    """Convert a list of bits to a single byte value."""
-    # Use functional approach with itertools.chain to avoid list concatenation
-    padded_bits = chain(bit_chunk, repeat(0, 8 - len(bit_chunk)))
-    return sum(bit << (7 - i) for i, bit in enumerate(padded_bits))
+    Once the accumulator holds ``ACCUMULATOR_BITS`` bits its complete bytes are
+    appended to a reusable ``bytearray``, which is handed to the output stream
+    whenever it reaches ``buffer_size`` bytes and on ``flush``.
+    """
 
+    def __init__(self, output_stream: BinaryIO, buffer_size: int = 65536) -> None:
+        self._output_stream = output_stream
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._written = 0
+        self._accumulator = 0
+        self._bit_count = 0
 
-def bits_to_bytes(bits: Iterator[int]) -> Iterator[int]:
-    """Convert a stream of bits into complete bytes."""
-    return (bits_to_byte(chunk) for chunk in chunk_bits(bits))
+    @property
+    def bit_position(self) -> int:
+        """Number of bits written so far, including those not yet flushed."""
+        return ((self._written + len(self._buffer)) << 3) + self._bit_count
 
+    def _emit(self) -> None:
+        """Hand the byte buffer to the output stream."""
+        self._output_stream.write(self._buffer)
+        self._written += len(self._buffer)
+        self._buffer.clear()
 
-class BitWriter:
-    def __init__(self, output_stream: BinaryIO) -> None:
-        self._output_stream = output_stream
-        self._bits: List[int] = []
+    def _drain(self) -> None:
+        """Move the complete bytes of the accumulator into the byte buffer."""
+        remainder = self._bit_count & 7
+        self._buffer += (self._accumulator >> remainder).to_bytes(
+            self._bit_count >> 3, "big"
+        )
+        self._accumulator &= (1 << remainder) - 1
+        self._bit_count = remainder
+        if len(self._buffer) >= self._buffer_size:
+            self._emit()
 
     def write_bit(self, bit: int) -> None:
-        self._bits.append(bit & 1)
+        self.write_code(bit & 1, 1)
 
-    def flush(self) -> None:
-        if not self._bits:
+    def write_code(self, code: int, length: int) -> None:
+        """Append the low ``length`` bits of ``code``, most significant bit first."""
+        self._accumulator = (self._accumulator << length) | code
+        self._bit_count += length
+        if self._bit_count >= ACCUMULATOR_BITS:
+            self._drain()
+
+    def write_codes(self, codes: Iterable[Tuple[int, int]]) -> None:
+        """Append a sequence of ``(code, length)`` pairs.
+
+        Equivalent to calling ``write_code`` for each pair, with the accumulator
+        kept in locals for the duration of the loop.
+        """
+        accumulator = self._accumulator
+        bit_count = self._bit_count
+        for code, length in codes:
+            accumulator = (accumulator << length) | code
+            bit_count += length
+            if bit_count >= ACCUMULATOR_BITS:
+                self._accumulator = accumulator
+                self._bit_count = bit_count
+                self._drain()
+                accumulator = self._accumulator
+                bit_count = self._bit_count
+        self._accumulator = accumulator
+        self._bit_count = bit_count
+
+    def write_bytes(self, data: bytes) -> None:
+        """Append whole bytes, copying them straight through when byte-aligned."""
+        if self._bit_count & 7:
+            self.write_code(int.from_bytes(data, "big"), len(data) << 3)
             return
-        byte_data = bytes(bits_to_bytes(iter(self._bits)))
-        self._output_stream.write(byte_data)
-        self._bits.clear()
+        if self._bit_count:
+            self._drain()
+        self._buffer += data
+        if len(self._buffer) >= self._buffer_size:
+            self._emit()
+
+    def emit_complete_bytes(self) -> None:
+        """Hand every complete byte to the output stream, keeping the partial one.
+
+        Lets a streaming producer push output without padding the bit stream.
+        """
+        if self._bit_count >= 8:
+            self._drain()
+        if self._buffer:
+            self._emit()
+
+    def flush(self) -> None:
+        """Write all pending bits, zero-padding the final partial byte."""
+        if self._bit_count >= 8:
+            self._drain()
+        if self._bit_count:
+            self._buffer.append((self._accumulator << (8 - self._bit_count)) & 0xFF)
+            self._accumulator = 0
+            self._bit_count = 0
+        if self._buffer:
+            self._emit()
@@ -0,0 +1,125 @@
+from functools import partial
+from typing import BinaryIO, Iterable, List, Optional
+
+from ..parallel import ordered_map
+from .block_encoder import encode_block
+from .block_format import (
+    BLOCK_END,
+    BLOCK_MAGIC,
+    BLOCK_STORED,
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_MAX_CODE_LENGTH,
+    DEFAULT_SYNC_INTERVAL,
+    BlockIndexEntry,
+    EncodedBlock,
+    encode_block_index,
+    encode_varint,
+    write_block,
+    write_block_index,
+)
+from .numpy_engine import resolve_use_numpy
+from .stream_utils import ByteBuffer, iter_chunks, iter_slices
+
+
+class BlockCompressor:
+    """Compress a stream into independent blocks, optionally across processes.
+
+    Blocks are encoded in a ``ProcessPoolExecutor`` when ``jobs > 1`` and written
+    in input order. At most ``2 * jobs`` blocks are in flight, so memory stays
+    bounded by a few block sizes per worker regardless of input size.
+
+    A block index footer records where every block lives, so decompressors can
+    fan blocks out to workers without parsing the container serially.
+
+    Blocks carry a sync point every ``sync_interval`` symbols so the NumPy
+    decoder can decode them in parallel lanes; ``sync_interval=None`` omits them.
+    """
+
+    def __init__(
+        self,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        jobs: int = 1,
+        max_code_length: int = DEFAULT_MAX_CODE_LENGTH,
+        use_numpy: Optional[bool] = None,
+        sync_interval: Optional[int] = DEFAULT_SYNC_INTERVAL,
+    ) -> None:
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        if jobs < 1:
+            raise ValueError("jobs must be positive")
+        if sync_interval is not None and sync_interval < 1:
+            raise ValueError("sync_interval must be positive")
+        self._block_size = block_size
+        self._jobs = jobs
+        self._max_code_length = max_code_length
+        resolve_use_numpy(use_numpy)  # fail fast if NumPy is required but missing
+        self._use_numpy = use_numpy
+        self._sync_interval = sync_interval
+
+    def compress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        self.compress_chunks(iter_chunks(input_stream, self._block_size), output_stream)
+
+    def compress_chunks(
+        self, chunks: Iterable[ByteBuffer], output_stream: BinaryIO
+    ) -> None:
+        """Compress each of ``chunks`` as one block, ignoring ``block_size``.
+
+        Chunks must be ``bytes`` when ``jobs > 1``, so they can be pickled.
+        """
+        self._write_container(chunks, output_stream)
+
+    def compress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        """Compress an in-memory or memory-mapped buffer.
+
+        Blocks are zero-copy ``memoryview`` slices; they are only copied to
+        ``bytes`` when they have to be pickled for worker processes.
+        """
+        chunks: Iterable[ByteBuffer] = iter_slices(memoryview(data), self._block_size)
+        if self._jobs > 1:
+            chunks = map(bytes, chunks)
+        self._write_container(chunks, output_stream)
+
+    def _write_container(
+        self, chunks: Iterable[ByteBuffer], output_stream: BinaryIO
+    ) -> None:
+        encode = partial(
+            encode_block,
+            max_code_length=self._max_code_length,
+            use_numpy=self._use_numpy,
+            sync_interval=self._sync_interval,
+        )
+        write_container(ordered_map(encode, chunks, self._jobs), output_stream)
+
+
+def write_container(blocks: Iterable[EncodedBlock], output_stream: BinaryIO) -> None:
+    """Write ``blocks`` as a container with its end marker and index footer."""
+    output_stream.write(BLOCK_MAGIC)
+    offset = len(BLOCK_MAGIC)
+    index: List[BlockIndexEntry] = []
+    for block in blocks:
+        frame_length = write_block(output_stream, block)
+        index.append(BlockIndexEntry(offset, frame_length, block.uncompressed_length))
+        offset += frame_length
+
+    output_stream.write(bytes([BLOCK_END]))
+    write_block_index(output_stream, index, offset + 1)
+
+
+def write_stored_container(chunks: Iterable[ByteBuffer], output_stream: BinaryIO) -> None:
+    """Write every chunk as a ``BLOCK_STORED`` block of a container."""
+    write_container(
+        (EncodedBlock(BLOCK_STORED, len(chunk), chunk) for chunk in chunks),
+        output_stream,
+    )
+
+
+def stored_container_size(length: int, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """Size of a stored container of ``length`` bytes cut into ``block_size`` blocks."""
+    offset = len(BLOCK_MAGIC)
+    index: List[BlockIndexEntry] = []
+    for start in range(0, length, block_size):
+        size = min(block_size, length - start)
+        frame_length = 1 + 2 * len(encode_varint(size)) + size
+        index.append(BlockIndexEntry(offset, frame_length, size))
+        offset += frame_length
+    return offset + 1 + len(encode_block_index(index, offset + 1))
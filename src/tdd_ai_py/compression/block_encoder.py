@@ -0,0 +1,91 @@
+from io import BytesIO
+from typing import List, Optional
+
+from .bit_writer import BitWriter
+from .block_format import (
+    BLOCK_HUFFMAN,
+    BLOCK_HUFFMAN_SYNC,
+    BLOCK_STORED,
+    DEFAULT_MAX_CODE_LENGTH,
+    EncodedBlock,
+    encode_sync_points,
+)
+from .canonical_codes import (
+    assign_canonical_codes,
+    compute_code_lengths,
+    encoded_bit_count,
+)
+from .code_length_serializer import serialize_code_lengths, serialized_code_lengths_bits
+from .frequency_counter import count_byte_frequencies
+from .numpy_engine import (
+    NUMPY_CHUNK_SIZE,
+    count_frequencies,
+    encode_chunks,
+    resolve_use_numpy,
+    sync_offsets,
+)
+from .stream_utils import ByteBuffer, iter_slices
+
+
+def _sync_offsets(
+    data: memoryview, lengths_by_byte: List[int], interval: int, start: int
+) -> List[int]:
+    offsets = []
+    position = start
+    for chunk in iter_slices(data, interval):
+        offsets.append(position)
+        position += sum(map(lengths_by_byte.__getitem__, chunk))
+    return offsets
+
+
+def encode_block(
+    data: ByteBuffer,
+    max_code_length: int = DEFAULT_MAX_CODE_LENGTH,
+    use_numpy: Optional[bool] = None,
+    sync_interval: Optional[int] = None,
+) -> EncodedBlock:
+    """Huffman-encode one independent block with its own canonical code table.
+
+    With ``sync_interval`` set, blocks longer than it are written as
+    ``BLOCK_HUFFMAN_SYNC`` with a sync point every ``sync_interval`` symbols.
+    Blocks whose code header and data bits would take no fewer bytes than the
+    block itself are written as ``BLOCK_STORED`` without being encoded.
+
+    A module-level function of plain values so it can run in worker processes.
+    """
+    view = memoryview(data)
+    use_numpy = resolve_use_numpy(use_numpy, len(view))
+    if use_numpy:
+        frequency_map = count_frequencies(iter_slices(view, NUMPY_CHUNK_SIZE))
+    else:
+        frequency_map = count_byte_frequencies(view)
+    code_lengths = compute_code_lengths(frequency_map, max_code_length)
+    encoded_bits = serialized_code_lengths_bits(code_lengths) + encoded_bit_count(
+        frequency_map, code_lengths
+    )
+    if (encoded_bits + 7) // 8 >= len(view):
+        return EncodedBlock(BLOCK_STORED, len(view), bytes(view))
+    code_table = assign_canonical_codes(code_lengths)
+    codes_by_byte = [code_table.get(byte_value, (0, 0)) for byte_value in range(256)]
+
+    payload = BytesIO()
+    bit_writer = BitWriter(payload)
+    serialize_code_lengths(code_lengths, bit_writer)
+
+    sync_prefix = None
+    if sync_interval is not None and len(view) > sync_interval:
+        lengths_by_byte = [length for _, length in codes_by_byte]
+        find_offsets = sync_offsets if use_numpy else _sync_offsets
+        sync_prefix = encode_sync_points(
+            sync_interval,
+            find_offsets(view, lengths_by_byte, sync_interval, bit_writer.bit_position),
+        )
+
+    if use_numpy:
+        encode_chunks(iter_slices(view, NUMPY_CHUNK_SIZE), codes_by_byte, bit_writer)
+    else:
+        bit_writer.write_codes(map(codes_by_byte.__getitem__, view))
+    bit_writer.flush()
+    if sync_prefix is None:
+        return EncodedBlock(BLOCK_HUFFMAN, len(data), payload.getvalue())
+    return EncodedBlock(BLOCK_HUFFMAN_SYNC, len(data), sync_prefix + payload.getvalue())
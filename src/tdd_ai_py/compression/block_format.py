@@ -0,0 +1,201 @@
+"""Framed block container shared by the block compressor and decompressor.
+
+Layout::
+
+    BLOCK_MAGIC
+    { block_type:u8  uncompressed_length:varint  payload_length:varint  payload }*
+    BLOCK_END:u8
+    block_count:varint  { offset:varint  frame_length:varint  uncompressed_length:varint }*
+    index_offset:u64be  INDEX_MAGIC
+
+Offsets are relative to the start of the magic. Sequential readers stop at
+``BLOCK_END``; random-access readers seek to the fixed-size trailer at the end
+of the stream to find the index. Every block is independent: a
+``BLOCK_HUFFMAN`` payload is a canonical code-length header followed by the
+block's data bits, padded to a byte.
+
+A ``BLOCK_HUFFMAN_SYNC`` payload prefixes the same bits with sync points::
+
+    sync_interval:varint  sync_count:varint  { offset_delta:varint }*
+
+giving the bit offset, within the bits that follow, of every ``sync_interval``-th
+symbol. Decoders may start independently at each sync point or ignore them.
+
+A ``BLOCK_STORED`` payload is the block's bytes as they are. Encoders write one
+when the Huffman payload would be no smaller, so incompressible data costs a
+copy on either side.
+"""
+
+import struct
+from typing import BinaryIO, List, NamedTuple, Optional, Tuple
+
+from .stream_utils import ByteBuffer
+
+# The version lives in the magic so a 4-byte read is enough to tell a container
+# from the legacy stream, whose first 4 bytes are a big-endian length.
+BLOCK_MAGIC = b"\x89HB\x01"
+INDEX_MAGIC = b"HBIX"
+INDEX_TRAILER = struct.Struct(">Q4s")
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFAULT_MAX_CODE_LENGTH = 15
+DEFAULT_SYNC_INTERVAL = 256
+
+BLOCK_END = 0
+BLOCK_HUFFMAN = 1
+BLOCK_HUFFMAN_SYNC = 2
+BLOCK_STORED = 3
+
+
+class EncodedBlock(NamedTuple):
+    block_type: int
+    uncompressed_length: int
+    payload: ByteBuffer
+
+
+class BlockIndexEntry(NamedTuple):
+    offset: int
+    frame_length: int
+    uncompressed_length: int
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer as a little-endian base-128 varint."""
+    if value < 0:
+        raise ValueError("varint value must be non-negative")
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def read_varint(input_stream: BinaryIO) -> int:
+    value = 0
+    shift = 0
+    while True:
+        byte = input_stream.read(1)
+        if not byte:
+            raise ValueError("Truncated varint")
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def decode_varint(buffer: ByteBuffer, position: int) -> Tuple[int, int]:
+    """Decode a varint at ``position``; return its value and the next position."""
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(buffer):
+            raise ValueError("Truncated varint")
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def encode_sync_points(sync_interval: int, offsets: List[int]) -> bytes:
+    """Encode the sync point prefix of a ``BLOCK_HUFFMAN_SYNC`` payload."""
+    encoded = bytearray(encode_varint(sync_interval) + encode_varint(len(offsets)))
+    previous = 0
+    for offset in offsets:
+        encoded += encode_varint(offset - previous)
+        previous = offset
+    return bytes(encoded)
+
+
+def decode_sync_points(payload: ByteBuffer) -> Tuple[int, List[int], int]:
+    """Decode a sync point prefix; return the interval, offsets and bit start."""
+    sync_interval, position = decode_varint(payload, 0)
+    sync_count, position = decode_varint(payload, position)
+    if sync_interval < 1:
+        raise ValueError("Sync interval must be positive")
+    offsets: List[int] = []
+    offset = 0
+    for _ in range(sync_count):
+        delta, position = decode_varint(payload, position)
+        offset += delta
+        offsets.append(offset)
+    return sync_interval, offsets, position
+
+
+def parse_block(buffer: ByteBuffer, position: int) -> Tuple[Optional[EncodedBlock], int]:
+    """Parse the framed block at ``position`` of an in-memory container.
+
+    Returns the block (None at the end marker) and the position after it. The
+    payload is a slice of ``buffer``, so memoryviews are not copied.
+    """
+    if position >= len(buffer):
+        raise ValueError("Block container ended without an end marker")
+    block_type = buffer[position]
+    if block_type == BLOCK_END:
+        return None, position + 1
+    uncompressed_length, position = decode_varint(buffer, position + 1)
+    payload_length, position = decode_varint(buffer, position)
+    if position + payload_length > len(buffer):
+        raise ValueError("Truncated block payload")
+    payload = buffer[position : position + payload_length]
+    return (
+        EncodedBlock(block_type, uncompressed_length, payload),
+        position + payload_length,
+    )
+
+
+def encode_frame_header(block: EncodedBlock) -> bytes:
+    """Encode the type and lengths that precede a block's payload."""
+    return (
+        bytes([block.block_type])
+        + encode_varint(block.uncompressed_length)
+        + encode_varint(len(block.payload))
+    )
+
+
+def write_block(output_stream: BinaryIO, block: EncodedBlock) -> int:
+    """Write one framed block and return the number of bytes written."""
+    frame = encode_frame_header(block)
+    output_stream.write(frame)
+    output_stream.write(block.payload)
+    return len(frame) + len(block.payload)
+
+
+def encode_block_index(index: List[BlockIndexEntry], index_offset: int) -> bytes:
+    """Encode the block index footer and its fixed-size trailer."""
+    encoded = bytearray(encode_varint(len(index)))
+    for entry in index:
+        for field in entry:
+            encoded += encode_varint(field)
+    return bytes(encoded + INDEX_TRAILER.pack(index_offset, INDEX_MAGIC))
+
+
+def write_block_index(
+    output_stream: BinaryIO, index: List[BlockIndexEntry], index_offset: int
+) -> None:
+    """Write the block index footer and its fixed-size trailer."""
+    output_stream.write(encode_block_index(index, index_offset))
+
+
+def read_block_index(
+    input_stream: BinaryIO, container_start: int
+) -> Optional[List[BlockIndexEntry]]:
+    """Read the block index of a seekable container, or None if it has none."""
+    end = input_stream.seek(0, 2)
+    if end - container_start < INDEX_TRAILER.size:
+        return None
+    input_stream.seek(end - INDEX_TRAILER.size)
+    index_offset, magic = INDEX_TRAILER.unpack(input_stream.read(INDEX_TRAILER.size))
+    if magic != INDEX_MAGIC:
+        return None
+
+    input_stream.seek(container_start + index_offset)
+    return [
+        BlockIndexEntry(
+            read_varint(input_stream),
+            read_varint(input_stream),
+            read_varint(input_stream),
+        )
+        for _ in range(read_varint(input_stream))
+    ]
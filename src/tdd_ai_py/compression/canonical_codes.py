@@ -0,0 +1,132 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+# (weight, leaf index or -1, children of a package)
+_PackageItem = Tuple[int, int, Tuple["_PackageItem", ...]]
+
+
+def compute_code_lengths(
+    frequency_map: Dict[int, int], max_code_length: Optional[int] = None
+) -> Dict[int, int]:
+    """Compute optimal Huffman code lengths without building tree objects.
+
+    Merges nodes in ``(weight, node_index)`` order with two queues and records
+    only each node's parent; since parents are always created after their
+    children, depths fall out of a single reverse sweep over the parent array.
+
+    With ``max_code_length`` set, lengths exceeding the cap are recomputed with
+    package-merge, which is optimal among codes of bounded length.
+    """
+    code_lengths = _huffman_code_lengths(frequency_map)
+    if (
+        max_code_length is not None
+        and max(code_lengths.values(), default=0) > max_code_length
+    ):
+        return package_merge_code_lengths(frequency_map, max_code_length)
+    return code_lengths
+
+
+def _huffman_code_lengths(frequency_map: Dict[int, int]) -> Dict[int, int]:
+    if len(frequency_map) <= 1:
+        return {symbol: 1 for symbol in frequency_map}
+
+    symbols = list(frequency_map)
+    symbol_count = len(symbols)
+    weights = list(frequency_map.values()) + [0] * (symbol_count - 1)
+    # Two queues replace the heap: leaves sorted by (weight, index), and merged
+    # nodes, which are created in (weight, index) order already. Taking the
+    # smaller head pops exactly what a (weight, index) heap would.
+    leaves = sorted(range(symbol_count), key=weights.__getitem__)
+    parents: List[int] = [0] * (2 * symbol_count - 1)
+    next_leaf = 0
+    next_merged = symbol_count
+
+    for next_index in range(symbol_count, 2 * symbol_count - 1):
+        weight = 0
+        for _ in range(2):
+            if next_leaf < symbol_count and (
+                next_merged == next_index
+                or weights[leaves[next_leaf]] <= weights[next_merged]
+            ):
+                child = leaves[next_leaf]
+                next_leaf += 1
+            else:
+                child = next_merged
+                next_merged += 1
+            parents[child] = next_index
+            weight += weights[child]
+        weights[next_index] = weight
+
+    depths = [0] * (2 * symbol_count - 1)
+    for node in range(2 * symbol_count - 3, -1, -1):
+        depths[node] = depths[parents[node]] + 1
+
+    return {symbol: depths[index] for index, symbol in enumerate(symbols)}
+
+
+def package_merge_code_lengths(
+    frequency_map: Dict[int, int], max_code_length: int
+) -> Dict[int, int]:
+    """Compute optimal code lengths no longer than ``max_code_length`` bits.
+
+    Package-merge: starting from the leaves sorted by weight, adjacent items are
+    paired into packages and merged back with the leaves, once per extra level.
+    The cheapest ``2n - 2`` items of the final list are selected, and each
+    symbol's code length is the number of selected items it occurs in.
+    """
+    symbol_count = len(frequency_map)
+    if symbol_count > 1 << max_code_length:
+        raise ValueError(
+            f"max_code_length {max_code_length} cannot encode {symbol_count} symbols"
+        )
+    if symbol_count <= 1:
+        return {symbol: 1 for symbol in frequency_map}
+
+    symbols = sorted(frequency_map, key=lambda symbol: (frequency_map[symbol], symbol))
+    leaves: List[_PackageItem] = [
+        (frequency_map[symbol], index, ()) for index, symbol in enumerate(symbols)
+    ]
+    items = leaves
+    for _ in range(max_code_length - 1):
+        packages: List[_PackageItem] = [
+            (first[0] + second[0], -1, (first, second))
+            for first, second in zip(items[0::2], items[1::2])
+        ]
+        items = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
+
+    lengths = [0] * symbol_count
+    stack = items[: 2 * symbol_count - 2]
+    while stack:
+        _, leaf_index, children = stack.pop()
+        if leaf_index >= 0:
+            lengths[leaf_index] += 1
+        else:
+            stack.extend(children)
+
+    return {symbol: lengths[index] for index, symbol in enumerate(symbols)}
+
+
+def encoded_bit_count(frequency_map: Dict[int, int], code_lengths: Dict[int, int]) -> int:
+    """Number of data bits needed to encode ``frequency_map`` with ``code_lengths``."""
+    return sum(weight * code_lengths[symbol] for symbol, weight in frequency_map.items())
+
+
+def assign_canonical_codes(code_lengths: Dict[int, int]) -> Dict[int, Tuple[int, int]]:
+    """Assign canonical ``(code, length)`` pairs from code lengths alone.
+
+    Symbols are ordered by ``(length, symbol)`` and receive consecutive integer
+    codes, shifted left whenever the length grows.
+    """
+    codes: Dict[int, Tuple[int, int]] = {}
+    code = 0
+    previous_length = 0
+    for symbol, length in sorted(
+        code_lengths.items(), key=lambda item: (item[1], item[0])
+    ):
+        code <<= length - previous_length
+        if code >> length:
+            raise ValueError("Code lengths do not form a valid prefix code")
+        codes[symbol] = (code, length)
+        code += 1
+        previous_length = length
+    return codes
@@ -0,0 +1,63 @@
+from typing import Dict, List, Tuple
+
+from .bit_writer import BitWriter
+
+BYTE_SYMBOL_BITS = 8
+# Wide enough to count every symbol of the alphabet, including the full one
+SYMBOL_COUNT_BITS = BYTE_SYMBOL_BITS + 1
+LENGTH_WIDTH_BITS = 5
+
+
+def write_elias_gamma(value: int, bit_writer: BitWriter) -> None:
+    """Write a positive integer as ``bit_length - 1`` zeros followed by its bits."""
+    bit_writer.write_code(value, 2 * value.bit_length() - 1)
+
+
+def serialized_code_lengths_bits(
+    code_lengths: Dict[int, int], symbol_bits: int = BYTE_SYMBOL_BITS
+) -> int:
+    """Size in bits of the ``serialize_code_lengths`` header for ``code_lengths``."""
+    if not code_lengths:
+        return symbol_bits + 1
+    width = (max(code_lengths.values()) - 1).bit_length()
+    bits = symbol_bits + 1 + LENGTH_WIDTH_BITS + len(code_lengths) * width
+    previous_symbol = -1
+    for symbol in sorted(code_lengths):
+        bits += 2 * (symbol - previous_symbol).bit_length() - 1
+        previous_symbol = symbol
+    return bits
+
+
+def serialize_code_lengths(
+    code_lengths: Dict[int, int],
+    bit_writer: BitWriter,
+    symbol_bits: int = BYTE_SYMBOL_BITS,
+) -> None:
+    """Serialize the code lengths of an alphabet of ``symbol_bits``-bit symbols.
+
+    Layout: ``symbol_bits + 1``-bit symbol count (9 bits for bytes), 5-bit field
+    width ``w``, then for every symbol in ascending order the Elias-gamma coded
+    gap from the previous symbol followed by ``length - 1`` in ``w`` bits.
+    Sparse alphabets pay for their gaps, while dense ones cost little more than
+    one bit plus ``w`` per symbol.
+    """
+    bit_writer.write_code(len(code_lengths), symbol_bits + 1)
+    if not code_lengths:
+        return
+
+    width = (max(code_lengths.values()) - 1).bit_length()
+    bit_writer.write_code(width, LENGTH_WIDTH_BITS)
+
+    # One code per symbol: its gap's Elias-gamma bits followed by its length
+    fields: List[Tuple[int, int]] = []
+    previous_symbol = -1
+    for symbol in sorted(code_lengths):
+        gap = symbol - previous_symbol
+        fields.append(
+            (
+                (gap << width) | (code_lengths[symbol] - 1),
+                2 * gap.bit_length() - 1 + width,
+            )
+        )
+        previous_symbol = symbol
+    bit_writer.write_codes(fields)
@@ -1,34 +1,387 @@
-from itertools import chain
-from typing import BinaryIO
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
+from .adaptive_huffman import ADAPTIVE_MAGIC
 from .bit_writer import BitWriter
-from .frequency_counter import create_frequency_map
-from .huffman_encoder import generate_huffman_codes
-from .huffman_tree_builder import build_huffman_tree
-from .stream_utils import iter_bytes
-from .tree_serializer import serialize_tree
+from .block_compressor import (
+    BlockCompressor,
+    stored_container_size,
+    write_stored_container,
+)
+from .block_format import BLOCK_MAGIC, DEFAULT_BLOCK_SIZE
+from .canonical_codes import (
+    assign_canonical_codes,
+    compute_code_lengths,
+    encoded_bit_count,
+)
+from .code_length_serializer import serialize_code_lengths, serialized_code_lengths_bits
+from .context_model import CONTEXT_MAGIC
+from .frequency_counter import (
+    count_byte_frequencies,
+    count_chunk_frequencies,
+    create_frequency_map,
+)
+from .frequency_sampler import (
+    DEFAULT_SAMPLE_CHUNK_SIZE,
+    add_escape_counts,
+    covers_input,
+    read_stream_samples,
+    sample_offsets,
+    slice_buffer_samples,
+)
+from .huffman_encoder import flat_code_table
+from .huffman_tree_builder import FlatTree, build_flat_tree
+from .numpy_engine import count_frequencies, encode_chunks, resolve_use_numpy
+from .run_length import RUN_LENGTH_MAGIC
+from .stage_metrics import NULL_RECORDER, MetricsCallback, StageRecorder, stage_recorder
+from .stream_utils import ByteBuffer, iter_chunks, iter_slices
+from .tree_serializer import serialize_flat_tree
+from .wide_compressor import WIDE_MAGIC
+
+MAX_INPUT_LENGTH = (1 << 32) - 1
+# Magics a 4-byte length header must not match, or decoders would misread it
+CONTAINER_MAGICS = (
+    BLOCK_MAGIC,
+    ADAPTIVE_MAGIC,
+    CONTEXT_MAGIC,
+    WIDE_MAGIC,
+    RUN_LENGTH_MAGIC,
+)
+BUFFER_SLICE_SIZE = 1 << 16
+
+CodesByByte = List[Tuple[int, int]]
+_BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+class _Code(NamedTuple):
+    """Per-byte code lengths, and the tree they come from outside canonical mode."""
+
+    code_lengths: Dict[int, int]
+    tree: Optional[FlatTree]
+
+
+def _write_data(
+    chunks: Iterable[ByteBuffer],
+    bit_writer: BitWriter,
+    codes_by_byte: CodesByByte,
+    use_numpy: bool,
+    length: int,
+    recorder: StageRecorder,
+) -> None:
+    start = bit_writer.bit_position
+    if use_numpy:
+        encode_chunks(chunks, codes_by_byte, bit_writer)
+    else:
+        for chunk in chunks:
+            bit_writer.write_codes(map(codes_by_byte.__getitem__, chunk))
+    encoded = bit_writer.bit_position
+    recorder.lap("encode", length, length, encoded - start)
+    bit_writer.flush()
+    recorder.lap("flush", bit_count=bit_writer.bit_position - encoded)
 
 
 class HuffmanCompressor:
+    """Two-pass Huffman compressor.
+
+    By default the header is the preorder-serialized tree. With ``canonical=True``
+    it is the compact code-length header instead, and codes are assigned
+    canonically so no tree objects are built on either side.
+
+    ``max_code_length`` caps code lengths (canonical mode only) so decoders can
+    size their lookup tables to the cap.
+
+    The header stores the input length in 4 bytes, so inputs are limited to
+    ``MAX_INPUT_LENGTH`` bytes; ``BlockCompressor`` has no such limit. The few
+    lengths whose header would read as one of ``CONTAINER_MAGICS``, and empty
+    input without ``canonical``, are written as a block container instead.
+
+    Counting and encoding run on the vectorized NumPy engine when NumPy is
+    installed; ``use_numpy`` forces either engine. Both write identical bytes.
+
+    With ``sample_chunks`` set, the code is built from that many evenly spaced
+    chunks of ``sample_chunk_size`` bytes and the input is then encoded in a
+    single pass. Bytes missing from the sample get escape counts so they still
+    have a code. The output format is unchanged.
+
+    When the counted frequencies show that the Huffman stream would be no
+    smaller than a block container of ``BLOCK_STORED`` blocks, that container
+    is written instead, so incompressible input is copied rather than encoded.
+    Sampled codes are not exact enough to decide this and always encode. This
+    is a format change for such input: readers that only understand the
+    single-table format reject it. Framing and index add up to 32 bytes for
+    the first ``DEFAULT_BLOCK_SIZE`` block and about 17 for each further one,
+    so stored output is still slightly larger than the input.
+
+    ``metrics`` is called with a ``StageMetrics`` as each stage of a
+    ``compress`` call finishes; see ``stage_metrics``. Without it nothing is
+    timed.
+    """
+
+    def __init__(
+        self,
+        canonical: bool = False,
+        max_code_length: Optional[int] = None,
+        use_numpy: Optional[bool] = None,
+        sample_chunks: Optional[int] = None,
+        sample_chunk_size: int = DEFAULT_SAMPLE_CHUNK_SIZE,
+        metrics: Optional[MetricsCallback] = None,
+    ) -> None:
+        if max_code_length is not None and not canonical:
+            raise ValueError("max_code_length requires canonical=True")
+        if sample_chunks is not None and sample_chunks < 1:
+            raise ValueError("sample_chunks must be positive")
+        if sample_chunk_size < 1:
+            raise ValueError("sample_chunk_size must be positive")
+        self._canonical = canonical
+        self._max_code_length = max_code_length
+        resolve_use_numpy(use_numpy)  # fail fast if NumPy is required but missing
+        self._use_numpy = use_numpy
+        self._sample_chunks = sample_chunks
+        self._sample_chunk_size = sample_chunk_size
+        self._metrics = metrics
+
     def compress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
-        # First pass: build frequency map by reading from stream
-        frequency_map = create_frequency_map(input_stream)
-        length = sum(frequency_map.values())
-        huffman_tree = build_huffman_tree(frequency_map)
-        codes = generate_huffman_codes(huffman_tree)
+        if not input_stream.seekable():
+            raise ValueError(
+                "HuffmanCompressor needs a seekable input; "
+                "use BlockCompressor to stream non-seekable input"
+            )
 
-        # Write length and prepare bit stream
-        output_stream.write(length.to_bytes(4, byteorder="big"))
+        recorder = stage_recorder(self._metrics)
+        length = input_stream.seek(0, 2)
+        input_stream.seek(0)
+        if self._needs_container(length):
+            BlockCompressor(use_numpy=self._use_numpy).compress(
+                input_stream, output_stream
+            )
+            recorder.lap("compress_blocks", length, length)
+            return
+        use_numpy = resolve_use_numpy(self._use_numpy, length)
+
+        if self._sample_chunks is not None:
+            offsets = sample_offsets(length, self._sample_chunks, self._sample_chunk_size)
+            samples = read_stream_samples(input_stream, offsets, self._sample_chunk_size)
+            input_stream.seek(0)
+            self._write_sampled(
+                samples,
+                length,
+                iter_chunks(input_stream, BUFFER_SLICE_SIZE),
+                output_stream,
+                use_numpy,
+                recorder,
+            )
+            return
+
+        # First pass: build frequency map by reading from stream
+        if use_numpy:
+            frequency_map = count_frequencies(
+                iter_chunks(input_stream, BUFFER_SLICE_SIZE)
+            )
+        else:
+            frequency_map = create_frequency_map(input_stream)
+        recorder.lap("count_frequencies", length, len(frequency_map))
+        code = self._build_code(frequency_map, recorder)
+        if self._is_incompressible(frequency_map, code, length):
+            input_stream.seek(0)
+            write_stored_container(
+                iter_chunks(input_stream, DEFAULT_BLOCK_SIZE), output_stream
+            )
+            recorder.lap("store", length)
+            return
+        bit_writer, codes_by_byte = self._write_header(
+            frequency_map, output_stream, length, recorder, code
+        )
 
-        # Second pass: seek back to start and create all bits functionally
+        # Second pass: seek back to start and emit one (code, length) pair per byte
         input_stream.seek(0)
-        all_bits = chain(
-            serialize_tree(huffman_tree),
-            *(codes[byte_value] for byte_value in iter_bytes(input_stream)),
+        chunks = iter_chunks(input_stream, BUFFER_SLICE_SIZE)
+        _write_data(chunks, bit_writer, codes_by_byte, use_numpy, length, recorder)
+
+    def compress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        """Compress an in-memory or memory-mapped buffer.
+
+        Both passes walk zero-copy ``memoryview`` slices of ``data``.
+        """
+        recorder = stage_recorder(self._metrics)
+        view = memoryview(data)
+        if self._needs_container(len(view)):
+            BlockCompressor(use_numpy=self._use_numpy).compress_buffer(
+                view, output_stream
+            )
+            recorder.lap("compress_blocks", len(view), len(view))
+            return
+        use_numpy = resolve_use_numpy(self._use_numpy, len(view))
+        if self._sample_chunks is not None:
+            offsets = sample_offsets(
+                len(view), self._sample_chunks, self._sample_chunk_size
+            )
+            self._write_sampled(
+                slice_buffer_samples(view, offsets, self._sample_chunk_size),
+                len(view),
+                iter_slices(view, BUFFER_SLICE_SIZE),
+                output_stream,
+                use_numpy,
+                recorder,
+            )
+            return
+        if use_numpy:
+            frequency_map = count_frequencies(iter_slices(view, BUFFER_SLICE_SIZE))
+        else:
+            frequency_map = count_byte_frequencies(view)
+        recorder.lap("count_frequencies", len(view), len(frequency_map))
+        code = self._build_code(frequency_map, recorder)
+        if self._is_incompressible(frequency_map, code, len(view)):
+            write_stored_container(iter_slices(view, DEFAULT_BLOCK_SIZE), output_stream)
+            recorder.lap("store", len(view))
+            return
+        bit_writer, codes_by_byte = self._write_header(
+            frequency_map, output_stream, len(view), recorder, code
+        )
+        chunks = iter_slices(view, BUFFER_SLICE_SIZE)
+        _write_data(chunks, bit_writer, codes_by_byte, use_numpy, len(view), recorder)
+
+    def _write_sampled(
+        self,
+        samples: Sequence[ByteBuffer],
+        length: int,
+        chunks: Iterable[ByteBuffer],
+        output_stream: BinaryIO,
+        use_numpy: bool,
+        recorder: StageRecorder,
+    ) -> None:
+        """Encode ``chunks`` with a code built from ``samples``.
+
+        A sample that tiles the whole input is exact, so it is encoded directly
+        and ``chunks`` is never read.
+        """
+        if use_numpy:
+            frequency_map = count_frequencies(samples)
+        else:
+            frequency_map = count_chunk_frequencies(samples)
+        sampled = sum(len(sample) for sample in samples)
+        recorder.lap("count_frequencies", sampled, len(frequency_map))
+        exact = covers_input(length, len(samples), self._sample_chunk_size)
+        if not exact:
+            frequency_map = add_escape_counts(frequency_map)
+        bit_writer, codes_by_byte = self._write_header(
+            frequency_map, output_stream, length, recorder
+        )
+        _write_data(
+            samples if exact else chunks,
+            bit_writer,
+            codes_by_byte,
+            use_numpy,
+            length,
+            recorder,
+        )
+
+    def _needs_container(self, length: int) -> bool:
+        """Whether ``length`` bytes go in a block container instead.
+
+        That is when the 4-byte length header would read as a magic, or for
+        empty input without ``canonical``, which has no tree to serialize.
+        """
+        if length == 0:
+            return not self._canonical
+        return (
+            length <= MAX_INPUT_LENGTH
+            and length.to_bytes(4, byteorder="big") in CONTAINER_MAGICS
         )
 
-        # Write all bits
+    def _build_code(
+        self, frequency_map: Dict[int, int], recorder: StageRecorder = NULL_RECORDER
+    ) -> _Code:
+        """Build the code once, for both the size estimate and the header."""
+        symbol_count = len(frequency_map)
+        if self._canonical:
+            code_lengths = compute_code_lengths(frequency_map, self._max_code_length)
+            recorder.lap("code_lengths", symbol_count=symbol_count)
+            return _Code(code_lengths, None)
+        tree = build_flat_tree(frequency_map)
+        recorder.lap("build_tree", symbol_count=symbol_count)
+        code_lengths = {
+            symbol: code_length
+            for symbol, (_, code_length) in flat_code_table(tree).items()
+        }
+        return _Code(code_lengths, tree)
+
+    def _is_incompressible(
+        self, frequency_map: Dict[int, int], code: _Code, length: int
+    ) -> bool:
+        """Whether the Huffman stream would be no smaller than a stored container."""
+        code_lengths = code.code_lengths
+        if self._canonical:
+            header_bits = serialized_code_lengths_bits(code_lengths)
+        else:
+            # A 9-bit leaf per symbol and a 1-bit branch between each pair
+            header_bits = 10 * len(code_lengths) - 1
+        encoded_bits = header_bits + encoded_bit_count(frequency_map, code_lengths)
+        encoded_size = 4 + (encoded_bits + 7) // 8
+        return encoded_size >= stored_container_size(length)
+
+    def _write_header(
+        self,
+        frequency_map: Dict[int, int],
+        output_stream: BinaryIO,
+        length: Optional[int] = None,
+        recorder: StageRecorder = NULL_RECORDER,
+        code: Optional[_Code] = None,
+    ) -> Tuple[BitWriter, CodesByByte]:
+        """Write the length and code header; return the writer and per-byte codes.
+
+        ``length`` defaults to the total count of ``frequency_map``, and
+        ``code`` to one built from it.
+        """
+        if length is None:
+            length = sum(frequency_map.values())
+        if length > MAX_INPUT_LENGTH:
+            raise ValueError(
+                f"Input of {length} bytes exceeds the 4-byte length header; "
+                "use BlockCompressor for inputs over 4 GiB"
+            )
+        output_stream.write(length.to_bytes(4, byteorder="big"))
+
+        if code is None:
+            code = self._build_code(frequency_map, recorder)
         bit_writer = BitWriter(output_stream)
-        for bit in all_bits:
-            bit_writer.write_bit(bit)
-        bit_writer.flush()
+        code_table = self._write_code_header(code, bit_writer, recorder)
+        codes_by_byte = [code_table.get(byte_value, (0, 0)) for byte_value in range(256)]
+        return bit_writer, codes_by_byte
+
+    def _write_code_header(
+        self,
+        code: _Code,
+        bit_writer: BitWriter,
+        recorder: StageRecorder = NULL_RECORDER,
+    ) -> Dict[int, Tuple[int, int]]:
+        symbol_count = len(code.code_lengths)
+        if code.tree is None:
+            serialize_code_lengths(code.code_lengths, bit_writer)
+            recorder.lap("write_header", bit_count=bit_writer.bit_position)
+            code_table = assign_canonical_codes(code.code_lengths)
+            recorder.lap("assign_codes", symbol_count=symbol_count)
+            return code_table
+
+        # Written as a single code rather than bit by bit
+        tree_bits = bytes(serialize_flat_tree(code.tree))
+        bit_writer.write_code(int(tree_bits.translate(_BIT_DIGITS), 2), len(tree_bits))
+        recorder.lap("write_header", bit_count=bit_writer.bit_position)
+        code_table = flat_code_table(code.tree)
+        recorder.lap("generate_codes", symbol_count=symbol_count)
+        return code_table
+
+
+def compress_bytes(data: ByteBuffer, canonical: bool = False) -> bytes:
+    """Compress an in-memory buffer and return the compressed bytes.
+
+    Writes the single-table format, or a block container for inputs over
+    ``MAX_INPUT_LENGTH`` bytes and wherever ``HuffmanCompressor`` writes one,
+    exactly as ``huffman-compress`` does for files.
+    """
+    view = memoryview(data)
+    output_stream = BytesIO()
+    if len(view) <= MAX_INPUT_LENGTH:
+        HuffmanCompressor(canonical=canonical).compress_buffer(view, output_stream)
+    else:
+        BlockCompressor().compress_buffer(view, output_stream)
+    return output_stream.getvalue()
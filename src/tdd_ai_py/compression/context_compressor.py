@@ -0,0 +1,124 @@
+from itertools import chain
+from operator import getitem
+from typing import BinaryIO, Callable, Iterable, List, Optional, Tuple
+
+from .bit_writer import BitWriter
+from .block_format import DEFAULT_MAX_CODE_LENGTH, encode_varint
+from .context_model import (
+    CONTEXT_MAGIC,
+    INITIAL_CONTEXT,
+    build_context_model,
+    serialize_context_model,
+    table_codes,
+)
+from .frequency_counter import count_context_frequencies
+from .numpy_engine import (
+    MAX_VECTOR_CODE_LENGTH,
+    count_contexts,
+    encode_context_chunks,
+    resolve_use_numpy,
+)
+from .stage_metrics import MetricsCallback, stage_recorder
+from .stream_utils import ByteBuffer, iter_chunks, iter_slices
+
+BUFFER_SLICE_SIZE = 1 << 16
+
+CodesByContext = List[List[Tuple[int, int]]]
+
+
+def _encode_python(
+    chunks: Iterable[ByteBuffer], codes_by_context: CodesByContext, bit_writer: BitWriter
+) -> None:
+    previous = INITIAL_CONTEXT
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        tables = map(codes_by_context.__getitem__, chain((previous,), chunk))
+        bit_writer.write_codes(map(getitem, tables, chunk))
+        previous = chunk[-1]
+
+
+class ContextCompressor:
+    """Two-pass order-1 Huffman compressor.
+
+    Each byte is coded with the table of the byte before it, so text and other
+    structured data compress well below ``HuffmanCompressor``'s single table.
+    ``build_context_model`` decides which contexts are worth a table of their
+    own; the rest share one. Tables are canonical and capped at
+    ``max_code_length`` bits, and the header carries only their code lengths.
+    See ``context_model`` for the layout; ``HuffmanDecompressor`` recognises
+    the stream by its magic. The length is a varint, so there is no input
+    size limit.
+
+    ``use_numpy`` and ``metrics`` work as for ``HuffmanCompressor``.
+    """
+
+    def __init__(
+        self,
+        max_code_length: int = DEFAULT_MAX_CODE_LENGTH,
+        use_numpy: Optional[bool] = None,
+        metrics: Optional[MetricsCallback] = None,
+    ) -> None:
+        if not 1 <= max_code_length <= MAX_VECTOR_CODE_LENGTH:
+            raise ValueError(
+                f"max_code_length must be between 1 and {MAX_VECTOR_CODE_LENGTH}"
+            )
+        self._max_code_length = max_code_length
+        resolve_use_numpy(use_numpy)  # fail fast if NumPy is required but missing
+        self._use_numpy = use_numpy
+        self._metrics = metrics
+
+    def compress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        if not input_stream.seekable():
+            raise ValueError("ContextCompressor needs a seekable input")
+        length = input_stream.seek(0, 2)
+
+        def chunks() -> Iterable[ByteBuffer]:
+            input_stream.seek(0)
+            return iter_chunks(input_stream, BUFFER_SLICE_SIZE)
+
+        self._write(chunks, length, output_stream)
+
+    def compress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        view = memoryview(data)
+        self._write(
+            lambda: iter_slices(view, BUFFER_SLICE_SIZE), len(view), output_stream
+        )
+
+    def _write(
+        self,
+        chunks: Callable[[], Iterable[ByteBuffer]],
+        length: int,
+        output_stream: BinaryIO,
+    ) -> None:
+        """Count pairs over ``chunks()``, then encode a second ``chunks()``."""
+        recorder = stage_recorder(self._metrics)
+        use_numpy = resolve_use_numpy(self._use_numpy, length)
+        if use_numpy:
+            context_counts = count_contexts(chunks(), INITIAL_CONTEXT)
+        else:
+            context_counts = count_context_frequencies(chunks(), INITIAL_CONTEXT)
+        pair_count = len(context_counts) - context_counts.count(0)
+        recorder.lap("count_frequencies", length, pair_count)
+        model = build_context_model(context_counts, self._max_code_length)
+        recorder.lap("code_lengths", symbol_count=len(model.tables))
+
+        output_stream.write(CONTEXT_MAGIC + encode_varint(length))
+        bit_writer = BitWriter(output_stream)
+        serialize_context_model(model, bit_writer)
+        recorder.lap("write_header", bit_count=bit_writer.bit_position)
+        codes_by_table = table_codes(model)
+        recorder.lap("assign_codes", symbol_count=pair_count)
+
+        start = bit_writer.bit_position
+        if use_numpy:
+            encode_context_chunks(
+                chunks(), codes_by_table, model.table_of_context, bit_writer
+            )
+        else:
+            codes_by_context = [codes_by_table[table] for table in model.table_of_context]
+            _encode_python(chunks(), codes_by_context, bit_writer)
+        encoded = bit_writer.bit_position
+        recorder.lap("encode", length, length, encoded - start)
+        bit_writer.flush()
+        recorder.lap("flush", bit_count=bit_writer.bit_position - encoded)
@@ -0,0 +1,136 @@
+"""Order-1 context model: a canonical code table per preceding byte.
+
+Stream layout::
+
+    CONTEXT_MAGIC  uncompressed_length:varint  context map  tables  data bits
+
+The context map is a 9-bit count of the contexts (preceding byte values) that
+have a table of their own, followed by their values as Elias-gamma coded gaps.
+Every other context shares table 0. The tables follow as code-length headers,
+the shared one first and then one per listed context in ascending order, and
+the data bits are padded to a byte. The first byte is coded in context
+``INITIAL_CONTEXT``.
+"""
+
+from itertools import compress
+from math import log2
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from .bit_writer import BitWriter
+from .canonical_codes import (
+    assign_canonical_codes,
+    compute_code_lengths,
+    encoded_bit_count,
+)
+from .code_length_serializer import (
+    LENGTH_WIDTH_BITS,
+    SYMBOL_COUNT_BITS,
+    serialize_code_lengths,
+    serialized_code_lengths_bits,
+    write_elias_gamma,
+)
+
+CONTEXT_MAGIC = b"\x89HC\x01"
+CONTEXT_COUNT = 256
+INITIAL_CONTEXT = 0
+SHARED_TABLE = 0
+
+
+class ContextModel(NamedTuple):
+    # Index into ``tables`` for every context; SHARED_TABLE for grouped ones
+    table_of_context: List[int]
+    tables: List[Dict[int, int]]
+
+
+def _own_table_lower_bound(counts: Dict[int, int]) -> float:
+    """Fewest bits a context could cost with a table of its own.
+
+    No code beats the entropy, and the header needs at least one gap bit plus
+    the length field per symbol, which is as wide as a complete code requires.
+    """
+    total = sum(counts.values())
+    entropy = total * log2(total) - sum(count * log2(count) for count in counts.values())
+    min_width = (max(1, (len(counts) - 1).bit_length()) - 1).bit_length()
+    header = SYMBOL_COUNT_BITS + LENGTH_WIDTH_BITS + len(counts) * (1 + min_width)
+    # Slack for rounding, as a code can meet the entropy exactly
+    return entropy + header - 1
+
+
+def build_context_model(
+    context_counts: Sequence[int], max_code_length: int
+) -> ContextModel:
+    """Choose which contexts get a table of their own and compute all tables.
+
+    ``context_counts`` holds ``1 << 16`` counts indexed by ``preceding << 8 |
+    byte``. A context gets its own table only when its data bits plus the
+    table's header cost fewer bits than coding it with the order-0 code of the
+    whole input. The rare and flat contexts left over are pooled into the
+    shared table. Contexts that cannot win even at the entropy are pooled
+    without building their code.
+    """
+    counts_by_context: List[Dict[int, int]] = []
+    totals: Dict[int, int] = {}
+    for context in range(CONTEXT_COUNT):
+        row = context_counts[context << 8 : (context + 1) << 8]
+        counts = dict(zip(compress(range(CONTEXT_COUNT), row), filter(None, row)))
+        counts_by_context.append(counts)
+        for symbol, count in counts.items():
+            totals[symbol] = totals.get(symbol, 0) + count
+    order0_lengths = compute_code_lengths(totals, max_code_length)
+
+    table_of_context = [SHARED_TABLE] * CONTEXT_COUNT
+    tables: List[Dict[int, int]] = [{}]
+    shared: Dict[int, int] = {}
+    previous_context = -1
+    for context, counts in enumerate(counts_by_context):
+        if not counts:
+            continue
+        order0_bits = encoded_bit_count(counts, order0_lengths)
+        if _own_table_lower_bound(counts) < order0_bits:
+            code_lengths = compute_code_lengths(counts, max_code_length)
+            own_bits = (
+                encoded_bit_count(counts, code_lengths)
+                + serialized_code_lengths_bits(code_lengths)
+                + 2 * (context - previous_context).bit_length()
+                - 1
+            )
+            if own_bits < order0_bits:
+                table_of_context[context] = len(tables)
+                tables.append(code_lengths)
+                previous_context = context
+                continue
+        for symbol, count in counts.items():
+            shared[symbol] = shared.get(symbol, 0) + count
+    tables[SHARED_TABLE] = compute_code_lengths(shared, max_code_length)
+    return ContextModel(table_of_context, tables)
+
+
+def serialize_context_model(model: ContextModel, bit_writer: BitWriter) -> None:
+    """Write the context map and every table of ``model``."""
+    own_contexts = [
+        context
+        for context, table in enumerate(model.table_of_context)
+        if table != SHARED_TABLE
+    ]
+    bit_writer.write_code(len(own_contexts), SYMBOL_COUNT_BITS)
+    previous_context = -1
+    for context in own_contexts:
+        write_elias_gamma(context - previous_context, bit_writer)
+        previous_context = context
+    for code_lengths in model.tables:
+        serialize_code_lengths(code_lengths, bit_writer)
+
+
+def table_codes(model: ContextModel) -> List[List[Tuple[int, int]]]:
+    """Return the ``(code, length)`` of every byte value in every table.
+
+    Bytes missing from a table get ``(0, 0)``. Index the result with
+    ``model.table_of_context`` to get a context's codes.
+    """
+    codes_by_table = []
+    for code_lengths in model.tables:
+        codes = assign_canonical_codes(code_lengths)
+        codes_by_table.append(
+            [codes.get(byte_value, (0, 0)) for byte_value in range(CONTEXT_COUNT)]
+        )
+    return codes_by_table
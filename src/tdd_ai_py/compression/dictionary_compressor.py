@@ -0,0 +1,28 @@
+from typing import BinaryIO
+
+from .bit_writer import BitWriter
+from .block_format import encode_varint
+from .static_table import StaticCodeTable, static_codes_by_byte
+from .stream_utils import ByteBuffer
+
+
+class DictionaryCompressor:
+    """Compress messages against a pre-trained ``StaticCodeTable``.
+
+    The codes are built once per compressor, so a message costs no frequency
+    pass, tree or header: its frame holds only the table ID and its length.
+    Decompress with a ``DictionaryDecompressor`` that has the table loaded.
+    """
+
+    def __init__(self, table: StaticCodeTable) -> None:
+        self._frame_prefix = encode_varint(table.table_id)
+        self._codes_by_byte = static_codes_by_byte(table)
+
+    def compress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        self.compress_buffer(input_stream.read(), output_stream)
+
+    def compress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        output_stream.write(self._frame_prefix + encode_varint(len(data)))
+        bit_writer = BitWriter(output_stream)
+        bit_writer.write_codes(map(self._codes_by_byte.__getitem__, data))
+        bit_writer.flush()
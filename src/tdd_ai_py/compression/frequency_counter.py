@@ -1,7 +1,8 @@
 from collections import Counter
-from typing import BinaryIO, Dict
+from itertools import chain
+from typing import BinaryIO, Dict, Iterable, List
 
-from .stream_utils import iter_bytes
+from .stream_utils import ByteBuffer, iter_bytes, wide_symbols
 
 
 def create_frequency_map(input_stream: BinaryIO) -> Dict[int, int]:
@@ -10,3 +11,43 @@ def create_frequency_map(input_stream: BinaryIO) -> Dict[int, int]:
     Uses functional composition: stream -> iterable -> counter -> dict
     """
     return dict(Counter(iter_bytes(input_stream)))
+
+
+def count_byte_frequencies(data: ByteBuffer) -> Dict[int, int]:
+    """Create a frequency map for an in-memory buffer."""
+    return dict(Counter(data))
+
+
+def count_chunk_frequencies(chunks: Iterable[ByteBuffer]) -> Dict[int, int]:
+    """Create a frequency map over a sequence of buffers."""
+    counter: Counter[int] = Counter()
+    for chunk in chunks:
+        counter.update(chunk)
+    return dict(counter)
+
+
+def count_context_frequencies(
+    chunks: Iterable[ByteBuffer], previous: int = 0
+) -> List[int]:
+    """Count every (preceding byte, byte) pair across a sequence of buffers.
+
+    Returns ``1 << 16`` counts indexed by ``preceding << 8 | byte``. The first
+    byte is counted as preceded by ``previous``.
+    """
+    counts = [0] * (1 << 16)
+    for chunk in chunks:
+        for (context, byte_value), count in Counter(
+            zip(chain((previous,), chunk), chunk)
+        ).items():
+            counts[(context << 8) | byte_value] += count
+        if len(chunk):
+            previous = chunk[-1]
+    return counts
+
+
+def count_wide_frequencies(chunks: Iterable[ByteBuffer]) -> Dict[int, int]:
+    """Count the big-endian 16-bit symbols of even-length chunks, by value."""
+    counter: Counter[int] = Counter()
+    for chunk in chunks:
+        counter.update(wide_symbols(chunk))
+    return dict(sorted(counter.items()))
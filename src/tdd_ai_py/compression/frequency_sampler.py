@@ -0,0 +1,55 @@
+from typing import BinaryIO, Dict, List
+
+from .stream_utils import ByteBuffer
+
+DEFAULT_SAMPLE_CHUNK_SIZE = 1 << 16
+ESCAPE_COUNT = 1
+
+
+def covers_input(length: int, sample_chunks: int, chunk_size: int) -> bool:
+    """Whether ``sample_chunks`` chunks of ``chunk_size`` bytes hold the whole input."""
+    return sample_chunks * chunk_size >= length
+
+
+def sample_offsets(length: int, sample_chunks: int, chunk_size: int) -> List[int]:
+    """Start offsets of ``sample_chunks`` chunks spread evenly over the input.
+
+    The first chunk starts the input and the last one ends it. When the chunks
+    would cover the whole input, it is tiled instead so the sample is exact.
+    """
+    if covers_input(length, sample_chunks, chunk_size):
+        return list(range(0, length, chunk_size))
+    if sample_chunks == 1:
+        return [0]
+    span = length - chunk_size
+    return [span * index // (sample_chunks - 1) for index in range(sample_chunks)]
+
+
+def read_stream_samples(
+    input_stream: BinaryIO, offsets: List[int], chunk_size: int
+) -> List[bytes]:
+    """Read ``chunk_size`` bytes at each offset of a seekable stream."""
+    samples = []
+    for offset in offsets:
+        input_stream.seek(offset)
+        samples.append(input_stream.read(chunk_size))
+    return samples
+
+
+def slice_buffer_samples(
+    buffer: memoryview, offsets: List[int], chunk_size: int
+) -> List[ByteBuffer]:
+    """Take zero-copy ``chunk_size``-byte views at each offset of a buffer."""
+    return [buffer[offset : offset + chunk_size] for offset in offsets]
+
+
+def add_escape_counts(frequency_map: Dict[int, int]) -> Dict[int, int]:
+    """Give every byte value missing from a sample a count of ``ESCAPE_COUNT``.
+
+    Bytes the sample never saw still receive a (long) code, so the rest of the
+    input can be encoded with the sampled table and no format change.
+    """
+    escaped = dict(frequency_map)
+    for byte_value in range(256):
+        escaped.setdefault(byte_value, ESCAPE_COUNT)
+    return escaped
@@ -1,6 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from .huffman_tree_builder import HuffmanNode
+from .huffman_tree_builder import FlatTree, HuffmanNode
 
 
 def generate_huffman_codes(root: HuffmanNode) -> Dict[int, List[int]]:
@@ -19,3 +19,44 @@ def generate_huffman_codes(root: HuffmanNode) -> Dict[int, List[int]]:
     return (
         {root.character: [0]} if root.character is not None else _generate_codes(root, [])
     )
+
+
+def generate_code_table(root: HuffmanNode) -> Dict[int, Tuple[int, int]]:
+    """Generate ``(code, length)`` integer pairs for every leaf of the tree.
+
+    Codes are accumulated as integers on an explicit stack, so no bit lists are
+    copied per level and deep trees do not hit the recursion limit.
+    """
+    if root.character is not None:
+        return {root.character: (0, 1)}
+
+    table: Dict[int, Tuple[int, int]] = {}
+    stack = [(root, 0, 0)]
+    while stack:
+        node, code, length = stack.pop()
+        if node.character is not None:
+            table[node.character] = (code, length)
+            continue
+        if node.right:
+            stack.append((node.right, (code << 1) | 1, length + 1))
+        if node.left:
+            stack.append((node.left, code << 1, length + 1))
+    return table
+
+
+def flat_code_table(tree: FlatTree) -> Dict[int, Tuple[int, int]]:
+    """``generate_code_table`` for a ``FlatTree``."""
+    symbol, left, right = tree.symbol, tree.left, tree.right
+    if left[tree.root] < 0:
+        return {symbol[tree.root]: (0, 1)}
+
+    table: Dict[int, Tuple[int, int]] = {}
+    stack = [(tree.root, 0, 0)]
+    while stack:
+        index, code, length = stack.pop()
+        if left[index] < 0:
+            table[symbol[index]] = (code, length)
+            continue
+        stack.append((right[index], (code << 1) | 1, length + 1))
+        stack.append((left[index], code << 1, length + 1))
+    return table
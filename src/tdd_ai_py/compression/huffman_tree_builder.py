@@ -1,5 +1,5 @@
 import heapq
-from typing import Callable, Dict, List, Tuple, TypeVar
+from typing import Callable, Dict, List, NamedTuple, Tuple, TypeVar
 
 T = TypeVar("T")
 
@@ -17,6 +17,8 @@ def find_two_lowest_items(items: List[T], key_func: Callable[[T], int]) -> Tuple
 
 
 class HuffmanNode:
+    __slots__ = ("weight", "character", "left", "right")
+
     def __init__(
         self,
         weight: int,
@@ -37,14 +39,49 @@ class HuffmanNode:
         return self.weight < other.weight
 
     def __eq__(self, other: object) -> bool:
+        """Compare whole subtrees, iteratively so deep trees cannot overflow."""
         if not isinstance(other, HuffmanNode):
             return False
-        return (
-            self.weight == other.weight
-            and self.character == other.character
-            and self.left == other.left
-            and self.right == other.right
-        )
+        pairs: List[Tuple[HuffmanNode | None, HuffmanNode | None]] = [(self, other)]
+        while pairs:
+            first, second = pairs.pop()
+            if first is None or second is None:
+                if first is not second:
+                    return False
+                continue
+            if first.weight != second.weight or first.character != second.character:
+                return False
+            pairs.append((first.left, second.left))
+            pairs.append((first.right, second.right))
+        return True
+
+
+class FlatTree(NamedTuple):
+    """Huffman tree held in parallel lists indexed by node number.
+
+    Leaves have ``left`` and ``right`` of ``-1`` and their byte in ``symbol``;
+    internal nodes have a ``symbol`` of ``-1``. Walking the tree is list
+    indexing on small ints, with no per-node objects.
+    """
+
+    symbol: List[int]
+    left: List[int]
+    right: List[int]
+    weight: List[int]
+    root: int
+
+
+class _HeapEntry:
+    """Heap item ordered by weight alone, so ties break as for ``HuffmanNode``."""
+
+    __slots__ = ("weight", "index")
+
+    def __init__(self, weight: int, index: int) -> None:
+        self.weight = weight
+        self.index = index
+
+    def __lt__(self, other: "_HeapEntry") -> bool:
+        return self.weight < other.weight
 
 
 def create_leaf_node(character: int, weight: int) -> HuffmanNode:
@@ -55,17 +92,68 @@ def create_internal_node(left: HuffmanNode, right: HuffmanNode) -> HuffmanNode:
     return HuffmanNode(weight=left.weight + right.weight, left=left, right=right)
 
 
-def build_huffman_tree(frequency_map: Dict[int, int]) -> HuffmanNode:
-    """Build Huffman tree using iterative heap-based approach to avoid recursion."""
-    # Create initial heap of leaf nodes
-    heap = [create_leaf_node(char, freq) for char, freq in frequency_map.items()]
+def build_flat_tree(frequency_map: Dict[int, int]) -> FlatTree:
+    """Build a Huffman tree into flat lists using an iterative heap merge.
+
+    Leaves are numbered in ``frequency_map`` order and every merge appends one
+    internal node, so children always precede their parent.
+    """
+    symbol = list(frequency_map)
+    weight = list(frequency_map.values())
+    left = [-1] * len(symbol)
+    right = [-1] * len(symbol)
+    heap = [_HeapEntry(freq, index) for index, freq in enumerate(weight)]
     heapq.heapify(heap)
 
-    # Iteratively build tree using heap operations (no recursion)
     while len(heap) > 1:
-        left = heapq.heappop(heap)
-        right = heapq.heappop(heap)
-        merged = create_internal_node(left, right)
-        heapq.heappush(heap, merged)
+        first = heapq.heappop(heap)
+        second = heapq.heappop(heap)
+        merged = first.weight + second.weight
+        heapq.heappush(heap, _HeapEntry(merged, len(symbol)))
+        symbol.append(-1)
+        left.append(first.index)
+        right.append(second.index)
+        weight.append(merged)
+
+    return FlatTree(symbol, left, right, weight, heap[0].index)
+
+
+def flat_tree_to_nodes(tree: FlatTree) -> HuffmanNode:
+    """Materialize a ``FlatTree`` as linked ``HuffmanNode`` objects."""
+    nodes = [
+        HuffmanNode(weight, None if character < 0 else character)
+        for character, weight in zip(tree.symbol, tree.weight)
+    ]
+    for node, left, right in zip(nodes, tree.left, tree.right):
+        if left >= 0:
+            node.left = nodes[left]
+            node.right = nodes[right]
+    return nodes[tree.root]
+
+
+def flatten_tree(root: HuffmanNode) -> FlatTree:
+    """Number the nodes of a linked tree in preorder and store it flat."""
+    symbol: List[int] = []
+    left: List[int] = []
+    right: List[int] = []
+    weight: List[int] = []
+    stack: List[Tuple[HuffmanNode, int, List[int]]] = [(root, -1, left)]
+    while stack:
+        node, parent, parent_links = stack.pop()
+        index = len(symbol)
+        if parent >= 0:
+            parent_links[parent] = index
+        symbol.append(-1 if node.character is None else node.character)
+        left.append(-1)
+        right.append(-1)
+        weight.append(node.weight)
+        if node.right:
+            stack.append((node.right, index, right))
+        if node.left:
+            stack.append((node.left, index, left))
+    return FlatTree(symbol, left, right, weight, 0)
+
 
-    return heap[0]
+def build_huffman_tree(frequency_map: Dict[int, int]) -> HuffmanNode:
+    """Build Huffman tree using iterative heap-based approach to avoid recursion."""
+    return flat_tree_to_nodes(build_flat_tree(frequency_map))
@@ -0,0 +1,365 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .bit_writer import BitWriter
+from .run_length import MAX_RUN, MIN_RUN, RUN_SYMBOL_BASE, RUN_SYMBOL_COUNT
+from .stream_utils import ByteBuffer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None  # type: ignore[assignment]
+
+NUMPY_AVAILABLE = np is not None
+NUMPY_CHUNK_SIZE = 1 << 16
+# Below this many bytes, building the pair tables costs more than it saves
+MIN_VECTOR_INPUT_LENGTH = 1 << 14
+# Bytes are encoded two at a time, so a pair of codes must fit one 64-bit word
+MAX_VECTOR_CODE_LENGTH = 32
+
+
+def resolve_use_numpy(use_numpy: Optional[bool], length: Optional[int] = None) -> bool:
+    """Resolve ``None`` to "use NumPy if installed"; reject ``True`` without it.
+
+    With ``length`` given, ``None`` also keeps short inputs on the Python path.
+    """
+    if use_numpy is None:
+        return NUMPY_AVAILABLE and (length is None or length >= MIN_VECTOR_INPUT_LENGTH)
+    if use_numpy and not NUMPY_AVAILABLE:
+        raise ImportError("use_numpy=True requires NumPy to be installed")
+    return use_numpy
+
+
+def _byte_counts(symbols: "np.ndarray") -> "np.ndarray":
+    """Histogram bytes by counting big-endian byte pairs, halving the elements."""
+    even = symbols.size & ~1
+    pairs = np.bincount(symbols[:even].view(">u2"), minlength=1 << 16).reshape(256, 256)
+    counts: "np.ndarray" = pairs.sum(axis=1) + pairs.sum(axis=0)
+    if even < symbols.size:
+        counts[symbols[-1]] += 1
+    return counts
+
+
+def count_frequencies(chunks: Iterable[ByteBuffer]) -> Dict[int, int]:
+    """Histogram bytes with ``bincount``.
+
+    Keys are inserted in order of first occurrence, exactly like ``Counter``,
+    because tree construction breaks weight ties by that order.
+    """
+    counts = np.zeros(256, dtype=np.int64)
+    order: List[int] = []
+    for chunk in chunks:
+        symbols = np.frombuffer(chunk, dtype=np.uint8)
+        chunk_counts = _byte_counts(symbols)
+        new_symbols = np.flatnonzero((chunk_counts > 0) & (counts == 0)).tolist()
+        if new_symbols:
+            order += sorted(new_symbols, key=lambda s: int(np.argmax(symbols == s)))
+        counts += chunk_counts
+    return {symbol: int(counts[symbol]) for symbol in order}
+
+
+def _pair_tables(
+    codes_by_byte: List[Tuple[int, int]],
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return the length and MSB-aligned 64-bit code of every byte pair."""
+    codes = np.array([code for code, _ in codes_by_byte], dtype=np.uint64)
+    lengths = np.array([length for _, length in codes_by_byte], dtype=np.int64)
+    pair_lengths = (lengths[:, None] + lengths[None, :]).ravel()
+    pair_codes = (codes[:, None] << lengths[None, :].astype(np.uint64)) | codes[None, :]
+    pair_words = pair_codes.ravel() << (64 - pair_lengths).astype(np.uint64)
+    return pair_lengths, pair_words
+
+
+def _pack_words(
+    words: "np.ndarray",
+    lengths: "np.ndarray",
+    pending_value: int,
+    pending_bits: int,
+    bit_writer: BitWriter,
+) -> Tuple[int, int]:
+    """Write MSB-aligned ``words`` of ``lengths`` bits after ``pending_bits`` bits.
+
+    ``cumsum`` over the lengths gives each word's bit offset. A word is split at
+    its offset into a head and a tail for two consecutive output words. Words
+    are at most 64 bits, so every output word but the last contains the start
+    of some word, and ``bitwise_or.reduceat`` assembles the output words
+    without a scatter. Returns the bits of the final partial byte as the new
+    ``(pending_value, pending_bits)``.
+    """
+    ends = np.cumsum(lengths) + pending_bits
+    starts = ends - lengths
+    total_bits = int(ends[-1])
+
+    offsets = (starts & 63).view(np.uint64)
+    # NumPy defines shifts by 64 or more as zero, so aligned words get no tail
+    heads = words >> offsets
+    tails = words << (np.uint64(64) - offsets)
+    groups = np.searchsorted(starts, np.arange(0, int(starts[-1]) + 1, 64))
+    output = np.zeros(groups.size + 1, dtype=np.uint64)
+    output[:-1] = np.bitwise_or.reduceat(heads, groups)
+    output[1:] |= np.bitwise_or.reduceat(tails, groups)
+    if pending_bits:
+        output[0] |= np.uint64(pending_value << (64 - pending_bits))
+
+    packed = output.astype(">u8").tobytes()
+    full_bytes = total_bits >> 3
+    bit_writer.write_bytes(packed[:full_bytes])
+    pending_bits = total_bits & 7
+    pending_value = packed[full_bytes] >> (8 - pending_bits) if pending_bits else 0
+    return pending_value, pending_bits
+
+
+def encode_chunks(
+    chunks: Iterable[ByteBuffer],
+    codes_by_byte: List[Tuple[int, int]],
+    bit_writer: BitWriter,
+) -> None:
+    """Write the codes of every byte in ``chunks`` using array operations.
+
+    Bytes are looked up in pairs and the pairs' words packed by
+    ``_pack_words``. Codes longer than ``MAX_VECTOR_CODE_LENGTH`` fall back to
+    ``BitWriter.write_codes``.
+    """
+    if max(length for _, length in codes_by_byte) > MAX_VECTOR_CODE_LENGTH:
+        for chunk in chunks:
+            bit_writer.write_codes(map(codes_by_byte.__getitem__, chunk))
+        return
+
+    pair_lengths, pair_words = _pair_tables(codes_by_byte)
+    pending_value = 0
+    pending_bits = 0
+
+    for chunk in chunks:
+        even = len(chunk) & ~1
+        if even:
+            pairs = np.frombuffer(chunk, dtype=">u2", count=even >> 1).astype(np.intp)
+            pending_value, pending_bits = _pack_words(
+                pair_words[pairs],
+                pair_lengths[pairs],
+                pending_value,
+                pending_bits,
+                bit_writer,
+            )
+
+        if even < len(chunk):
+            code, length = codes_by_byte[chunk[-1]]
+            pending_value = (pending_value << length) | code
+            pending_bits += length
+            whole_bytes = pending_bits >> 3
+            if whole_bytes:
+                pending_bits &= 7
+                bit_writer.write_bytes(
+                    (pending_value >> pending_bits).to_bytes(whole_bytes, "big")
+                )
+                pending_value &= (1 << pending_bits) - 1
+
+    if pending_bits:
+        bit_writer.write_code(pending_value, pending_bits)
+
+
+def _context_indices(symbols: "np.ndarray", previous: int) -> "np.ndarray":
+    """``preceding << 8 | byte`` for every byte, the first preceded by ``previous``."""
+    indices = symbols.astype(np.intp)
+    indices[1:] |= indices[:-1] << 8
+    indices[0] |= previous << 8
+    return indices
+
+
+def count_contexts(chunks: Iterable[ByteBuffer], previous: int = 0) -> List[int]:
+    """Vectorized ``count_context_frequencies``: ``bincount`` over byte pairs."""
+    counts = np.zeros(1 << 16, dtype=np.int64)
+    for chunk in chunks:
+        symbols = np.frombuffer(chunk, dtype=np.uint8)
+        if symbols.size:
+            counts += np.bincount(_context_indices(symbols, previous), minlength=1 << 16)
+            previous = int(symbols[-1])
+    context_counts: List[int] = counts.tolist()
+    return context_counts
+
+
+def encode_context_chunks(
+    chunks: Iterable[ByteBuffer],
+    codes_by_table: List[List[Tuple[int, int]]],
+    table_of_context: List[int],
+    bit_writer: BitWriter,
+    previous: int = 0,
+) -> None:
+    """Write every byte's code from the table of its preceding byte.
+
+    Codes are looked up by ``preceding << 8 | byte`` and packed by
+    ``_pack_words``; they must not exceed 64 bits. The first byte is coded in
+    context ``previous``.
+    """
+    table_array = np.array(codes_by_table, dtype=np.uint64).reshape(-1, 256, 2)
+    by_context = table_array[np.array(table_of_context, dtype=np.intp)].reshape(-1, 2)
+    codes = by_context[:, 0]
+    lengths = by_context[:, 1].astype(np.int64)
+    code_words = codes << (np.uint64(64) - by_context[:, 1])
+    pending_value = 0
+    pending_bits = 0
+    for chunk in chunks:
+        symbols = np.frombuffer(chunk, dtype=np.uint8)
+        if not symbols.size:
+            continue
+        indices = _context_indices(symbols, previous)
+        pending_value, pending_bits = _pack_words(
+            code_words[indices], lengths[indices], pending_value, pending_bits, bit_writer
+        )
+        previous = int(symbols[-1])
+    if pending_bits:
+        bit_writer.write_code(pending_value, pending_bits)
+
+
+def count_wide_symbols(chunks: Iterable[ByteBuffer]) -> Dict[int, int]:
+    """Histogram big-endian 16-bit symbols of even-length chunks, by value."""
+    counts = np.zeros(1 << 16, dtype=np.int64)
+    for chunk in chunks:
+        counts += np.bincount(np.frombuffer(chunk, dtype=">u2"), minlength=1 << 16)
+    symbols = np.flatnonzero(counts)
+    return dict(zip(symbols.tolist(), counts[symbols].tolist()))
+
+
+def encode_wide_chunks(
+    chunks: Iterable[ByteBuffer],
+    codes_by_symbol: List[Tuple[int, int]],
+    bit_writer: BitWriter,
+) -> None:
+    """Write the code of every big-endian 16-bit symbol of even-length chunks.
+
+    Codes are packed by ``_pack_words`` and must not exceed 64 bits.
+    """
+    lengths = np.array([length for _, length in codes_by_symbol], dtype=np.int64)
+    codes = np.array([code for code, _ in codes_by_symbol], dtype=np.uint64)
+    code_words = codes << (64 - lengths).astype(np.uint64)
+    pending_value = 0
+    pending_bits = 0
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        symbols = np.frombuffer(chunk, dtype=">u2").astype(np.intp)
+        pending_value, pending_bits = _pack_words(
+            code_words[symbols], lengths[symbols], pending_value, pending_bits, bit_writer
+        )
+    if pending_bits:
+        bit_writer.write_code(pending_value, pending_bits)
+
+
+def _iter_runs(
+    chunks: Iterable[ByteBuffer],
+) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    """Yield the values and lengths of the runs of equal bytes in ``chunks``.
+
+    Runs start where ``flatnonzero`` finds a byte unlike its predecessor. The
+    trailing run of a chunk is carried into the next one, and runs longer
+    than ``MAX_RUN`` are cut into pieces, as ``iter_run_tokens`` does.
+    """
+    value = -1
+    carried = 0
+    for chunk in chunks:
+        symbols = np.frombuffer(chunk, dtype=np.uint8)
+        if not symbols.size:
+            continue
+        starts = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+        values = symbols[np.concatenate(([0], starts))].astype(np.intp)
+        lengths = np.diff(starts, prepend=0, append=symbols.size)
+        if values[0] == value:
+            lengths[0] += carried
+        elif carried:
+            values = np.concatenate(([value], values))
+            lengths = np.concatenate(([carried], lengths))
+        value, carried = int(values[-1]), int(lengths[-1])
+        if values.size > 1:
+            yield _cut_long_runs(values[:-1], lengths[:-1])
+    if carried:
+        yield _cut_long_runs(np.array([value], dtype=np.intp), np.array([carried]))
+
+
+def _cut_long_runs(
+    values: "np.ndarray", lengths: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    pieces = -(-lengths // MAX_RUN)
+    if pieces.max() == 1:
+        return values, lengths
+    cut_lengths = np.full(int(pieces.sum()), MAX_RUN, dtype=lengths.dtype)
+    cut_lengths[np.cumsum(pieces) - 1] = lengths - (pieces - 1) * MAX_RUN
+    return np.repeat(values, pieces), cut_lengths
+
+
+def _run_length_symbols(
+    values: "np.ndarray", lengths: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Expand runs into symbols, and locate the run symbols among them.
+
+    Runs of ``MIN_RUN`` or more bytes become a literal and a run symbol, and
+    ``repeat`` copies shorter runs as literals. Returns the symbols, then the
+    position, repeat count and extra bit count of every run symbol.
+    """
+    is_run = lengths >= MIN_RUN
+    counts = np.where(is_run, 2, lengths)
+    symbols = np.repeat(values, counts)
+    positions = np.cumsum(counts)[is_run] - 1
+    repeats = lengths[is_run] - 1
+    # ``frexp`` returns the bit length as the exponent, exactly below 2**53
+    extra_bits = np.frexp(repeats)[1].astype(np.int64) - 1
+    symbols[positions] = RUN_SYMBOL_BASE + extra_bits
+    return symbols, positions, repeats, extra_bits
+
+
+def count_run_length_symbols(chunks: Iterable[ByteBuffer]) -> Dict[int, int]:
+    """Vectorized ``count_run_symbols(iter_run_tokens(chunks))``, by symbol."""
+    counts = np.zeros(RUN_SYMBOL_COUNT, dtype=np.int64)
+    for values, lengths in _iter_runs(chunks):
+        symbols = _run_length_symbols(values, lengths)[0]
+        counts += np.bincount(symbols, minlength=RUN_SYMBOL_COUNT)
+    symbols = np.flatnonzero(counts)
+    return dict(zip(symbols.tolist(), counts[symbols].tolist()))
+
+
+def encode_run_length_chunks(
+    chunks: Iterable[ByteBuffer],
+    codes_by_symbol: List[Tuple[int, int]],
+    bit_writer: BitWriter,
+) -> None:
+    """Write the run-length symbols of ``chunks`` with their extra bits.
+
+    A run symbol's extra bits are appended to its code, which gives words of
+    at most 63 bits for ``_pack_words``.
+    """
+    code_lengths = np.array([length for _, length in codes_by_symbol], dtype=np.int64)
+    codes = np.array([code for code, _ in codes_by_symbol], dtype=np.uint64)
+    pending_value = 0
+    pending_bits = 0
+    for values, run_lengths in _iter_runs(chunks):
+        symbols, positions, repeats, extra_bits = _run_length_symbols(values, run_lengths)
+        words = codes[symbols]
+        lengths = code_lengths[symbols]
+        shifts = extra_bits.astype(np.uint64)
+        low_bits = repeats.astype(np.uint64) ^ (np.uint64(1) << shifts)
+        words[positions] = (words[positions] << shifts) | low_bits
+        lengths[positions] += extra_bits
+        pending_value, pending_bits = _pack_words(
+            words << (64 - lengths).astype(np.uint64),
+            lengths,
+            pending_value,
+            pending_bits,
+            bit_writer,
+        )
+    if pending_bits:
+        bit_writer.write_code(pending_value, pending_bits)
+
+
+def sync_offsets(
+    data: ByteBuffer, lengths_by_byte: List[int], interval: int, start: int
+) -> List[int]:
+    """Bit offsets of every ``interval``-th byte's code, counted from ``start``.
+
+    The per-interval bit counts are summed with ``add.reduceat``.
+    """
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    lengths = np.array(lengths_by_byte, dtype=np.uint8)[symbols]
+    sums = np.add.reduceat(lengths, np.arange(0, symbols.size, interval), dtype=np.int64)
+    offsets = np.empty(sums.size, dtype=np.int64)
+    offsets[0] = start
+    np.cumsum(sums[:-1], out=offsets[1:])
+    offsets[1:] += start
+    offsets_list: List[int] = offsets.tolist()
+    return offsets_list
@@ -0,0 +1,110 @@
+"""Run-length tokens: literal bytes plus repeats of the previous byte.
+
+Stream layout::
+
+    RUN_LENGTH_MAGIC  uncompressed_length:varint
+    code-length header over 2**RUN_SYMBOL_BITS symbols  data bits (padded to a byte)
+
+Symbols 0-255 are literal bytes. Symbol ``RUN_SYMBOL_BASE + k`` repeats the
+previous byte ``r`` more times, where ``r`` has ``k + 1`` bits: its leading
+one is implied and its low ``k`` bits follow the symbol's code. A run of at
+least ``MIN_RUN`` equal bytes is coded as one literal and one run symbol,
+shorter runs as literals. Runs longer than ``MAX_RUN`` bytes are cut into
+pieces of ``MAX_RUN`` bytes, each coded on its own.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Tuple
+
+from .stream_utils import ByteBuffer
+
+RUN_LENGTH_MAGIC = b"\x89HR\x01"
+RUN_SYMBOL_BASE = 256
+RUN_CLASS_COUNT = 32
+RUN_SYMBOL_COUNT = RUN_SYMBOL_BASE + RUN_CLASS_COUNT
+RUN_SYMBOL_BITS = 9
+MIN_RUN = 4
+MAX_RUN = 1 << RUN_CLASS_COUNT
+
+# ``(literals, repeats)``: bytes coded as they are, then ``repeats`` more
+# copies of the last byte coded so far
+RunToken = Tuple[bytes, int]
+
+_RUN_START = re.compile(rb"(.)\1{%d}" % (MIN_RUN - 1), re.DOTALL)
+# A repeated literal byte is matched by a tight loop, unlike a backreference
+_RUN_OF = [re.compile(re.escape(bytes([value])) + b"*") for value in range(256)]
+
+
+def _run_end(value: int, data: bytes, position: int, end: int) -> int:
+    """Return where the run of ``value`` starting at ``position`` stops."""
+    match = _RUN_OF[value].match(data, position, end)
+    # ``b"x*"`` matches the empty string, so ``match`` is never None
+    return position if match is None else match.end()
+
+
+def _run_tokens(value: int, length: int) -> Iterator[RunToken]:
+    for start in range(0, length, MAX_RUN):
+        piece = min(MAX_RUN, length - start)
+        if piece < MIN_RUN:
+            yield bytes([value]) * piece, 0
+        else:
+            yield bytes([value]), piece - 1
+
+
+def iter_run_tokens(chunks: Iterable[ByteBuffer]) -> Iterator[RunToken]:
+    """Split the bytes of ``chunks`` into ``RunToken``s.
+
+    Runs are found with regular expressions, so long runs cost no Python work
+    per byte. The trailing run of a chunk is carried into the next one, so
+    the symbols do not depend on where the chunks are split.
+    """
+    value = 0
+    carried = 0
+    for chunk in chunks:
+        data = bytes(chunk)
+        if not data:
+            continue
+        position = 0
+        if carried:
+            position = _run_end(value, data, 0, len(data))
+            carried += position
+            if position == len(data):
+                continue
+            yield from _run_tokens(value, carried)
+        value = data[-1]
+        tail = len(data.rstrip(data[-1:]))
+        literals_start = position
+        while True:
+            match = _RUN_START.search(data, position, tail)
+            if match is None:
+                break
+            start = match.start()
+            position = _run_end(data[start], data, match.end(), tail)
+            if position - start <= MAX_RUN:
+                yield data[literals_start : start + 1], position - start - 1
+            else:
+                yield data[literals_start:start], 0
+                yield from _run_tokens(data[start], position - start)
+            literals_start = position
+        if literals_start < tail:
+            yield data[literals_start:tail], 0
+        carried = len(data) - tail
+    if carried:
+        yield from _run_tokens(value, carried)
+
+
+def run_symbol(repeats: int) -> Tuple[int, int]:
+    """Return the symbol coding ``repeats`` and the number of extra bits after it."""
+    extra_bits = repeats.bit_length() - 1
+    return RUN_SYMBOL_BASE + extra_bits, extra_bits
+
+
+def count_run_symbols(tokens: Iterable[RunToken]) -> Dict[int, int]:
+    """Count the literal and run symbols of ``tokens``, sorted by symbol."""
+    counter: Counter[int] = Counter()
+    for literals, repeats in tokens:
+        counter.update(literals)
+        if repeats:
+            counter[run_symbol(repeats)[0]] += 1
+    return dict(sorted(counter.items()))
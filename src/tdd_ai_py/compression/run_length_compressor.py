@@ -0,0 +1,128 @@
+from typing import BinaryIO, Callable, Iterable, List, Optional, Tuple
+
+from .bit_writer import BitWriter
+from .block_format import DEFAULT_MAX_CODE_LENGTH, encode_varint
+from .canonical_codes import assign_canonical_codes, compute_code_lengths
+from .code_length_serializer import serialize_code_lengths
+from .numpy_engine import (
+    MAX_VECTOR_CODE_LENGTH,
+    count_run_length_symbols,
+    encode_run_length_chunks,
+    resolve_use_numpy,
+)
+from .run_length import (
+    RUN_LENGTH_MAGIC,
+    RUN_SYMBOL_BITS,
+    RUN_SYMBOL_COUNT,
+    RunToken,
+    count_run_symbols,
+    iter_run_tokens,
+    run_symbol,
+)
+from .stage_metrics import MetricsCallback, stage_recorder
+from .stream_utils import ByteBuffer, iter_chunks, iter_slices
+
+BUFFER_SLICE_SIZE = 1 << 16
+
+CodesBySymbol = List[Tuple[int, int]]
+
+
+def _encode_python(
+    tokens: Iterable[RunToken], codes_by_symbol: CodesBySymbol, bit_writer: BitWriter
+) -> None:
+    for literals, repeats in tokens:
+        bit_writer.write_codes(map(codes_by_symbol.__getitem__, literals))
+        if repeats:
+            symbol, extra_bits = run_symbol(repeats)
+            code, code_length = codes_by_symbol[symbol]
+            bit_writer.write_code(
+                (code << extra_bits) | (repeats ^ (1 << extra_bits)),
+                code_length + extra_bits,
+            )
+
+
+class RunLengthCompressor:
+    """Two-pass Huffman compressor over literal bytes and run-length tokens.
+
+    A run of ``MIN_RUN`` or more equal bytes costs one literal and one run
+    symbol however long it is, so zero-filled and sparse inputs go far below
+    Huffman's floor of one bit per byte. Long runs cost no per-byte work on
+    either side: the encoder finds them with ``flatnonzero`` (or regular
+    expressions without NumPy), and the decoder expands them by repeating a
+    ``bytes`` object. Codes are canonical and capped at ``max_code_length``
+    bits; see ``run_length`` for the layout. ``HuffmanDecompressor``
+    recognises the stream by its magic, and the length is a varint, so there
+    is no input size limit.
+
+    ``use_numpy`` and ``metrics`` work as for ``HuffmanCompressor``.
+    """
+
+    def __init__(
+        self,
+        max_code_length: int = DEFAULT_MAX_CODE_LENGTH,
+        use_numpy: Optional[bool] = None,
+        metrics: Optional[MetricsCallback] = None,
+    ) -> None:
+        if not 1 <= max_code_length <= MAX_VECTOR_CODE_LENGTH:
+            raise ValueError(
+                f"max_code_length must be between 1 and {MAX_VECTOR_CODE_LENGTH}"
+            )
+        self._max_code_length = max_code_length
+        resolve_use_numpy(use_numpy)  # fail fast if NumPy is required but missing
+        self._use_numpy = use_numpy
+        self._metrics = metrics
+
+    def compress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        if not input_stream.seekable():
+            raise ValueError("RunLengthCompressor needs a seekable input")
+        length = input_stream.seek(0, 2)
+
+        def chunks() -> Iterable[ByteBuffer]:
+            input_stream.seek(0)
+            return iter_chunks(input_stream, BUFFER_SLICE_SIZE)
+
+        self._write(chunks, length, output_stream)
+
+    def compress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        view = memoryview(data)
+        self._write(
+            lambda: iter_slices(view, BUFFER_SLICE_SIZE), len(view), output_stream
+        )
+
+    def _write(
+        self,
+        chunks: Callable[[], Iterable[ByteBuffer]],
+        length: int,
+        output_stream: BinaryIO,
+    ) -> None:
+        """Count symbols over ``chunks()``, then encode a second ``chunks()``."""
+        recorder = stage_recorder(self._metrics)
+        use_numpy = resolve_use_numpy(self._use_numpy, length)
+        if use_numpy:
+            frequency_map = count_run_length_symbols(chunks())
+        else:
+            frequency_map = count_run_symbols(iter_run_tokens(chunks()))
+        symbol_count = sum(frequency_map.values())
+        recorder.lap("count_frequencies", length, len(frequency_map))
+        code_lengths = compute_code_lengths(frequency_map, self._max_code_length)
+        recorder.lap("code_lengths", symbol_count=len(code_lengths))
+
+        output_stream.write(RUN_LENGTH_MAGIC + encode_varint(length))
+        bit_writer = BitWriter(output_stream)
+        serialize_code_lengths(code_lengths, bit_writer, RUN_SYMBOL_BITS)
+        recorder.lap("write_header", bit_count=bit_writer.bit_position)
+        codes = assign_canonical_codes(code_lengths)
+        codes_by_symbol = [
+            codes.get(symbol, (0, 0)) for symbol in range(RUN_SYMBOL_COUNT)
+        ]
+        recorder.lap("assign_codes", symbol_count=len(codes))
+
+        start = bit_writer.bit_position
+        if use_numpy:
+            encode_run_length_chunks(chunks(), codes_by_symbol, bit_writer)
+        else:
+            _encode_python(iter_run_tokens(chunks()), codes_by_symbol, bit_writer)
+        encoded = bit_writer.bit_position
+        recorder.lap("encode", length, symbol_count, encoded - start)
+        bit_writer.flush()
+        recorder.lap("flush", bit_count=bit_writer.bit_position - encoded)
@@ -0,0 +1,143 @@
+"""Optional per-stage timing for the compressor and decompressor.
+
+A metrics callback receives one ``StageMetrics`` per stage as it finishes.
+Compression reports ``count_frequencies``, ``build_tree`` or ``code_lengths``,
+``write_header``, ``generate_codes`` or ``assign_codes``, ``encode`` and
+``flush``, or ``count_frequencies`` and ``store`` when incompressible input is
+written as stored blocks. Decompression reports ``read_header`` and ``decode`` for the
+single-table format, and ``decode_blocks`` for block containers.
+
+``byte_count`` is the input bytes a compression stage read, or the bytes a
+decode stage produced. ``symbol_count`` is the number of symbols the stage
+handled, and ``bit_count`` the bits it wrote. With no callback the stages are
+not timed at all.
+"""
+
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+
+class StageMetrics(NamedTuple):
+    stage: str
+    seconds: float
+    byte_count: int = 0
+    symbol_count: int = 0
+    bit_count: int = 0
+
+
+MetricsCallback = Callable[[StageMetrics], None]
+
+
+class StageRecorder:
+    """Times consecutive stages and reports each one to a metrics callback."""
+
+    def __init__(self, callback: MetricsCallback) -> None:
+        self._callback = callback
+        self._start = perf_counter()
+
+    def lap(
+        self, stage: str, byte_count: int = 0, symbol_count: int = 0, bit_count: int = 0
+    ) -> None:
+        """Report the time since the previous lap as ``stage``."""
+        now = perf_counter()
+        self._callback(
+            StageMetrics(stage, now - self._start, byte_count, symbol_count, bit_count)
+        )
+        self._start = now
+
+    def timed_chunks(self, stage: str, chunks: Iterable[bytes]) -> Iterable[bytes]:
+        """Pass ``chunks`` through, timing only the work that produces them.
+
+        Time the consumer spends between chunks is excluded. ``stage`` is
+        reported once the chunks are exhausted.
+        """
+        return self._timed_chunks(stage, iter(chunks))
+
+    def _timed_chunks(self, stage: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        seconds = 0.0
+        total = 0
+        while True:
+            start = perf_counter()
+            chunk = next(chunks, None)
+            seconds += perf_counter() - start
+            if chunk is None:
+                break
+            total += len(chunk)
+            yield chunk
+        self._callback(StageMetrics(stage, seconds, total, total, total << 3))
+        self._start = perf_counter()
+
+
+class _NullRecorder(StageRecorder):
+    """Recorder used when metrics are disabled: reads no clock, reports nothing."""
+
+    def __init__(self) -> None:  # pylint: disable=super-init-not-called
+        pass
+
+    def lap(
+        self, stage: str, byte_count: int = 0, symbol_count: int = 0, bit_count: int = 0
+    ) -> None:
+        pass
+
+    def timed_chunks(self, stage: str, chunks: Iterable[bytes]) -> Iterable[bytes]:
+        return chunks
+
+
+NULL_RECORDER: StageRecorder = _NullRecorder()
+
+
+def stage_recorder(callback: Optional[MetricsCallback]) -> StageRecorder:
+    """Start timing for ``callback``; no-op recorder when it is ``None``."""
+    return NULL_RECORDER if callback is None else StageRecorder(callback)
+
+
+class MetricsCollector:
+    """Metrics callback that keeps every reported stage.
+
+    Pass an instance as ``metrics=`` and read ``stages`` or ``format_report()``
+    afterwards.
+    """
+
+    def __init__(self) -> None:
+        self.stages: List[StageMetrics] = []
+
+    def __call__(self, metrics: StageMetrics) -> None:
+        self.stages.append(metrics)
+
+    def totals(self) -> List[StageMetrics]:
+        """Stages summed by name, in the order each name was first reported."""
+        totals: Dict[str, StageMetrics] = {}
+        for metrics in self.stages:
+            previous = totals.get(metrics.stage)
+            if previous is None:
+                totals[metrics.stage] = metrics
+            else:
+                totals[metrics.stage] = StageMetrics(
+                    metrics.stage,
+                    previous.seconds + metrics.seconds,
+                    previous.byte_count + metrics.byte_count,
+                    previous.symbol_count + metrics.symbol_count,
+                    previous.bit_count + metrics.bit_count,
+                )
+        return list(totals.values())
+
+    def format_report(self) -> str:
+        """Render the stage totals as a table, one stage per line."""
+        lines = [
+            f"{'stage':<18} {'ms':>10} {'MB/s':>9} {'bytes':>12} "
+            f"{'symbols':>12} {'bits':>14}"
+        ]
+        for metrics in self.totals():
+            throughput = (
+                f"{metrics.byte_count / metrics.seconds / 1e6:>9.1f}"
+                if metrics.byte_count and metrics.seconds > 0
+                else f"{'-':>9}"
+            )
+            lines.append(
+                f"{metrics.stage:<18} {metrics.seconds * 1e3:>10.2f} {throughput} "
+                f"{metrics.byte_count:>12} {metrics.symbol_count:>12} "
+                f"{metrics.bit_count:>14}"
+            )
+        total = sum(metrics.seconds for metrics in self.stages)
+        lines.append(f"{'total':<18} {total * 1e3:>10.2f}")
+        return "\n".join(lines)
@@ -0,0 +1,62 @@
+"""Pre-trained code tables shared by every message compressed against them.
+
+Table file layout::
+
+    TABLE_MAGIC  table_id:varint  code-length header (padded to a byte)
+
+Messages compressed against a table (``DictionaryCompressor``) are framed as::
+
+    table_id:varint  uncompressed_length:varint  data bits (padded to a byte)
+"""
+
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Tuple
+
+from .bit_writer import BitWriter
+from .block_format import DEFAULT_MAX_CODE_LENGTH, encode_varint
+from .canonical_codes import assign_canonical_codes, compute_code_lengths
+from .code_length_serializer import serialize_code_lengths
+from .frequency_counter import count_chunk_frequencies
+from .frequency_sampler import add_escape_counts
+from .stream_utils import ByteBuffer
+
+TABLE_MAGIC = b"\x89HT\x01"
+ALPHABET_SIZE = 256
+
+
+class StaticCodeTable(NamedTuple):
+    table_id: int
+    code_lengths: Dict[int, int]
+
+
+def train_static_table(
+    corpus: Iterable[ByteBuffer],
+    table_id: int,
+    max_code_length: int = DEFAULT_MAX_CODE_LENGTH,
+) -> StaticCodeTable:
+    """Build a code table from the byte frequencies of a sample corpus.
+
+    Bytes absent from the corpus get escape counts, so every byte value has a
+    code and any message can be compressed against the table.
+    """
+    if table_id < 0:
+        raise ValueError("table_id must be non-negative")
+    frequency_map = add_escape_counts(count_chunk_frequencies(corpus))
+    return StaticCodeTable(table_id, compute_code_lengths(frequency_map, max_code_length))
+
+
+def static_codes_by_byte(table: StaticCodeTable) -> List[Tuple[int, int]]:
+    """Return the canonical ``(code, length)`` of every byte value, by value."""
+    if len(table.code_lengths) != ALPHABET_SIZE:
+        raise ValueError(
+            f"Static code table {table.table_id} must cover all "
+            f"{ALPHABET_SIZE} byte values"
+        )
+    codes = assign_canonical_codes(table.code_lengths)
+    return [codes[byte_value] for byte_value in range(ALPHABET_SIZE)]
+
+
+def write_static_table(table: StaticCodeTable, output_stream: BinaryIO) -> None:
+    output_stream.write(TABLE_MAGIC + encode_varint(table.table_id))
+    bit_writer = BitWriter(output_stream)
+    serialize_code_lengths(table.code_lengths, bit_writer)
+    bit_writer.flush()
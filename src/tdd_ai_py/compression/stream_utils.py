@@ -1,13 +1,127 @@
-from typing import BinaryIO, Iterator
+import asyncio
+import mmap
+import sys
+import traceback
+from array import array
+from contextlib import contextmanager
+from io import UnsupportedOperation
+from typing import BinaryIO, Iterable, Iterator, Optional, Protocol, Union
 
+ByteBuffer = Union[bytes, bytearray, memoryview]
 
-def iter_bytes(input_stream: BinaryIO, buffer_size: int = 8192) -> Iterator[int]:
-    """Iterate over bytes from a binary stream using buffered reads.
 
-    Yields each byte value as an integer.
-    """
+class AsyncByteWriter(Protocol):
+    """The part of ``asyncio.StreamWriter`` the async codecs write through."""
+
+    def write(self, data: ByteBuffer) -> None:
+        ...
+
+    async def drain(self) -> None:
+        ...
+
+
+class ByteCounter:
+    """Iterate over ``chunks``, counting the bytes that pass through."""
+
+    def __init__(self, chunks: Iterable[ByteBuffer]) -> None:
+        self._chunks = chunks
+        self.byte_count = 0
+
+    def __iter__(self) -> Iterator[ByteBuffer]:
+        for chunk in self._chunks:
+            self.byte_count += len(chunk)
+            yield chunk
+
+
+def iter_chunks(input_stream: BinaryIO, buffer_size: int = 8192) -> Iterator[bytes]:
+    """Iterate over a binary stream in buffered chunks until it is exhausted."""
     while True:
         buffer = input_stream.read(buffer_size)
         if not buffer:
             break
+        yield buffer
+
+
+async def read_up_to(reader: asyncio.StreamReader, size: int) -> bytes:
+    """Read ``size`` bytes, or fewer only if the reader reaches EOF first."""
+    try:
+        return await reader.readexactly(size)
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+
+
+def iter_bytes(input_stream: BinaryIO, buffer_size: int = 8192) -> Iterator[int]:
+    """Iterate over bytes from a binary stream using buffered reads.
+
+    Yields each byte value as an integer.
+    """
+    for buffer in iter_chunks(input_stream, buffer_size):
         yield from buffer
+
+
+def iter_slices(buffer: memoryview, size: int) -> Iterator[memoryview]:
+    """Iterate over consecutive ``size``-byte views of a buffer without copying."""
+    for start in range(0, len(buffer), size):
+        yield buffer[start : start + size]
+
+
+def iter_even_chunks(chunks: Iterable[ByteBuffer]) -> Iterator[ByteBuffer]:
+    """Re-slice ``chunks`` to even lengths, zero-padding an odd final byte."""
+    carry = b""
+    for chunk in chunks:
+        if carry:
+            chunk = carry + bytes(chunk)
+        even = len(chunk) & ~1
+        carry = bytes(chunk[even:])
+        if even:
+            yield chunk[:even]
+    if carry:
+        yield carry + b"\x00"
+
+
+def wide_symbols(data: ByteBuffer) -> "array[int]":
+    """Read an even-length buffer as big-endian 16-bit symbols."""
+    symbols = array("H")
+    symbols.frombytes(data)
+    if sys.byteorder == "little":
+        symbols.byteswap()
+    return symbols
+
+
+def wide_symbol_bytes(symbols: "array[int]") -> bytes:
+    """Inverse of ``wide_symbols``; byte-swaps ``symbols`` in place."""
+    if sys.byteorder == "little":
+        symbols.byteswap()
+    return symbols.tobytes()
+
+
+def map_file(input_file: BinaryIO) -> Optional[mmap.mmap]:
+    """Memory-map a regular file read-only, or return None if it cannot be mapped.
+
+    Pipes, terminals, in-memory streams and empty files are not mappable and
+    should be read through the stream interface instead.
+    """
+    try:
+        return mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, UnsupportedOperation):
+        return None
+
+
+@contextmanager
+def mapped_view(mapped: mmap.mmap) -> Iterator[memoryview]:
+    """Yield a memoryview of ``mapped``, then release it and close the map.
+
+    An error raised while the view is in use keeps the failed frames alive
+    through its traceback, and with them any slices of the view they hold,
+    so the map could not be closed. Those frames are cleared before closing
+    and the original error propagates.
+    """
+    view = memoryview(mapped)
+    try:
+        yield view
+    except BaseException as error:
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        view.release()
+        mapped.close()
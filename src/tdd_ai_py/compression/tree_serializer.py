@@ -1,6 +1,9 @@
 from typing import List
 
-from .huffman_tree_builder import HuffmanNode
+from .huffman_tree_builder import FlatTree, HuffmanNode
+
+# Leaf marker followed by the character's 8 bits, for every byte value
+_LEAF_BITS = [[1] + [int(bit) for bit in format(value, "08b")] for value in range(256)]
 
 
 def serialize_tree(root: HuffmanNode) -> List[int]:
@@ -13,8 +16,7 @@ def serialize_tree(root: HuffmanNode) -> List[int]:
 
         if node.character is not None:
             # Leaf node: 1 + 8-bit character
-            result.append(1)
-            result.extend(int(bit) for bit in format(node.character, "08b"))
+            result.extend(_LEAF_BITS[node.character])
         else:
             # Internal node: 0 + children (added in reverse order for correct traversal)
             result.append(0)
@@ -24,3 +26,21 @@ def serialize_tree(root: HuffmanNode) -> List[int]:
                 stack.append(node.left)
 
     return result
+
+
+def serialize_flat_tree(tree: FlatTree) -> List[int]:
+    """Serialize a ``FlatTree`` to the same preorder bits as ``serialize_tree``."""
+    symbol, left, right = tree.symbol, tree.left, tree.right
+    result: List[int] = []
+    stack = [tree.root]
+
+    while stack:
+        index = stack.pop()
+        if left[index] < 0:
+            result.extend(_LEAF_BITS[symbol[index]])
+        else:
+            result.append(0)
+            stack.append(right[index])
+            stack.append(left[index])
+
+    return result
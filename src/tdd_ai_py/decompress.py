@@ -4,7 +4,7 @@
 Huffman Decompression Script
 
 Usage:
-    python -m tdd_ai_py.decompress <compressed_file | ->
+    python -m tdd_ai_py.decompress [--jobs N] [--stats] <compressed_file | ->
 
 Examples:
     # From file to stdout
@@ -12,49 +12,92 @@ Examples:
 
     # From stdin to stdout
     cat compressed.bin | python -m tdd_ai_py.decompress - > decompressed.txt
+
+    # Decode the blocks of a block container on 8 processes
+    python -m tdd_ai_py.decompress --jobs 8 compressed.bin > decompressed.bin
+
+    # Print the time spent in each stage to stderr
+    python -m tdd_ai_py.decompress --stats compressed.bin > decompressed.txt
 """
 
+import argparse
 import sys
-from io import BytesIO
-from typing import BinaryIO, Optional
+from typing import BinaryIO, List, Optional
 
+from .compress import positive_int
+from .compression.stage_metrics import MetricsCallback, MetricsCollector
+from .compression.stream_utils import map_file, mapped_view
 from .decompression.decompressor import HuffmanDecompressor
 
 
-def validate_args() -> Optional[str]:
-    """Validate args and return input filename or '-' for stdin, or None."""
-    return sys.argv[1] if len(sys.argv) == 2 else None
-
-
-def decompress_stream(input_stream: BinaryIO, output_stream: BinaryIO) -> None:
-    """Decompress a binary stream using Huffman decompression."""
-    # Decompressor expects a seekable stream; wrap if necessary
-    if not input_stream.seekable():
-        input_stream = BytesIO(input_stream.read())
-    HuffmanDecompressor().decompress(input_stream, output_stream)
-
-
-def decompress_file(input_filename: str, output_stream: BinaryIO) -> None:
-    """Decompress a file using Huffman decompression."""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse args: a compressed filename or '-' for stdin, plus options."""
+    parser = argparse.ArgumentParser(
+        prog="huffman-decompress", description="Decompress a file or stdin to stdout."
+    )
+    parser.add_argument("input_filename", help="file to decompress, or '-' for stdin")
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        help="decode the blocks of a block container on N processes",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print the time, bytes, symbols and bits of each stage to stderr",
+    )
+    return parser.parse_args(argv)
+
+
+def decompress_stream(
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    jobs: int = 1,
+    metrics: Optional[MetricsCallback] = None,
+) -> None:
+    """Decompress a binary stream using Huffman decompression.
+
+    The input is read incrementally, so non-seekable streams (e.g., stdin) are
+    decoded as they arrive and output is written in fixed-size chunks.
+    """
+    HuffmanDecompressor(jobs=jobs, metrics=metrics).decompress(
+        input_stream, output_stream
+    )
+
+
+def decompress_file(
+    input_filename: str,
+    output_stream: BinaryIO,
+    jobs: int = 1,
+    metrics: Optional[MetricsCallback] = None,
+) -> None:
+    """Decompress a file using Huffman decompression.
+
+    Regular files are memory-mapped and decoded from zero-copy memoryview slices.
+    """
     with open(input_filename, "rb") as input_file:
-        decompress_stream(input_file, output_stream)
+        mapped = map_file(input_file)
+        if mapped is None:
+            decompress_stream(input_file, output_stream, jobs, metrics)
+            return
+        with mapped_view(mapped) as view:
+            HuffmanDecompressor(jobs=jobs, metrics=metrics).decompress_buffer(
+                view, output_stream
+            )
 
 
 def main() -> None:
     """Main function to decompress a file or stdin and output to stdout."""
-    input_filename = validate_args()
-
-    if not input_filename:
-        print(
-            "Usage: python -m tdd_ai_py.decompress <compressed_file | ->", file=sys.stderr
-        )
-        sys.exit(1)
+    args = parse_args()
+    input_filename = args.input_filename
+    collector = MetricsCollector() if args.stats else None
 
     try:
         if input_filename == "-":
-            decompress_stream(sys.stdin.buffer, sys.stdout.buffer)
+            decompress_stream(sys.stdin.buffer, sys.stdout.buffer, args.jobs, collector)
         else:
-            decompress_file(input_filename, sys.stdout.buffer)
+            decompress_file(input_filename, sys.stdout.buffer, args.jobs, collector)
     except FileNotFoundError:
         print(f"Error: File '{input_filename}' not found.", file=sys.stderr)
         sys.exit(1)
@@ -64,6 +107,8 @@ def main() -> None:
     except (OSError, IOError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    if collector is not None:
+        print(collector.format_report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
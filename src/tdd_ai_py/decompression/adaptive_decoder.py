@@ -0,0 +1,31 @@
+from typing import Iterator
+
+from ..compression.adaptive_huffman import END_OF_STREAM, AdaptiveHuffmanTree
+from .bit_reader import BitReader
+from .data_decoder import DEFAULT_CHUNK_SIZE
+
+
+def iter_decode_adaptive(
+    bit_reader: BitReader, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Decode an ``AdaptiveCompressor`` bit stream up to its end-of-stream escape.
+
+    Output is produced in chunks of at most ``chunk_size`` bytes.
+    """
+    decode = AdaptiveHuffmanTree().decode
+    read_bit = bit_reader.read_bit
+    read_bits = bit_reader.read_bits
+    output = bytearray()
+    try:
+        while True:
+            symbol = decode(read_bit, read_bits)
+            if symbol == END_OF_STREAM:
+                break
+            output.append(symbol)
+            if len(output) == chunk_size:
+                yield bytes(output)
+                output.clear()
+    except EOFError as error:
+        raise ValueError("Truncated adaptive Huffman stream") from error
+    if output:
+        yield bytes(output)
@@ -0,0 +1,96 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from io import BytesIO
+from typing import Deque, Optional
+
+from ..compression.block_format import BLOCK_END, BLOCK_MAGIC, EncodedBlock
+from ..compression.stream_utils import AsyncByteWriter, read_up_to
+from .block_decoder import decode_encoded_block
+from .decompressor import LENGTH_HEADER_SIZE, HuffmanDecompressor
+
+DEFAULT_MAX_IN_FLIGHT = 2
+
+
+async def read_varint_async(reader: asyncio.StreamReader) -> int:
+    value = 0
+    shift = 0
+    while True:
+        byte = await read_up_to(reader, 1)
+        if not byte:
+            raise ValueError("Truncated varint")
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+async def read_block_async(reader: asyncio.StreamReader) -> Optional[EncodedBlock]:
+    """Read one framed block, or None at the end marker."""
+    block_type = await read_up_to(reader, 1)
+    if not block_type:
+        raise ValueError("Block container ended without an end marker")
+    if block_type[0] == BLOCK_END:
+        return None
+    uncompressed_length = await read_varint_async(reader)
+    payload_length = await read_varint_async(reader)
+    payload = await read_up_to(reader, payload_length)
+    if len(payload) != payload_length:
+        raise ValueError("Truncated block payload")
+    return EncodedBlock(block_type[0], uncompressed_length, payload)
+
+
+def _decompress_single_table(data: bytes, canonical: bool) -> bytes:
+    output_stream = BytesIO()
+    HuffmanDecompressor(canonical).decompress_buffer(data, output_stream)
+    return output_stream.getvalue()
+
+
+async def decompress_async(
+    reader: asyncio.StreamReader,
+    writer: AsyncByteWriter,
+    canonical: bool = False,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    use_numpy: Optional[bool] = None,
+) -> None:
+    """Decompress ``reader`` onto ``writer``.
+
+    Block containers are read frame by frame and their blocks decoded in
+    ``executor``, at most ``max_in_flight`` at a time, with the writer drained
+    after every block, so memory stays bounded by ``max_in_flight`` blocks.
+
+    Only block containers stream. Every other format (single-table, adaptive,
+    context, wide and run-length) cannot be split, so it is read whole into
+    memory and decoded in one executor call; ``canonical`` applies to the
+    single-table format only.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be positive")
+    loop = asyncio.get_running_loop()
+    prefix = await read_up_to(reader, LENGTH_HEADER_SIZE)
+    if prefix != BLOCK_MAGIC:
+        data = prefix + await reader.read()
+        writer.write(
+            await loop.run_in_executor(
+                executor, _decompress_single_table, data, canonical
+            )
+        )
+        await writer.drain()
+        return
+
+    decode = partial(decode_encoded_block, use_numpy=use_numpy)
+    pending: Deque["asyncio.Future[bytes]"] = deque()
+    try:
+        while (block := await read_block_async(reader)) is not None:
+            pending.append(loop.run_in_executor(executor, decode, block))
+            if len(pending) >= max_in_flight:
+                writer.write(await pending.popleft())
+                await writer.drain()
+        while pending:
+            writer.write(await pending.popleft())
+            await writer.drain()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,46 @@
+from io import BytesIO
+from typing import Iterable, List, Union
+
+from ..compression.batch_compressor import PackedBatch
+from ..compression.static_table import StaticCodeTable
+from ..compression.stream_utils import ByteBuffer
+from .decompressor import HuffmanDecompressor
+from .dictionary_decompressor import DictionaryDecompressor
+
+
+def decompress_many(
+    frames: Iterable[ByteBuffer],
+    canonical: bool = False,
+    tables: Iterable[StaticCodeTable] = (),
+) -> List[bytes]:
+    """Decompress frames written by ``compress_many``.
+
+    Frames compressed against code tables need those ``tables``; decode tables
+    are then built once for the whole batch.
+    """
+    tables = list(tables)
+    decompressor: Union[HuffmanDecompressor, DictionaryDecompressor] = (
+        DictionaryDecompressor(tables) if tables else HuffmanDecompressor(canonical)
+    )
+    output_stream = BytesIO()
+    messages = []
+    for frame in frames:
+        decompressor.decompress_buffer(frame, output_stream)
+        messages.append(output_stream.getvalue())
+        output_stream.seek(0)
+        output_stream.truncate()
+    return messages
+
+
+def decompress_batch(
+    batch: PackedBatch,
+    canonical: bool = False,
+    tables: Iterable[StaticCodeTable] = (),
+) -> List[bytes]:
+    """Decompress every frame of a ``PackedBatch``, using its shared table if any."""
+    tables = list(tables)
+    if batch.table is not None:
+        tables.append(batch.table)
+    view = memoryview(batch.buffer)
+    frames = (view[start:end] for start, end in zip(batch.offsets, batch.offsets[1:]))
+    return decompress_many(frames, canonical, tables)
@@ -1,4 +1,22 @@
-from typing import BinaryIO, Iterator
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from ..compression.stream_utils import ByteBuffer
+
+REFILL_BYTES = 7
+
+
+def _buffer_reader(data: ByteBuffer) -> Callable[[int], bytes]:
+    """Return a ``read(size)`` function that copies successive slices of ``data``."""
+    view = memoryview(data)
+    position = 0
+
+    def read(size: int) -> bytes:
+        nonlocal position
+        chunk = view[position : position + size].tobytes()
+        position += len(chunk)
+        return chunk
+
+    return read
 
 
 def bits_from_stream(input_stream: BinaryIO, buffer_size: int = 8192) -> Iterator[int]:
@@ -13,11 +31,83 @@ def bits_from_stream(input_stream: BinaryIO, buffer_size: int = 8192) -> Iterato
 
 
 class BitReader:
-    def __init__(self, input_stream: BinaryIO):
-        self._bits = bits_from_stream(input_stream)
+    """MSB-first bit reader backed by an integer accumulator.
+
+    Whole bytes are shifted into the accumulator several at a time, so callers
+    can peek at and consume multi-bit codewords without a per-bit generator step.
+
+    Bytes come from ``input_stream``, or from ``read(size)`` when given.
+    """
+
+    def __init__(
+        self,
+        input_stream: Optional[BinaryIO] = None,
+        buffer_size: int = 8192,
+        read: Optional[Callable[[int], bytes]] = None,
+    ):
+        if read is None:
+            if input_stream is None:
+                raise TypeError("BitReader needs an input_stream or a read function")
+            read = input_stream.read
+        self._read = read
+        self._buffer_size = buffer_size
+        self._buffer = b""
+        self._position = 0
+        self._accumulator = 0
+        self._bit_count = 0
+
+    @classmethod
+    def from_buffer(cls, data: ByteBuffer) -> "BitReader":
+        """Read bits out of an in-memory or memory-mapped buffer.
+
+        Only ``buffer_size`` bytes are copied out of ``data`` at a time, so a
+        memoryview over a mapped file is never copied as a whole.
+        """
+        return cls(read=_buffer_reader(data))
+
+    def _refill(self) -> bool:
+        """Shift up to REFILL_BYTES more bytes into the accumulator."""
+        if self._position >= len(self._buffer):
+            self._buffer = self._read(self._buffer_size)
+            self._position = 0
+            if not self._buffer:
+                return False
+        chunk = self._buffer[self._position : self._position + REFILL_BYTES]
+        self._position += len(chunk)
+        self._accumulator = (self._accumulator << (len(chunk) << 3)) | int.from_bytes(
+            chunk, "big"
+        )
+        self._bit_count += len(chunk) << 3
+        return True
 
     def read_bit(self) -> int:
-        try:
-            return next(self._bits)
-        except StopIteration as exc:
-            raise EOFError("No more data available") from exc
+        if self._bit_count == 0 and not self._refill():
+            raise EOFError("No more data available")
+        self._bit_count -= 1
+        bit = self._accumulator >> self._bit_count
+        self._accumulator &= (1 << self._bit_count) - 1
+        return bit
+
+    def peek_bits(self, count: int) -> int:
+        """Return the next ``count`` bits without consuming them.
+
+        Bits past the end of the stream read as zero; ``skip_bits`` is what
+        reports truncation.
+        """
+        while self._bit_count < count:
+            if not self._refill():
+                return self._accumulator << (count - self._bit_count)
+        return self._accumulator >> (self._bit_count - count)
+
+    def skip_bits(self, count: int) -> None:
+        """Consume ``count`` bits previously inspected with ``peek_bits``."""
+        while self._bit_count < count:
+            if not self._refill():
+                raise EOFError("No more data available")
+        self._bit_count -= count
+        self._accumulator &= (1 << self._bit_count) - 1
+
+    def read_bits(self, count: int) -> int:
+        value = self.peek_bits(count)
+        self.skip_bits(count)
+        return value
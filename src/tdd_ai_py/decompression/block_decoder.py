@@ -0,0 +1,126 @@
+from typing import Optional
+
+from ..compression.block_format import (
+    BLOCK_HUFFMAN,
+    BLOCK_HUFFMAN_SYNC,
+    BLOCK_STORED,
+    EncodedBlock,
+    decode_sync_points,
+)
+from ..compression.canonical_codes import assign_canonical_codes
+from ..compression.numpy_engine import resolve_use_numpy
+from ..compression.stream_utils import ByteBuffer
+from .bit_reader import BitReader
+from .code_length_deserializer import deserialize_code_lengths
+from .decode_table import build_decode_table, decode_symbols
+from .numpy_decoder import MAX_VECTOR_TABLE_BITS, decode_sync_lanes
+
+
+def decode_block(
+    block_type: int,
+    uncompressed_length: int,
+    payload: ByteBuffer,
+    use_numpy: Optional[bool] = None,
+) -> bytes:
+    """Decode one block payload produced by ``encode_block``.
+
+    ``BLOCK_HUFFMAN_SYNC`` blocks are decoded in lanes by the NumPy engine when
+    it is available; otherwise their sync points are skipped. ``BLOCK_STORED``
+    payloads are copied as they are.
+    """
+    if block_type == BLOCK_STORED:
+        if len(payload) != uncompressed_length:
+            raise ValueError("Stored block length does not match its payload")
+        return bytes(payload)
+    if block_type == BLOCK_HUFFMAN_SYNC:
+        sync_interval, sync_offsets, position = decode_sync_points(payload)
+        payload = payload[position:]
+    elif block_type != BLOCK_HUFFMAN:
+        raise ValueError(f"Unknown block type {block_type}")
+
+    bit_reader = BitReader.from_buffer(payload)
+    code_lengths = deserialize_code_lengths(bit_reader)
+    if (
+        block_type == BLOCK_HUFFMAN_SYNC
+        and resolve_use_numpy(use_numpy, uncompressed_length)
+        and code_lengths
+        and max(code_lengths.values()) <= MAX_VECTOR_TABLE_BITS
+    ):
+        return decode_sync_lanes(
+            code_lengths, payload, sync_interval, sync_offsets, uncompressed_length
+        )
+
+    table = build_decode_table(assign_canonical_codes(code_lengths))
+    data = decode_symbols(table, bit_reader, uncompressed_length)
+    if len(data) != uncompressed_length:
+        raise ValueError("Truncated block payload")
+    return bytes(data)
+
+
+def decode_block_range(
+    block: EncodedBlock, start: int, end: int, use_numpy: Optional[bool] = None
+) -> bytes:
+    """Decode bytes ``start`` to ``end`` of one block.
+
+    A ``BLOCK_HUFFMAN_SYNC`` block is decoded from the last sync point at or
+    before ``start`` to the first one at or after ``end``, so at most one sync
+    interval is decoded and dropped on either side. ``BLOCK_HUFFMAN`` blocks
+    are decoded from their first symbol up to ``end``.
+    """
+    block_type, uncompressed_length, payload = block
+    if block_type == BLOCK_STORED or (start == 0 and end == uncompressed_length):
+        return decode_block(block_type, uncompressed_length, payload, use_numpy)[
+            start:end
+        ]
+    if block_type == BLOCK_HUFFMAN_SYNC:
+        sync_interval, sync_offsets, position = decode_sync_points(payload)
+        payload = payload[position:]
+    elif block_type != BLOCK_HUFFMAN:
+        raise ValueError(f"Unknown block type {block_type}")
+
+    bit_reader = BitReader.from_buffer(payload)
+    code_lengths = deserialize_code_lengths(bit_reader)
+    if block_type == BLOCK_HUFFMAN:
+        first_symbol = 0
+        count = end
+    else:
+        first_lane = start // sync_interval
+        last_lane = -(-end // sync_interval)
+        first_symbol = first_lane * sync_interval
+        count = min(last_lane * sync_interval, uncompressed_length) - first_symbol
+        if len(sync_offsets) != -(-uncompressed_length // sync_interval):
+            raise ValueError("Sync points do not match block length")
+        # Only the bytes the lanes cover are kept, from the byte holding the
+        # first lane's start to where the next lane starts; cutting there
+        # makes the last lane end in the final byte, as ``decode_sync_lanes``
+        # checks
+        base = sync_offsets[first_lane] >> 3 << 3
+        if base > len(payload) << 3:
+            raise ValueError("Sync points lie outside the block payload")
+        if last_lane < len(sync_offsets):
+            payload = payload[: -(-sync_offsets[last_lane] // 8)]
+        payload = payload[base >> 3 :]
+        offsets = [offset - base for offset in sync_offsets[first_lane:last_lane]]
+        if (
+            resolve_use_numpy(use_numpy, count)
+            and code_lengths
+            and max(code_lengths.values()) <= MAX_VECTOR_TABLE_BITS
+        ):
+            lanes = decode_sync_lanes(
+                code_lengths, payload, sync_interval, offsets, count
+            )
+            return lanes[start - first_symbol : end - first_symbol]
+        bit_reader = BitReader.from_buffer(payload)
+        bit_reader.skip_bits(offsets[0])
+
+    table = build_decode_table(assign_canonical_codes(code_lengths))
+    data = decode_symbols(table, bit_reader, count)
+    if len(data) != count:
+        raise ValueError("Truncated block payload")
+    return bytes(data[start - first_symbol : end - first_symbol])
+
+
+def decode_encoded_block(block: EncodedBlock, use_numpy: Optional[bool] = None) -> bytes:
+    return decode_block(
+        block.block_type, block.uncompressed_length, block.payload, use_numpy
+    )
@@ -0,0 +1,186 @@
+from bisect import bisect_left, bisect_right
+from functools import partial
+from io import BytesIO
+from itertools import accumulate
+from typing import BinaryIO, Iterator, List, Optional
+
+from ..compression.block_format import (
+    BLOCK_END,
+    BLOCK_MAGIC,
+    BlockIndexEntry,
+    EncodedBlock,
+    parse_block,
+    read_block_index,
+    read_varint,
+)
+from ..compression.numpy_engine import resolve_use_numpy
+from ..compression.stream_utils import ByteBuffer
+from ..parallel import ordered_map
+from .block_decoder import decode_block_range, decode_encoded_block
+
+
+def read_block(input_stream: BinaryIO) -> Optional[EncodedBlock]:
+    """Read one framed block, or None at the end marker."""
+    block_type = input_stream.read(1)
+    if not block_type:
+        raise ValueError("Block container ended without an end marker")
+    if block_type[0] == BLOCK_END:
+        return None
+    uncompressed_length = read_varint(input_stream)
+    payload_length = read_varint(input_stream)
+    payload = input_stream.read(payload_length)
+    if len(payload) != payload_length:
+        raise ValueError("Truncated block payload")
+    return EncodedBlock(block_type[0], uncompressed_length, payload)
+
+
+def iter_blocks(input_stream: BinaryIO) -> Iterator[EncodedBlock]:
+    """Read framed blocks following the container magic up to the end marker."""
+    while (block := read_block(input_stream)) is not None:
+        yield block
+
+
+def iter_buffer_blocks(buffer: ByteBuffer, position: int) -> Iterator[EncodedBlock]:
+    """Parse framed blocks of an in-memory container starting at ``position``."""
+    while True:
+        block, position = parse_block(buffer, position)
+        if block is None:
+            return
+        yield block
+
+
+def iter_indexed_blocks(
+    input_stream: BinaryIO, container_start: int, index: List[BlockIndexEntry]
+) -> Iterator[EncodedBlock]:
+    """Read blocks at the positions recorded in the block index."""
+    for entry in index:
+        input_stream.seek(container_start + entry.offset)
+        frame = input_stream.read(entry.frame_length)
+        block = read_block(BytesIO(frame))
+        if block is None or block.uncompressed_length != entry.uncompressed_length:
+            raise ValueError("Block index does not match container contents")
+        yield block
+
+
+class BlockDecompressor:
+    """Decompressor for ``BlockCompressor`` containers.
+
+    With ``jobs > 1`` blocks are decoded on a process pool and written back in
+    order. Seekable inputs are read through the block index footer; other
+    inputs are parsed frame by frame.
+
+    Blocks with sync points are decoded by the NumPy engine when NumPy is
+    installed; ``use_numpy`` forces either engine.
+
+    ``decompress_range`` reads a byte range without decoding the container
+    from the start: the block index and the sync points serve as checkpoints.
+    """
+
+    def __init__(self, jobs: int = 1, use_numpy: Optional[bool] = None) -> None:
+        if jobs < 1:
+            raise ValueError("jobs must be positive")
+        self._jobs = jobs
+        resolve_use_numpy(use_numpy)  # fail fast if NumPy is required but missing
+        self._use_numpy = use_numpy
+        self._decode = partial(decode_encoded_block, use_numpy=use_numpy)
+
+    def decompress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        container_start = input_stream.tell() if input_stream.seekable() else None
+        if input_stream.read(len(BLOCK_MAGIC)) != BLOCK_MAGIC:
+            raise ValueError("Not a Huffman block container")
+        self.decompress_blocks(input_stream, output_stream, container_start)
+
+    def decompress_blocks(
+        self,
+        input_stream: BinaryIO,
+        output_stream: BinaryIO,
+        container_start: Optional[int] = None,
+    ) -> None:
+        """Decompress the blocks of a container whose magic was already consumed.
+
+        ``container_start`` is the stream position of the magic; it enables the
+        indexed read path for seekable inputs.
+        """
+        for data in self.iter_decompress_blocks(input_stream, container_start):
+            output_stream.write(data)
+
+    def iter_decompress_blocks(
+        self, input_stream: BinaryIO, container_start: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Yield the decoded contents of each block, in order."""
+        blocks = self._iter_blocks(input_stream, container_start)
+        yield from ordered_map(self._decode, blocks, self._jobs)
+
+    def decompress_range(self, input_stream: BinaryIO, start: int, length: int) -> bytes:
+        """Decode ``length`` bytes from uncompressed offset ``start``.
+
+        On seekable inputs with a block index only the blocks overlapping the
+        range are read; other inputs are parsed frame by frame, but blocks
+        before the range are not decoded. Within a block, decoding starts at
+        the nearest sync point; see ``decode_block_range``. A range reaching
+        past the end of the data is cut short.
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start and length must be non-negative")
+        container_start = input_stream.tell() if input_stream.seekable() else None
+        if input_stream.read(len(BLOCK_MAGIC)) != BLOCK_MAGIC:
+            raise ValueError("Not a Huffman block container")
+        end = start + length
+        block_start = 0
+        blocks: Iterator[EncodedBlock] = iter_blocks(input_stream)
+        if container_start is not None:
+            position = input_stream.tell()
+            index = read_block_index(input_stream, container_start)
+            input_stream.seek(position)
+            if index is not None:
+                ends = list(accumulate(entry.uncompressed_length for entry in index))
+                first = bisect_right(ends, start)
+                last = bisect_left(ends, end) + 1
+                block_start = ends[first - 1] if first else 0
+                blocks = iter_indexed_blocks(
+                    input_stream, container_start, index[first:last]
+                )
+
+        output = bytearray()
+        for block in blocks:
+            block_end = block_start + block.uncompressed_length
+            if block_start >= end:
+                break
+            if block_end > start and end > start:
+                output += decode_block_range(
+                    block,
+                    max(start - block_start, 0),
+                    min(end, block_end) - block_start,
+                    self._use_numpy,
+                )
+            block_start = block_end
+        return bytes(output)
+
+    def decompress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        for chunk in self.iter_decompress_buffer(data):
+            output_stream.write(chunk)
+
+    def iter_decompress_buffer(self, data: ByteBuffer) -> Iterator[bytes]:
+        """Yield decoded blocks of an in-memory or memory-mapped container.
+
+        Block payloads are zero-copy slices of ``data``; they are only copied to
+        ``bytes`` when they have to be pickled for worker processes.
+        """
+        view = memoryview(data)
+        if view[: len(BLOCK_MAGIC)] != BLOCK_MAGIC:
+            raise ValueError("Not a Huffman block container")
+        blocks = iter_buffer_blocks(view, len(BLOCK_MAGIC))
+        if self._jobs > 1:
+            blocks = (block._replace(payload=bytes(block.payload)) for block in blocks)
+        yield from ordered_map(self._decode, blocks, self._jobs)
+
+    def _iter_blocks(
+        self, input_stream: BinaryIO, container_start: Optional[int]
+    ) -> Iterator[EncodedBlock]:
+        if self._jobs > 1 and container_start is not None:
+            position = input_stream.tell()
+            index = read_block_index(input_stream, container_start)
+            if index is not None:
+                return iter_indexed_blocks(input_stream, container_start, index)
+            input_stream.seek(position)
+        return iter_blocks(input_stream)
@@ -0,0 +1,31 @@
+from typing import Dict
+
+from ..compression.code_length_serializer import BYTE_SYMBOL_BITS, LENGTH_WIDTH_BITS
+from .bit_reader import BitReader
+
+
+def read_elias_gamma(bit_reader: BitReader) -> int:
+    leading_zeros = 0
+    while bit_reader.read_bit() == 0:
+        leading_zeros += 1
+    return (1 << leading_zeros) | bit_reader.read_bits(leading_zeros)
+
+
+def deserialize_code_lengths(
+    bit_reader: BitReader, symbol_bits: int = BYTE_SYMBOL_BITS
+) -> Dict[int, int]:
+    """Read code lengths written by ``serialize_code_lengths``."""
+    alphabet_size = 1 << symbol_bits
+    symbol_count = bit_reader.read_bits(symbol_bits + 1)
+    if not symbol_count:
+        return {}
+
+    width = bit_reader.read_bits(LENGTH_WIDTH_BITS)
+    code_lengths: Dict[int, int] = {}
+    symbol = -1
+    for _ in range(symbol_count):
+        symbol += read_elias_gamma(bit_reader)
+        if symbol >= alphabet_size:
+            raise ValueError("Corrupt code length header")
+        code_lengths[symbol] = bit_reader.read_bits(width) + 1
+    return code_lengths
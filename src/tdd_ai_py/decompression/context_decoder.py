@@ -0,0 +1,78 @@
+from typing import Iterator, List
+
+from ..compression.canonical_codes import assign_canonical_codes
+from ..compression.code_length_serializer import SYMBOL_COUNT_BITS
+from ..compression.context_model import CONTEXT_COUNT, INITIAL_CONTEXT, ContextModel
+from .bit_reader import BitReader
+from .code_length_deserializer import deserialize_code_lengths, read_elias_gamma
+from .data_decoder import DEFAULT_CHUNK_SIZE
+from .decode_table import LENGTH_MASK, DecodeTable, build_decode_table, decode_long_code
+
+
+def deserialize_context_model(bit_reader: BitReader) -> ContextModel:
+    """Read the context map and tables written by ``serialize_context_model``."""
+    own_count = bit_reader.read_bits(SYMBOL_COUNT_BITS)
+    if own_count > CONTEXT_COUNT:
+        raise ValueError("Corrupt context model header")
+    table_of_context = [0] * CONTEXT_COUNT
+    context = -1
+    for table in range(1, own_count + 1):
+        context += read_elias_gamma(bit_reader)
+        if context >= CONTEXT_COUNT:
+            raise ValueError("Corrupt context model header")
+        table_of_context[context] = table
+    tables = [deserialize_code_lengths(bit_reader) for _ in range(own_count + 1)]
+    return ContextModel(table_of_context, tables)
+
+
+def _decode_context_symbols(
+    tables_by_context: List[DecodeTable],
+    bit_reader: BitReader,
+    count: int,
+    previous: int,
+) -> bytearray:
+    """Decode ``count`` symbols, switching to the preceding byte's table each time."""
+    output = bytearray()
+    entries_by_context = [table.entries for table in tables_by_context]
+    bits_by_context = [table.table_bits for table in tables_by_context]
+    peek_bits = bit_reader.peek_bits
+    skip_bits = bit_reader.skip_bits
+    append = output.append
+
+    for _ in range(count):
+        entry = entries_by_context[previous][peek_bits(bits_by_context[previous])]
+        length = entry & LENGTH_MASK
+        if length:
+            skip_bits(length)
+            previous = entry >> 8
+        else:
+            previous = decode_long_code(tables_by_context[previous], bit_reader)
+        append(previous)
+    return output
+
+
+def iter_decode_context_data(
+    model: ContextModel,
+    bit_reader: BitReader,
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Decode ``length`` order-1 coded symbols in chunks of at most ``chunk_size``."""
+    decode_tables = [
+        build_decode_table(assign_canonical_codes(code_lengths))
+        for code_lengths in model.tables
+    ]
+    tables_by_context = [decode_tables[table] for table in model.table_of_context]
+    previous = INITIAL_CONTEXT
+    for start in range(0, length, chunk_size):
+        try:
+            chunk = _decode_context_symbols(
+                tables_by_context,
+                bit_reader,
+                min(chunk_size, length - start),
+                previous,
+            )
+        except EOFError as error:
+            raise ValueError("Truncated context-modeled stream") from error
+        previous = chunk[-1]
+        yield bytes(chunk)
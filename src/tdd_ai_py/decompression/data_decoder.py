@@ -1,33 +1,78 @@
-from itertools import islice
-from typing import BinaryIO, Iterator, cast
+from typing import BinaryIO, Dict, Iterator, Union
 
-from ..compression.huffman_tree_builder import HuffmanNode
+from ..compression.canonical_codes import assign_canonical_codes
+from ..compression.huffman_encoder import flat_code_table
+from ..compression.huffman_tree_builder import FlatTree, HuffmanNode, flatten_tree
 from .bit_reader import BitReader
+from .decode_table import DEFAULT_TABLE_BITS, build_decode_table, iter_decode_symbols
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+Tree = Union[FlatTree, HuffmanNode]
+
+
+def _as_flat_tree(root: Tree) -> FlatTree:
+    return root if isinstance(root, FlatTree) else flatten_tree(root)
+
+
+def iter_decode_data(
+    root: Tree,
+    bit_reader: BitReader,
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    table_bits: int = DEFAULT_TABLE_BITS,
+) -> Iterator[bytes]:
+    """Decode ``length`` symbols through a lookup table built from the tree.
+
+    Output is produced in chunks of at most ``chunk_size`` bytes.
+    """
+    tree = _as_flat_tree(root)
+    if tree.left[tree.root] < 0:
+        character = tree.symbol[tree.root]
+        for start in range(0, length, chunk_size):
+            yield bytes([character]) * min(chunk_size, length - start)
+        return
+    table = build_decode_table(flat_code_table(tree), table_bits)
+    yield from iter_decode_symbols(table, bit_reader, length, chunk_size)
+
+
+def iter_decode_canonical_data(
+    code_lengths: Dict[int, int],
+    bit_reader: BitReader,
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    table_bits: int = DEFAULT_TABLE_BITS,
+) -> Iterator[bytes]:
+    """Decode ``length`` symbols using a table built straight from code lengths."""
+    table = build_decode_table(assign_canonical_codes(code_lengths), table_bits)
+    yield from iter_decode_symbols(table, bit_reader, length, chunk_size)
 
 
 def decode_data(
-    root: HuffmanNode,
+    root: Tree,
     bit_reader: BitReader,
     length: int,
     output_stream: BinaryIO,
+    table_bits: int = DEFAULT_TABLE_BITS,
 ) -> None:
-    characters = (
-        [root.character] * length
-        if root.is_leaf and root.character is not None
-        else list(islice(decode_characters(root, bit_reader), length))
-    )
-    output_stream.write(bytes(characters))
+    """Decode ``length`` symbols, writing each chunk as soon as it is decoded."""
+    for chunk in iter_decode_data(root, bit_reader, length, table_bits=table_bits):
+        output_stream.write(chunk)
+
 
+def decode_characters(root: Tree, bit_reader: BitReader) -> Iterator[int]:
+    """Decode characters by walking the Huffman tree one bit at a time.
 
-def decode_characters(root: HuffmanNode, bit_reader: BitReader) -> Iterator[int]:
-    """Decode characters from bit stream using Huffman tree."""
+    Kept as the reference decoder that the table-driven path is measured against.
+    """
+    tree = _as_flat_tree(root)
+    symbol, left, right = tree.symbol, tree.left, tree.right
 
     def get_character() -> int:
-        node = root
-        while not node.is_leaf:
-            bit = bit_reader.read_bit()
-            node = cast(HuffmanNode, node.left if bit == 0 else node.right)
-        return cast(int, node.character)
+        index = tree.root
+        while left[index] >= 0:
+            index = right[index] if bit_reader.read_bit() else left[index]
+        return symbol[index]
 
     try:
         while True:
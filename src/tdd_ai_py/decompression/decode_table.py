@@ -0,0 +1,94 @@
+from typing import Dict, Iterator, List, Tuple
+
+from .bit_reader import BitReader
+
+DEFAULT_TABLE_BITS = 11
+LENGTH_MASK = 0xFF
+
+
+class DecodeTable:
+    """Lookup table resolving a whole symbol from the next ``table_bits`` bits.
+
+    Each entry packs ``symbol << 8 | code_length``. Entries with a zero length
+    are prefixes of codes longer than ``table_bits`` (or of no code at all) and
+    are resolved through ``long_codes``.
+    """
+
+    def __init__(
+        self,
+        table_bits: int,
+        entries: List[int],
+        long_codes: Dict[Tuple[int, int], int],
+        max_length: int,
+    ) -> None:
+        self.table_bits = table_bits
+        self.entries = entries
+        self.long_codes = long_codes
+        self.max_length = max_length
+
+
+def build_decode_table(
+    codes: Dict[int, Tuple[int, int]], table_bits: int = DEFAULT_TABLE_BITS
+) -> DecodeTable:
+    """Build a decode table from ``symbol -> (code, length)`` pairs."""
+    max_length = max((length for _, length in codes.values()), default=1)
+    table_bits = max(1, min(table_bits, max_length))
+    entries = [0] * (1 << table_bits)
+    long_codes: Dict[Tuple[int, int], int] = {}
+
+    for symbol, (code, length) in codes.items():
+        if length > table_bits:
+            long_codes[(length, code)] = symbol
+            continue
+        span = 1 << (table_bits - length)
+        start = code << (table_bits - length)
+        entries[start : start + span] = [(symbol << 8) | length] * span
+
+    return DecodeTable(table_bits, entries, long_codes, max_length)
+
+
+def decode_long_code(table: DecodeTable, bit_reader: BitReader) -> int:
+    """Resolve a code longer than the table's index bits, one length at a time."""
+    for length in range(table.table_bits + 1, table.max_length + 1):
+        symbol = table.long_codes.get((length, bit_reader.peek_bits(length)))
+        if symbol is not None:
+            bit_reader.skip_bits(length)
+            return symbol
+    raise ValueError("Invalid Huffman code in compressed data")
+
+
+def decode_symbols(table: DecodeTable, bit_reader: BitReader, count: int) -> bytearray:
+    """Decode up to ``count`` symbols, stopping early if the bits run out."""
+    output = bytearray()
+    entries = table.entries
+    table_bits = table.table_bits
+    peek_bits = bit_reader.peek_bits
+    skip_bits = bit_reader.skip_bits
+    append = output.append
+
+    try:
+        for _ in range(count):
+            entry = entries[peek_bits(table_bits)]
+            length = entry & LENGTH_MASK
+            if length:
+                skip_bits(length)
+                append(entry >> 8)
+            else:
+                append(decode_long_code(table, bit_reader))
+    except EOFError:
+        pass
+    return output
+
+
+def iter_decode_symbols(
+    table: DecodeTable, bit_reader: BitReader, count: int, chunk_size: int
+) -> Iterator[bytes]:
+    """Decode ``count`` symbols as chunks of at most ``chunk_size`` bytes."""
+    remaining = count
+    while remaining > 0:
+        chunk = decode_symbols(table, bit_reader, min(chunk_size, remaining))
+        if chunk:
+            yield bytes(chunk)
+        if len(chunk) < min(chunk_size, remaining):
+            return
+        remaining -= len(chunk)
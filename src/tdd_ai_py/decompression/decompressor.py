@@ -1,19 +1,277 @@
-import struct
-from typing import BinaryIO, cast
+from typing import BinaryIO, Iterable, Iterator, Optional
 
+from ..compression.adaptive_huffman import ADAPTIVE_MAGIC
+from ..compression.block_format import BLOCK_MAGIC, decode_varint, read_varint
+from ..compression.context_model import CONTEXT_MAGIC
+from ..compression.run_length import RUN_LENGTH_MAGIC, RUN_SYMBOL_BITS
+from ..compression.stage_metrics import MetricsCallback, StageRecorder, stage_recorder
+from ..compression.stream_utils import ByteBuffer
+from ..compression.wide_compressor import WIDE_MAGIC, WIDE_SYMBOL_BITS
+from .adaptive_decoder import iter_decode_adaptive
 from .bit_reader import BitReader
-from .data_decoder import decode_data
-from .tree_deserializer import deserialize_tree
+from .block_decompressor import BlockDecompressor
+from .code_length_deserializer import deserialize_code_lengths
+from .context_decoder import deserialize_context_model, iter_decode_context_data
+from .data_decoder import DEFAULT_CHUNK_SIZE, iter_decode_canonical_data, iter_decode_data
+from .run_length_decoder import iter_decode_run_length_data
+from .tree_deserializer import deserialize_flat_tree
+from .wide_decoder import iter_decode_wide_data
 
+LENGTH_HEADER_SIZE = 4
 
-def read_big_endian_int(stream: BinaryIO) -> int:
-    """Read a 4-byte big-endian integer from stream."""
-    return cast(int, struct.unpack(">I", stream.read(4))[0])
+
+def split_chunks(blocks: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    """Re-slice decoded blocks so no yielded chunk exceeds ``chunk_size``."""
+    for data in blocks:
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+
+def _iter_decode_context(
+    length: int, bit_reader: BitReader, chunk_size: int, recorder: StageRecorder
+) -> Iterator[bytes]:
+    model = deserialize_context_model(bit_reader)
+    recorder.lap("read_header", symbol_count=len(model.tables))
+    chunks = iter_decode_context_data(model, bit_reader, length, chunk_size)
+    yield from recorder.timed_chunks("decode", chunks)
+
+
+def _iter_decode_wide(
+    symbol_bits: bytes,
+    length: int,
+    bit_reader: BitReader,
+    chunk_size: int,
+    recorder: StageRecorder,
+) -> Iterator[bytes]:
+    if symbol_bits != bytes([WIDE_SYMBOL_BITS]):
+        raise ValueError("Unsupported symbol width in wide-symbol stream")
+    code_lengths = deserialize_code_lengths(bit_reader, WIDE_SYMBOL_BITS)
+    recorder.lap("read_header", symbol_count=len(code_lengths))
+    chunks = iter_decode_wide_data(code_lengths, bit_reader, length, chunk_size)
+    yield from recorder.timed_chunks("decode", chunks)
+
+
+def _iter_decode_run_length(
+    length: int, bit_reader: BitReader, chunk_size: int, recorder: StageRecorder
+) -> Iterator[bytes]:
+    code_lengths = deserialize_code_lengths(bit_reader, RUN_SYMBOL_BITS)
+    recorder.lap("read_header", symbol_count=len(code_lengths))
+    chunks = iter_decode_run_length_data(code_lengths, bit_reader, length, chunk_size)
+    yield from recorder.timed_chunks("decode", chunks)
 
 
 class HuffmanDecompressor:
+    """Decompressor for ``HuffmanCompressor`` output.
+
+    ``canonical`` must match the flag the data was compressed with. Streams that
+    start with the block container magic are handed to ``BlockDecompressor``,
+    which decodes their blocks on ``jobs`` processes. ``AdaptiveCompressor``,
+    ``ContextCompressor``, ``WideCompressor`` and ``RunLengthCompressor``
+    streams are recognised by their magic too.
+
+    Input is read incrementally and never needs to be seekable; output is
+    produced in chunks, so memory stays bounded for arbitrarily large streams.
+    ``use_numpy`` is passed on to ``BlockDecompressor``.
+
+    ``metrics`` is called with a ``StageMetrics`` as each stage finishes; see
+    ``stage_metrics``. Without it nothing is timed.
+    """
+
+    def __init__(
+        self,
+        canonical: bool = False,
+        jobs: int = 1,
+        use_numpy: Optional[bool] = None,
+        metrics: Optional[MetricsCallback] = None,
+    ) -> None:
+        self._canonical = canonical
+        self._block_decompressor = BlockDecompressor(jobs, use_numpy)
+        self._metrics = metrics
+
     def decompress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
-        length = read_big_endian_int(input_stream)
-        bit_reader = BitReader(input_stream)
-        tree = deserialize_tree(bit_reader)
-        decode_data(tree, bit_reader, length, output_stream)
+        for chunk in self.iter_decompress(input_stream):
+            output_stream.write(chunk)
+
+    def iter_decompress(
+        self, input_stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Yield the decompressed data in chunks of at most ``chunk_size`` bytes."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        return self._iter_decompress(input_stream, chunk_size)
+
+    def _iter_decompress(
+        self, input_stream: BinaryIO, chunk_size: int
+    ) -> Iterator[bytes]:
+        recorder = stage_recorder(self._metrics)
+        container_start = input_stream.tell() if input_stream.seekable() else None
+        prefix = input_stream.read(LENGTH_HEADER_SIZE)
+        if prefix == BLOCK_MAGIC:
+            blocks = self._block_decompressor.iter_decompress_blocks(
+                input_stream, container_start
+            )
+            timed = recorder.timed_chunks("decode_blocks", blocks)
+            yield from split_chunks(timed, chunk_size)
+            return
+        if prefix == ADAPTIVE_MAGIC:
+            chunks = iter_decode_adaptive(BitReader(input_stream), chunk_size)
+            yield from recorder.timed_chunks("decode_adaptive", chunks)
+            return
+        if prefix == CONTEXT_MAGIC:
+            length = read_varint(input_stream)
+            yield from _iter_decode_context(
+                length, BitReader(input_stream), chunk_size, recorder
+            )
+            return
+        if prefix == WIDE_MAGIC:
+            symbol_bits = input_stream.read(1)
+            length = read_varint(input_stream)
+            yield from _iter_decode_wide(
+                symbol_bits, length, BitReader(input_stream), chunk_size, recorder
+            )
+            return
+        if prefix == RUN_LENGTH_MAGIC:
+            length = read_varint(input_stream)
+            yield from _iter_decode_run_length(
+                length, BitReader(input_stream), chunk_size, recorder
+            )
+            return
+        if len(prefix) != LENGTH_HEADER_SIZE:
+            raise ValueError("Compressed data is missing its length header")
+
+        length = int.from_bytes(prefix, byteorder="big")
+        yield from self._iter_decode_single_table(
+            length, BitReader(input_stream), chunk_size, recorder
+        )
+
+    def decompress_range(self, input_stream: BinaryIO, start: int, length: int) -> bytes:
+        """Return ``length`` bytes of the decompressed data from offset ``start``.
+
+        Block containers on seekable streams are decoded from the nearest
+        checkpoint; see ``BlockDecompressor.decompress_range``. Other streams
+        carry no checkpoints and are decoded from the start up to the end of
+        the range. A range reaching past the end of the data is cut short.
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start and length must be non-negative")
+        if input_stream.seekable():
+            container_start = input_stream.tell()
+            is_container = input_stream.read(len(BLOCK_MAGIC)) == BLOCK_MAGIC
+            input_stream.seek(container_start)
+            if is_container:
+                return self._block_decompressor.decompress_range(
+                    input_stream, start, length
+                )
+
+        output = bytearray()
+        position = 0
+        end = start + length
+        for chunk in self.iter_decompress(input_stream):
+            if position >= end:
+                break
+            chunk_end = position + len(chunk)
+            if chunk_end > start:
+                output += chunk[max(start - position, 0) : end - position]
+            position = chunk_end
+        return bytes(output)
+
+    def decompress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        for chunk in self.iter_decompress_buffer(data):
+            output_stream.write(chunk)
+
+    def iter_decompress_buffer(
+        self, data: ByteBuffer, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Like ``iter_decompress`` for an in-memory or memory-mapped buffer.
+
+        Bits are read from ``memoryview`` slices of ``data`` with no intermediate
+        read buffers.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        return self._iter_decompress_buffer(data, chunk_size)
+
+    def _iter_decompress_buffer(
+        self, data: ByteBuffer, chunk_size: int
+    ) -> Iterator[bytes]:
+        recorder = stage_recorder(self._metrics)
+        view = memoryview(data)
+        prefix = view[:LENGTH_HEADER_SIZE]
+        if prefix == BLOCK_MAGIC:
+            blocks = self._block_decompressor.iter_decompress_buffer(view)
+            timed = recorder.timed_chunks("decode_blocks", blocks)
+            yield from split_chunks(timed, chunk_size)
+            return
+        if prefix == CONTEXT_MAGIC:
+            length, position = decode_varint(view, LENGTH_HEADER_SIZE)
+            bit_reader = BitReader.from_buffer(view[position:])
+            yield from _iter_decode_context(length, bit_reader, chunk_size, recorder)
+            return
+        if prefix == WIDE_MAGIC:
+            symbol_bits = view[LENGTH_HEADER_SIZE : LENGTH_HEADER_SIZE + 1].tobytes()
+            length, position = decode_varint(view, LENGTH_HEADER_SIZE + 1)
+            bit_reader = BitReader.from_buffer(view[position:])
+            yield from _iter_decode_wide(
+                symbol_bits, length, bit_reader, chunk_size, recorder
+            )
+            return
+        if prefix == RUN_LENGTH_MAGIC:
+            length, position = decode_varint(view, LENGTH_HEADER_SIZE)
+            bit_reader = BitReader.from_buffer(view[position:])
+            yield from _iter_decode_run_length(length, bit_reader, chunk_size, recorder)
+            return
+        bit_reader = BitReader.from_buffer(view[LENGTH_HEADER_SIZE:])
+        if prefix == ADAPTIVE_MAGIC:
+            chunks = iter_decode_adaptive(bit_reader, chunk_size)
+            yield from recorder.timed_chunks("decode_adaptive", chunks)
+            return
+        if len(prefix) != LENGTH_HEADER_SIZE:
+            raise ValueError("Compressed data is missing its length header")
+
+        length = int.from_bytes(prefix, byteorder="big")
+        yield from self._iter_decode_single_table(
+            length,
+            bit_reader,
+            chunk_size,
+            recorder,
+        )
+
+    def _iter_decode_single_table(
+        self, length: int, bit_reader: BitReader, chunk_size: int, recorder: StageRecorder
+    ) -> Iterator[bytes]:
+        if self._canonical:
+            code_lengths = deserialize_code_lengths(bit_reader)
+            recorder.lap("read_header", symbol_count=len(code_lengths))
+            chunks = iter_decode_canonical_data(
+                code_lengths, bit_reader, length, chunk_size
+            )
+        else:
+            tree = deserialize_flat_tree(bit_reader)
+            recorder.lap("read_header")
+            chunks = iter_decode_data(tree, bit_reader, length, chunk_size)
+        yield from recorder.timed_chunks("decode", chunks)
+
+
+def iter_decompress(
+    input_stream: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    canonical: bool = False,
+) -> Iterator[bytes]:
+    """Decompress ``input_stream`` lazily, yielding chunks of at most ``chunk_size``."""
+    return HuffmanDecompressor(canonical=canonical).iter_decompress(
+        input_stream, chunk_size
+    )
+
+
+def decompress_range(
+    input_stream: BinaryIO, start: int, length: int, canonical: bool = False
+) -> bytes:
+    """Decompress ``length`` bytes from uncompressed offset ``start`` of a stream."""
+    return HuffmanDecompressor(canonical=canonical).decompress_range(
+        input_stream, start, length
+    )
+
+
+def decompress_bytes(data: ByteBuffer, canonical: bool = False) -> bytes:
+    """Decompress an in-memory buffer of either format and return the data."""
+    return b"".join(HuffmanDecompressor(canonical=canonical).iter_decompress_buffer(data))
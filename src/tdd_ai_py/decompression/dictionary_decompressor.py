@@ -0,0 +1,53 @@
+from typing import BinaryIO, Dict, Iterable
+
+from ..compression.block_format import decode_varint, read_varint
+from ..compression.canonical_codes import assign_canonical_codes
+from ..compression.static_table import StaticCodeTable
+from ..compression.stream_utils import ByteBuffer
+from .bit_reader import BitReader
+from .decode_table import DecodeTable, build_decode_table, decode_symbols
+
+
+class DictionaryDecompressor:
+    """Decompressor for ``DictionaryCompressor`` frames.
+
+    Decode tables for every given ``StaticCodeTable`` are built up front and
+    selected per message by the table ID in its frame.
+    """
+
+    def __init__(self, tables: Iterable[StaticCodeTable]) -> None:
+        self._decode_tables: Dict[int, DecodeTable] = {
+            table.table_id: build_decode_table(assign_canonical_codes(table.code_lengths))
+            for table in tables
+        }
+
+    def decompress(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+        decode_table = self._decode_table(read_varint(input_stream))
+        length = read_varint(input_stream)
+        self._decode(decode_table, BitReader(input_stream), length, output_stream)
+
+    def decompress_buffer(self, data: ByteBuffer, output_stream: BinaryIO) -> None:
+        view = memoryview(data)
+        table_id, position = decode_varint(view, 0)
+        decode_table = self._decode_table(table_id)
+        length, position = decode_varint(view, position)
+        bit_reader = BitReader.from_buffer(view[position:])
+        self._decode(decode_table, bit_reader, length, output_stream)
+
+    def _decode_table(self, table_id: int) -> DecodeTable:
+        decode_table = self._decode_tables.get(table_id)
+        if decode_table is None:
+            raise ValueError(f"Unknown static code table {table_id}")
+        return decode_table
+
+    @staticmethod
+    def _decode(
+        decode_table: DecodeTable,
+        bit_reader: BitReader,
+        length: int,
+        output_stream: BinaryIO,
+    ) -> None:
+        data = decode_symbols(decode_table, bit_reader, length)
+        if len(data) != length:
+            raise ValueError("Truncated dictionary frame")
+        output_stream.write(data)
@@ -0,0 +1,82 @@
+from typing import Dict, List, Tuple
+
+from ..compression.canonical_codes import assign_canonical_codes
+from ..compression.numpy_engine import np
+from ..compression.stream_utils import ByteBuffer
+
+# Windows are read from 32-bit words at a bit offset of up to 7
+MAX_VECTOR_TABLE_BITS = 16
+
+
+def _lookup_tables(code_lengths: Dict[int, int]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Map every ``max_length``-bit window to its first symbol and code length.
+
+    Windows that start no code keep a zero length, so a lane reading one stalls.
+    """
+    table_bits = max(code_lengths.values())
+    symbols = np.zeros(1 << table_bits, dtype=np.uint8)
+    lengths = np.zeros(1 << table_bits, dtype=np.int64)
+    for symbol, (code, length) in assign_canonical_codes(code_lengths).items():
+        start = code << (table_bits - length)
+        end = (code + 1) << (table_bits - length)
+        symbols[start:end] = symbol
+        lengths[start:end] = length
+    return symbols, lengths
+
+
+def _window_words(data: "np.ndarray", padding: int) -> "np.ndarray":
+    """Return the big-endian 32-bit word starting at every byte of ``data``.
+
+    ``padding`` zero bytes are appended so lanes may overrun the end.
+    """
+    padded = np.zeros(data.size + padding + 3, dtype=np.int64)
+    padded[: data.size] = data
+    return (padded[:-3] << 24) | (padded[1:-2] << 16) | (padded[2:-1] << 8) | padded[3:]
+
+
+def decode_sync_lanes(
+    code_lengths: Dict[int, int],
+    data: ByteBuffer,
+    sync_interval: int,
+    offsets: List[int],
+    count: int,
+) -> bytes:
+    """Decode ``count`` symbols starting a lane at every sync point.
+
+    All lanes advance together: each step gathers every lane's next window
+    from a word array, resolves it through the symbol and length tables and
+    moves the lane on by the code length. Every lane but the last must end
+    exactly at the next sync point, and the last within the final byte.
+    """
+    lane_count = -(-count // sync_interval)
+    if len(offsets) != lane_count:
+        raise ValueError("Sync points do not match block length")
+    total_bits = len(data) << 3
+    if sorted(offsets) != offsets or offsets[-1] > total_bits:
+        raise ValueError("Sync points lie outside the block payload")
+
+    table_bits = max(code_lengths.values())
+    symbol_table, length_table = _lookup_tables(code_lengths)
+    words = _window_words(
+        np.frombuffer(data, dtype=np.uint8), (sync_interval * table_bits >> 3) + 1
+    )
+    shift = 32 - table_bits
+    mask = (1 << table_bits) - 1
+    last_count = count - (lane_count - 1) * sync_interval
+
+    positions = np.array(offsets, dtype=np.int64)
+    output = np.empty((sync_interval, lane_count), dtype=np.uint8)
+    last_end = offsets[-1]
+    for step in range(sync_interval):
+        windows = ((words[positions >> 3] << (positions & 7)) >> shift) & mask
+        output[step] = symbol_table[windows]
+        positions += length_table[windows]
+        if step == last_count - 1:
+            last_end = int(positions[-1])
+
+    if (
+        positions[:-1].tolist() != offsets[1:]
+        or not total_bits - 8 < last_end <= total_bits
+    ):
+        raise ValueError("Invalid Huffman code in compressed data")
+    return output.T.tobytes()[:count]
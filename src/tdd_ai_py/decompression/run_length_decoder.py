@@ -0,0 +1,66 @@
+from typing import Dict, Iterator
+
+from ..compression.canonical_codes import assign_canonical_codes
+from ..compression.run_length import RUN_SYMBOL_BASE
+from .bit_reader import BitReader
+from .data_decoder import DEFAULT_CHUNK_SIZE
+from .decode_table import LENGTH_MASK, build_decode_table, decode_long_code
+
+_BYTE_VALUES = [bytes([value]) for value in range(256)]
+
+
+def iter_decode_run_length_data(
+    code_lengths: Dict[int, int],
+    bit_reader: BitReader,
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Decode ``length`` bytes of run-length tokens in chunks of at most ``chunk_size``.
+
+    Runs are expanded by repeating a one-byte ``bytes`` object, so a run costs
+    one decoded symbol however long it is. A run longer than the room left in
+    a chunk carries over into the next ones.
+    """
+    table = build_decode_table(assign_canonical_codes(code_lengths))
+    entries = table.entries
+    table_bits = table.table_bits
+    peek_bits = bit_reader.peek_bits
+    skip_bits = bit_reader.skip_bits
+    read_bits = bit_reader.read_bits
+    previous = -1
+    repeats = 0
+    remaining = length
+
+    while remaining > 0:
+        output = bytearray()
+        append = output.append
+        size = 0
+        room = min(chunk_size, remaining)
+        try:
+            while size < room:
+                if repeats:
+                    count = min(repeats, room - size)
+                    output += _BYTE_VALUES[previous] * count
+                    size += count
+                    repeats -= count
+                    continue
+                entry = entries[peek_bits(table_bits)]
+                code_length = entry & LENGTH_MASK
+                if code_length:
+                    skip_bits(code_length)
+                    symbol = entry >> 8
+                else:
+                    symbol = decode_long_code(table, bit_reader)
+                if symbol < RUN_SYMBOL_BASE:
+                    append(symbol)
+                    previous = symbol
+                    size += 1
+                elif previous < 0:
+                    raise ValueError("Run-length stream starts with a run")
+                else:
+                    extra_bits = symbol - RUN_SYMBOL_BASE
+                    repeats = (1 << extra_bits) | read_bits(extra_bits)
+        except EOFError as error:
+            raise ValueError("Truncated run-length stream") from error
+        remaining -= size
+        yield bytes(output)
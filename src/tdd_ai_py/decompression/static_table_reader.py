@@ -0,0 +1,14 @@
+from typing import BinaryIO
+
+from ..compression.block_format import read_varint
+from ..compression.static_table import TABLE_MAGIC, StaticCodeTable
+from .bit_reader import BitReader
+from .code_length_deserializer import deserialize_code_lengths
+
+
+def read_static_table(input_stream: BinaryIO) -> StaticCodeTable:
+    """Read a table written by ``write_static_table``."""
+    if input_stream.read(len(TABLE_MAGIC)) != TABLE_MAGIC:
+        raise ValueError("Not a Huffman static code table")
+    table_id = read_varint(input_stream)
+    return StaticCodeTable(table_id, deserialize_code_lengths(BitReader(input_stream)))
@@ -1,16 +1,40 @@
-from ..compression.huffman_tree_builder import HuffmanNode
+from typing import List, Tuple
+
+from ..compression.huffman_tree_builder import FlatTree, HuffmanNode, flat_tree_to_nodes
 from .bit_reader import BitReader
 
+# A full binary tree over the 256 byte values has at most 511 nodes
+MAX_TREE_NODES = 511
+
+
+def deserialize_flat_tree(bit_reader: BitReader) -> FlatTree:
+    """Read a preorder-serialized tree into a ``FlatTree``, numbered in preorder.
+
+    Parsing keeps an explicit stack of child slots still to fill, so it never
+    recurses, and headers describing more than ``MAX_TREE_NODES`` nodes are
+    rejected.
+    """
+    symbol: List[int] = []
+    left: List[int] = []
+    right: List[int] = []
+    slots: List[Tuple[int, List[int]]] = [(-1, left)]
+    while slots:
+        parent, parent_links = slots.pop()
+        index = len(symbol)
+        if index == MAX_TREE_NODES:
+            raise ValueError("Tree header has too many nodes")
+        if parent >= 0:
+            parent_links[parent] = index
+        left.append(-1)
+        right.append(-1)
+        if bit_reader.read_bit() == 1:
+            symbol.append(bit_reader.read_bits(8))
+        else:
+            symbol.append(-1)
+            slots.append((index, right))
+            slots.append((index, left))
+    return FlatTree(symbol, left, right, [0] * len(symbol), 0)
+
 
 def deserialize_tree(bit_reader: BitReader) -> HuffmanNode:
-    return (
-        HuffmanNode(
-            weight=0, character=sum(bit_reader.read_bit() << (7 - i) for i in range(8))
-        )
-        if bit_reader.read_bit() == 1
-        else HuffmanNode(
-            weight=0,
-            left=deserialize_tree(bit_reader),
-            right=deserialize_tree(bit_reader),
-        )
-    )
+    return flat_tree_to_nodes(deserialize_flat_tree(bit_reader))
@@ -0,0 +1,54 @@
+from array import array
+from typing import Dict, Iterator
+
+from ..compression.canonical_codes import assign_canonical_codes
+from ..compression.stream_utils import wide_symbol_bytes
+from .bit_reader import BitReader
+from .data_decoder import DEFAULT_CHUNK_SIZE
+from .decode_table import LENGTH_MASK, DecodeTable, build_decode_table, decode_long_code
+
+# Pair codes are longer than byte codes, so resolve more of them per lookup
+WIDE_TABLE_BITS = 16
+
+
+def _decode_wide_symbols(
+    table: DecodeTable, bit_reader: BitReader, count: int
+) -> "array[int]":
+    symbols = array("H")
+    entries = table.entries
+    table_bits = table.table_bits
+    peek_bits = bit_reader.peek_bits
+    skip_bits = bit_reader.skip_bits
+    append = symbols.append
+
+    for _ in range(count):
+        entry = entries[peek_bits(table_bits)]
+        length = entry & LENGTH_MASK
+        if length:
+            skip_bits(length)
+            append(entry >> 8)
+        else:
+            append(decode_long_code(table, bit_reader))
+    return symbols
+
+
+def iter_decode_wide_data(
+    code_lengths: Dict[int, int],
+    bit_reader: BitReader,
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Decode ``length`` bytes of 16-bit symbols in chunks of at most ``chunk_size``.
+
+    Each chunk holds a whole number of symbols, so ``chunk_size`` is rounded
+    down to an even size of at least 2.
+    """
+    table = build_decode_table(assign_canonical_codes(code_lengths), WIDE_TABLE_BITS)
+    pairs_per_chunk = max(1, chunk_size >> 1)
+    for start in range(0, length, pairs_per_chunk << 1):
+        chunk_length = min(pairs_per_chunk << 1, length - start)
+        try:
+            symbols = _decode_wide_symbols(table, bit_reader, (chunk_length + 1) >> 1)
+        except EOFError as error:
+            raise ValueError("Truncated wide-symbol stream") from error
+        yield wide_symbol_bytes(symbols)[:chunk_length]
@@ -0,0 +1,29 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    function: Callable[[T], R], items: Iterable[T], jobs: int = 1
+) -> Iterator[R]:
+    """Map ``function`` over ``items`` on ``jobs`` processes, yielding in input order.
+
+    At most ``2 * jobs`` items are in flight, so memory stays bounded however
+    long ``items`` is. With ``jobs == 1`` everything runs in-process.
+    """
+    if jobs == 1:
+        yield from map(function, items)
+        return
+
+    max_in_flight = 2 * jobs
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: Deque[Future[R]] = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,148 @@
+import random
+from io import BytesIO
+from typing import List
+
+import pytest
+
+from tdd_ai_py.compress import parse_args
+from tdd_ai_py.compression.adaptive_compressor import AdaptiveCompressor
+from tdd_ai_py.compression.adaptive_huffman import (
+    ADAPTIVE_MAGIC,
+    END_OF_STREAM,
+    AdaptiveHuffmanTree,
+)
+from tdd_ai_py.compression.bit_writer import BitWriter
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor, decompress_bytes
+
+from .test_helpers import bits_and_bytes
+
+_RANDOM = random.Random(20)
+_INPUTS = {
+    "empty": b"",
+    "single_byte": b"q" * 300,
+    "all_bytes": bytes(range(256)) * 2,
+    "text": b"Adaptive codes follow the data as it arrives. " * 80,
+    "skewed": bytes(min(int(_RANDOM.expovariate(0.2)), 255) for _ in range(4000)),
+    "random": bytes(_RANDOM.randrange(256) for _ in range(3000)),
+}
+
+
+class _OneWayStream(BytesIO):
+    """Non-seekable input that fails if anything tries to rewind it."""
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        raise AssertionError("adaptive compression must not seek")
+
+
+class _RecordingStream(BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: List[int] = []
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self.writes.append(len(data))
+        return super().write(data)
+
+
+def _compress(data: bytes, chunk_size: int = 8192) -> bytes:
+    output_stream = BytesIO()
+    AdaptiveCompressor(chunk_size).compress(_OneWayStream(data), output_stream)
+    return output_stream.getvalue()
+
+
+def _assert_sibling_property(tree: AdaptiveHuffmanTree) -> None:
+    weights = tree.ordered_weights()
+    for (weight, is_leaf), (next_weight, next_is_leaf) in zip(weights, weights[1:]):
+        assert weight <= next_weight
+        assert weight < next_weight or is_leaf or not next_is_leaf
+
+
+class TestAdaptiveHuffmanTree:
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_keeps_implicit_numbering_invariant(self, data: bytes) -> None:
+        tree = AdaptiveHuffmanTree()
+
+        for index, byte in enumerate(data):
+            tree.update(byte)
+            if index % 61 == 0:
+                _assert_sibling_property(tree)
+
+        _assert_sibling_property(tree)
+        assert tree.ordered_weights()[-1][0] == len(data)
+
+    def test_frequent_bytes_get_shorter_codes(self) -> None:
+        tree = AdaptiveHuffmanTree()
+        output_stream = BytesIO()
+        writer = BitWriter(output_stream)
+        for byte in b"a" * 50 + b"bcdefgh":
+            tree.encode(byte, writer)
+
+        before = writer.bit_position
+        tree.encode(ord("a"), writer)
+
+        assert writer.bit_position - before == 1
+
+
+class TestAdaptiveCompressor:
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_round_trips_through_huffman_decompressor(self, data: bytes) -> None:
+        compressed = _compress(data, chunk_size=1000)
+        output_stream = BytesIO()
+
+        HuffmanDecompressor().decompress(BytesIO(compressed), output_stream)
+
+        assert compressed.startswith(ADAPTIVE_MAGIC)
+        assert output_stream.getvalue() == data
+        assert decompress_bytes(compressed) == data
+
+    def test_buffer_matches_stream_compression(self) -> None:
+        data = _INPUTS["text"]
+        from_buffer = BytesIO()
+
+        AdaptiveCompressor(500).compress_buffer(memoryview(data), from_buffer)
+
+        assert from_buffer.getvalue() == _compress(data, 500)
+
+    def test_writes_output_after_every_chunk(self) -> None:
+        output_stream = _RecordingStream()
+
+        AdaptiveCompressor(1000).compress(_OneWayStream(_INPUTS["text"]), output_stream)
+
+        # Magic, one write per 1000-byte chunk, then the end marker
+        assert len(output_stream.writes) == 2 + len(_INPUTS["text"]) // 1000 + 1
+
+    def test_compresses_skewed_data(self) -> None:
+        assert len(_compress(_INPUTS["skewed"])) < len(_INPUTS["skewed"]) * 0.6
+
+    def test_rejects_truncated_stream(self) -> None:
+        compressed = _compress(_INPUTS["text"])
+
+        with pytest.raises(ValueError, match="Truncated"):
+            decompress_bytes(compressed[:-20])
+
+    def test_rejects_repeated_new_symbol(self) -> None:
+        # 'a' as a new symbol, then the NYT code (0) announcing 'a' again
+        _, body = bits_and_bytes("001100001" + "0" + "001100001")
+
+        with pytest.raises(ValueError, match="Corrupt"):
+            decompress_bytes(ADAPTIVE_MAGIC + body)
+
+    def test_end_marker_never_enters_the_tree(self) -> None:
+        tree = AdaptiveHuffmanTree()
+        writer = BitWriter(BytesIO())
+
+        tree.encode(END_OF_STREAM, writer)
+
+        assert tree.ordered_weights() == [(0, True)]
+
+    def test_rejects_non_positive_chunk_size(self) -> None:
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            AdaptiveCompressor(0)
+
+    @pytest.mark.parametrize("option", [["--jobs", "2"], ["--sample-chunks", "4"]])
+    def test_cli_rejects_adaptive_with_two_pass_options(self, option: List[str]) -> None:
+        with pytest.raises(SystemExit):
+            parse_args(["--adaptive", *option, "input.txt"])
@@ -0,0 +1,146 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Callable, List, Optional
+
+import pytest
+
+from tdd_ai_py.compression.adaptive_compressor import AdaptiveCompressor
+from tdd_ai_py.compression.async_compressor import compress_async
+from tdd_ai_py.compression.block_compressor import BlockCompressor
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.context_compressor import ContextCompressor
+from tdd_ai_py.compression.run_length_compressor import RunLengthCompressor
+from tdd_ai_py.compression.stream_utils import ByteBuffer
+from tdd_ai_py.compression.wide_compressor import WideCompressor
+from tdd_ai_py.decompression.async_decompressor import decompress_async
+
+_TEXT = b"she sells seashells on the seashore. " * 200 + bytes(range(256))
+
+
+class _Writer:
+    """Collects written bytes and records how much was pending at each drain."""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.drained_at: List[int] = []
+
+    def write(self, data: ByteBuffer) -> None:
+        self.buffer += data
+
+    async def drain(self) -> None:
+        self.drained_at.append(len(self.buffer))
+        await asyncio.sleep(0)
+
+
+def _reader(data: bytes, piece_size: Optional[int] = None) -> asyncio.StreamReader:
+    """A reader that receives ``data`` in pieces from a background task."""
+    reader = asyncio.StreamReader()
+    size = piece_size or max(len(data), 1)
+
+    async def feed() -> None:
+        for start in range(0, len(data), size):
+            reader.feed_data(data[start : start + size])
+            await asyncio.sleep(0)
+        reader.feed_eof()
+
+    asyncio.get_running_loop().create_task(feed())
+    return reader
+
+
+async def _compress(data: bytes, **options: int) -> _Writer:
+    writer = _Writer()
+    await compress_async(_reader(data, 97), writer, **options)
+    return writer
+
+
+async def _decompress(compressed: bytes, canonical: bool = False) -> bytes:
+    writer = _Writer()
+    await decompress_async(_reader(compressed, 101), writer, canonical=canonical)
+    return bytes(writer.buffer)
+
+
+class TestCompressAsync:
+    @pytest.mark.parametrize("data", [b"", b"a", _TEXT], ids=["empty", "one", "text"])
+    def test_matches_block_compressor(self, data: bytes) -> None:
+        expected = BytesIO()
+        BlockCompressor(block_size=1000).compress(BytesIO(data), expected)
+
+        writer = asyncio.run(_compress(data, block_size=1000))
+
+        assert bytes(writer.buffer) == expected.getvalue()
+
+    def test_drains_after_every_block(self) -> None:
+        writer = asyncio.run(_compress(_TEXT, block_size=1000))
+
+        assert len(writer.drained_at) == -(-len(_TEXT) // 1000) + 1
+
+    def test_encodes_on_a_process_pool(self) -> None:
+        async def run() -> bytes:
+            writer = _Writer()
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                await compress_async(
+                    _reader(_TEXT), writer, block_size=700, executor=executor
+                )
+            return await _decompress(bytes(writer.buffer))
+
+        assert asyncio.run(run()) == _TEXT
+
+    def test_streams_many_connections_at_once(self) -> None:
+        inputs = [_TEXT[index:] for index in range(0, 800, 100)]
+
+        async def run() -> List[bytes]:
+            writers = await asyncio.gather(
+                *(_compress(data, block_size=500) for data in inputs)
+            )
+            return await asyncio.gather(
+                *(_decompress(bytes(writer.buffer)) for writer in writers)
+            )
+
+        assert asyncio.run(run()) == inputs
+
+    @pytest.mark.parametrize("option", ["block_size", "max_in_flight"])
+    def test_rejects_non_positive_options(self, option: str) -> None:
+        with pytest.raises(ValueError, match=f"{option} must be positive"):
+            asyncio.run(_compress(_TEXT, **{option: 0}))
+
+
+class TestDecompressAsync:
+    def test_round_trips_block_container(self) -> None:
+        async def run() -> bytes:
+            writer = await _compress(_TEXT, block_size=300, max_in_flight=3)
+            return await _decompress(bytes(writer.buffer))
+
+        assert asyncio.run(run()) == _TEXT
+
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_decodes_single_table_format(self, canonical: bool) -> None:
+        compressed = BytesIO()
+        HuffmanCompressor(canonical=canonical).compress(BytesIO(_TEXT), compressed)
+
+        assert asyncio.run(_decompress(compressed.getvalue(), canonical)) == _TEXT
+
+    @pytest.mark.parametrize(
+        "compress",
+        [
+            AdaptiveCompressor().compress,
+            ContextCompressor().compress,
+            WideCompressor().compress,
+            RunLengthCompressor().compress,
+        ],
+        ids=["adaptive", "context", "wide", "run_length"],
+    )
+    def test_decodes_unsplittable_formats(
+        self, compress: Callable[[BinaryIO, BinaryIO], None]
+    ) -> None:
+        compressed = BytesIO()
+        compress(BytesIO(_TEXT), compressed)
+
+        assert asyncio.run(_decompress(compressed.getvalue())) == _TEXT
+
+    def test_truncated_container_raises(self) -> None:
+        expected = BytesIO()
+        BlockCompressor(block_size=1000).compress(BytesIO(_TEXT), expected)
+
+        with pytest.raises(ValueError, match="Truncated"):
+            asyncio.run(_decompress(expected.getvalue()[:1500]))
@@ -0,0 +1,73 @@
+from io import BytesIO
+from typing import List
+
+import pytest
+
+from tdd_ai_py.compression.batch_compressor import (
+    compress_batch,
+    compress_many,
+    pack_frames,
+)
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.static_table import train_static_table
+from tdd_ai_py.decompression.batch_decompressor import decompress_batch, decompress_many
+
+_MESSAGES: List[bytes] = [
+    b'{"user": "alice", "event": "click"}',
+    b"a",
+    b'{"user": "bob", "event": "view", "items": [1, 2, 3]}',
+    bytes(range(256)),
+    b"abracadabra" * 50,
+]
+
+
+def _compress_alone(message: bytes, canonical: bool) -> bytes:
+    output_stream = BytesIO()
+    HuffmanCompressor(canonical=canonical).compress(BytesIO(message), output_stream)
+    return output_stream.getvalue()
+
+
+class TestCompressMany:
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_frames_match_single_message_compression(self, canonical: bool) -> None:
+        frames = compress_many(_MESSAGES, canonical)
+
+        assert frames == [_compress_alone(message, canonical) for message in _MESSAGES]
+        assert decompress_many(frames, canonical) == _MESSAGES
+
+    def test_round_trips_against_a_table(self) -> None:
+        table = train_static_table(_MESSAGES[:1], table_id=4)
+
+        frames = compress_many(_MESSAGES, table=table)
+
+        assert all(frame[0] == 4 for frame in frames)
+        assert decompress_many(frames, tables=[table]) == _MESSAGES
+
+    def test_empty_batch(self) -> None:
+        assert compress_many([]) == []
+        assert decompress_many([]) == []
+
+
+class TestCompressBatch:
+    def test_packs_frames_with_offsets(self) -> None:
+        batch = compress_batch(_MESSAGES)
+        frames = compress_many(_MESSAGES)
+
+        assert batch == pack_frames(frames)
+        assert batch.offsets[0] == 0 and batch.offsets[-1] == len(batch.buffer)
+        assert [
+            batch.buffer[start:end]
+            for start, end in zip(batch.offsets, batch.offsets[1:])
+        ] == frames
+        assert decompress_batch(batch) == _MESSAGES
+
+    def test_shared_table_travels_with_the_batch(self) -> None:
+        batch = compress_batch(_MESSAGES, shared_table=True, table_id=9)
+
+        assert batch.table is not None and batch.table.table_id == 9
+        assert decompress_batch(batch) == _MESSAGES
+
+    def test_accepts_iterators(self) -> None:
+        batch = compress_batch(iter(_MESSAGES), canonical=True, shared_table=True)
+
+        assert decompress_batch(batch, canonical=True) == _MESSAGES
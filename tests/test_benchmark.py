@@ -0,0 +1,147 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tdd_ai_py.benchmark import (
+    CORPORA,
+    DEFAULT_CODECS,
+    BenchmarkResult,
+    find_regressions,
+    format_size,
+    generate_corpus,
+    main,
+    parse_size,
+    results_from_json,
+    results_to_json,
+    run_benchmarks,
+)
+
+_BASE = BenchmarkResult("huffman", "text", 1024, 0.5, 10.0, 4.0)
+_ZLIB = BenchmarkResult("zlib", "text", 1024, 0.3, 100.0, 200.0)
+
+
+class TestCorpora:
+    @pytest.mark.parametrize("corpus", CORPORA)
+    def test_generates_exact_size_deterministically(self, corpus: str) -> None:
+        data = generate_corpus(corpus, 5000)
+
+        assert len(data) == 5000
+        assert data == generate_corpus(corpus, 5000)
+
+    def test_single_byte_corpus_has_one_symbol(self) -> None:
+        assert set(generate_corpus("single_byte", 100)) == {ord("a")}
+
+
+class TestSizes:
+    @pytest.mark.parametrize(
+        "text, size",
+        [("512", 512), ("1K", 1024), ("64kb", 65536), ("1M", 1 << 20), ("1G", 1 << 30)],
+    )
+    def test_parses_binary_units(self, text: str, size: int) -> None:
+        assert parse_size(text) == size
+
+    def test_formats_whole_units(self) -> None:
+        assert [format_size(size) for size in (1 << 20, 3072, 1000)] == [
+            "1M",
+            "3K",
+            "1000",
+        ]
+
+
+class TestRunBenchmarks:
+    def test_measures_every_codec_and_round_trips(self) -> None:
+        results = run_benchmarks(["skewed"], [2048], ["huffman", "zlib"], min_time=0)
+
+        assert [(result.codec, result.size) for result in results] == [
+            ("huffman", 2048),
+            ("zlib", 2048),
+        ]
+        assert all(result.ratio < 1 for result in results)
+        assert all(
+            result.compress_mbps > 0 and result.decompress_mbps > 0 for result in results
+        )
+
+    def test_adaptive_codec_is_opt_in(self) -> None:
+        results = run_benchmarks(["text"], [1024], ["huffman-adaptive"], min_time=0)
+
+        assert results[0].ratio < 1
+        assert "huffman-adaptive" not in DEFAULT_CODECS
+
+    def test_json_round_trip(self) -> None:
+        document = json.loads(json.dumps(results_to_json([_BASE])))
+
+        assert results_from_json(document) == [_BASE]
+
+
+class TestFindRegressions:
+    def test_accepts_noise_within_tolerance(self) -> None:
+        result = _BASE._replace(compress_mbps=8.0, decompress_mbps=3.5)
+
+        assert find_regressions([result, _ZLIB], [_BASE, _ZLIB], tolerance=0.25) == []
+
+    def test_compares_throughput_relative_to_reference(self) -> None:
+        slower_machine = [
+            _BASE._replace(compress_mbps=2.0, decompress_mbps=0.8),
+            _ZLIB._replace(compress_mbps=20.0, decompress_mbps=40.0),
+        ]
+
+        assert find_regressions(slower_machine, [_BASE, _ZLIB], tolerance=0.25) == []
+
+    def test_compares_only_ratio_without_reference(self) -> None:
+        result = _BASE._replace(compress_mbps=0.1, ratio=0.6)
+
+        regressions = find_regressions([result], [_BASE, _ZLIB])
+
+        assert len(regressions) == 1
+        assert "ratio" in regressions[0]
+
+    @pytest.mark.parametrize(
+        "changes, field",
+        [
+            ({"compress_mbps": 5.0}, "compress_mbps"),
+            ({"decompress_mbps": 1.0}, "decompress_mbps"),
+            ({"ratio": 0.51}, "ratio"),
+        ],
+    )
+    def test_flags_slower_or_larger_results(self, changes: dict, field: str) -> None:
+        results = [_BASE._replace(**changes), _ZLIB]
+
+        regressions = find_regressions(results, [_BASE, _ZLIB], 0.25)
+
+        assert len(regressions) == 1
+        assert field in regressions[0]
+
+    def test_ignores_context_codecs_and_missing_entries(self) -> None:
+        zlib_base = _BASE._replace(codec="zlib", compress_mbps=100.0)
+        slow_zlib = zlib_base._replace(compress_mbps=0.1)
+        new_size = _BASE._replace(size=4096, compress_mbps=0.1)
+
+        assert find_regressions([slow_zlib, new_size], [_BASE, zlib_base]) == []
+
+
+class TestMain:
+    _ARGS = ["--sizes", "1K", "--corpora", "skewed"]
+    _ARGS += ["--codecs", "huffman", "--min-time", "0"]
+
+    def test_saves_baseline_then_passes_against_it(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        baseline = tmp_path / "baseline.json"
+
+        main(self._ARGS + ["--baseline", str(baseline), "--save-baseline"])
+        main(self._ARGS + ["--baseline", str(baseline), "--tolerance", "1"])
+
+        assert "huffman          skewed" in capsys.readouterr().out
+
+    def test_exits_non_zero_on_regression(self, tmp_path: Path) -> None:
+        baseline = tmp_path / "baseline.json"
+        fast = _BASE._replace(corpus="skewed", compress_mbps=1e9)
+        reference = _ZLIB._replace(corpus="skewed", compress_mbps=1.0)
+        baseline.write_text(json.dumps(results_to_json([fast, reference])))
+        args = ["--sizes", "1K", "--corpora", "skewed", "--codecs", "huffman,zlib"]
+
+        with pytest.raises(SystemExit) as exit_info:
+            main(args + ["--min-time", "0", "--baseline", str(baseline)])
+
+        assert exit_info.value.code == 1
@@ -1,5 +1,7 @@
 from io import BytesIO
 
+import pytest
+
 from tdd_ai_py.decompression.bit_reader import BitReader
 
 
@@ -12,3 +14,20 @@ class TestBitReader:
 
         # 'a' = ASCII 97 = 01100001 in binary, MSB is 0
         assert result == 0
+
+    def test_peeks_without_consuming(self) -> None:
+        bit_reader = BitReader(BytesIO(bytes([0b10110000])))
+
+        assert bit_reader.peek_bits(3) == 0b101
+        assert bit_reader.read_bits(4) == 0b1011
+
+    def test_peek_past_end_pads_with_zeros(self) -> None:
+        bit_reader = BitReader(BytesIO(bytes([0xFF])))
+
+        assert bit_reader.peek_bits(12) == 0xFF0
+
+    def test_skip_past_end_raises_eof(self) -> None:
+        bit_reader = BitReader(BytesIO(bytes([0xFF])))
+
+        with pytest.raises(EOFError):
+            bit_reader.skip_bits(9)
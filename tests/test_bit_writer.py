@@ -39,3 +39,81 @@ class TestBitWriter:
         output_stream.seek(0)
         result = output_stream.read()
         assert result == expected_bytes
+
+    def test_writes_whole_codewords(self) -> None:
+        output_stream = BytesIO()
+        writer = BitWriter(output_stream)
+
+        writer.write_code(0b101, 3)
+        writer.write_code(0b0, 1)
+        writer.write_code(0b1111, 4)
+        writer.write_code(0b1, 1)
+        writer.flush()
+
+        # 101 0 1111 1 -> 10101111 1(0000000)
+        assert output_stream.getvalue() == bytes([0b10101111, 0b10000000])
+
+    def test_write_codes_matches_write_code(self) -> None:
+        codes = [(0b110, 3), (0b1, 1), (0b0, 2), (0b1011011, 7)] * 200
+        single_stream = BytesIO()
+        batch_stream = BytesIO()
+        single_writer = BitWriter(single_stream, buffer_size=16)
+        batch_writer = BitWriter(batch_stream, buffer_size=16)
+
+        for code, length in codes:
+            single_writer.write_code(code, length)
+        batch_writer.write_codes(codes)
+        single_writer.flush()
+        batch_writer.flush()
+
+        assert batch_stream.getvalue() == single_stream.getvalue()
+        assert len(batch_stream.getvalue()) == (13 * 200 + 7) // 8
+
+    @pytest.mark.parametrize(
+        "prefix, prefix_bits, expected_bytes",
+        [
+            (0, 0, bytes([0xAB, 0xCD])),
+            (0b101, 3, bytes([0b10110101, 0b01111001, 0b10100000])),
+            (0xFF, 8, bytes([0xFF, 0xAB, 0xCD])),
+        ],
+        ids=["aligned", "unaligned", "after_full_byte"],
+    )
+    def test_write_bytes(
+        self, prefix: int, prefix_bits: int, expected_bytes: bytes
+    ) -> None:
+        output_stream = BytesIO()
+        writer = BitWriter(output_stream)
+
+        writer.write_code(prefix, prefix_bits)
+        writer.write_bytes(b"\xab\xcd")
+        writer.flush()
+
+        assert output_stream.getvalue() == expected_bytes
+
+    def test_bit_position_counts_flushed_and_pending_bits(self) -> None:
+        writer = BitWriter(BytesIO(), buffer_size=4)
+
+        writer.write_codes([(0x1FFF, 13)] * 50)
+        writer.write_code(0b1, 1)
+
+        assert writer.bit_position == 13 * 50 + 1
+
+    def test_flush_without_bits_writes_nothing(self) -> None:
+        output_stream = BytesIO()
+
+        BitWriter(output_stream).flush()
+
+        assert output_stream.getvalue() == b""
+
+    def test_emit_complete_bytes_keeps_the_partial_byte(self) -> None:
+        output_stream = BytesIO()
+        writer = BitWriter(output_stream)
+
+        writer.write_code(0xABC, 12)
+        writer.emit_complete_bytes()
+        emitted = output_stream.getvalue()
+        writer.write_code(0xD, 4)
+        writer.flush()
+
+        assert emitted == b"\xab"
+        assert output_stream.getvalue() == b"\xab\xcd"
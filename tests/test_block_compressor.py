@@ -0,0 +1,227 @@
+import random
+from io import BytesIO
+
+import pytest
+
+from tdd_ai_py.compression.block_compressor import (
+    BlockCompressor,
+    stored_container_size,
+    write_stored_container,
+)
+from tdd_ai_py.compression.block_encoder import encode_block
+from tdd_ai_py.compression.block_format import (
+    BLOCK_END,
+    BLOCK_HUFFMAN,
+    BLOCK_HUFFMAN_SYNC,
+    BLOCK_MAGIC,
+    BLOCK_STORED,
+    INDEX_MAGIC,
+    BlockIndexEntry,
+    read_block_index,
+    write_block_index,
+)
+from tdd_ai_py.decompression.block_decoder import decode_block
+from tdd_ai_py.decompression.block_decompressor import BlockDecompressor, iter_blocks
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor
+
+_TEXT = b"she sells seashells on the seashore. " * 200 + bytes(range(256))
+_RANDOM = random.Random(24).randbytes(5000)
+
+
+def _compress(data: bytes, block_size: int, jobs: int = 1) -> bytes:
+    output_stream = BytesIO()
+    BlockCompressor(block_size=block_size, jobs=jobs).compress(
+        BytesIO(data), output_stream
+    )
+    return output_stream.getvalue()
+
+
+def _decompress(compressed: bytes, jobs: int = 1) -> bytes:
+    output_stream = BytesIO()
+    BlockDecompressor(jobs).decompress(BytesIO(compressed), output_stream)
+    return output_stream.getvalue()
+
+
+class TestBlockCompressor:
+    @pytest.mark.parametrize(
+        "data", [b"", b"a", b"abracadabra", _TEXT], ids=["empty", "one", "short", "text"]
+    )
+    @pytest.mark.parametrize("block_size", [1, 7, 1000, 1 << 20])
+    def test_round_trips(self, data: bytes, block_size: int) -> None:
+        assert _decompress(_compress(data, block_size)) == data
+
+    def test_splits_input_into_blocks(self) -> None:
+        compressed = _compress(_TEXT, block_size=1000)
+        stream = BytesIO(compressed)
+        stream.read(len(BLOCK_MAGIC))
+
+        lengths = [block.uncompressed_length for block in iter_blocks(stream)]
+
+        assert lengths == [1000] * (len(_TEXT) // 1000) + [len(_TEXT) % 1000]
+
+    def test_empty_input_is_magic_end_marker_and_empty_index(self) -> None:
+        compressed = _compress(b"", block_size=1000)
+
+        assert compressed == BLOCK_MAGIC + bytes([BLOCK_END, 0]) + (
+            (5).to_bytes(8, "big") + INDEX_MAGIC
+        )
+
+    def test_index_footer_locates_every_block(self) -> None:
+        compressed = _compress(_TEXT, block_size=1000)
+        stream = BytesIO(compressed)
+
+        index = read_block_index(stream, 0)
+
+        assert index is not None
+        assert [entry.uncompressed_length for entry in index] == [
+            block.uncompressed_length
+            for block in iter_blocks(BytesIO(compressed[len(BLOCK_MAGIC) :]))
+        ]
+        assert index[0] == BlockIndexEntry(len(BLOCK_MAGIC), index[0].frame_length, 1000)
+        assert index[1].offset == index[0].offset + index[0].frame_length
+
+    def test_parallel_output_matches_serial_output(self) -> None:
+        serial = _compress(_TEXT, block_size=512)
+
+        parallel = _compress(_TEXT, block_size=512, jobs=2)
+
+        assert parallel == serial
+
+    @pytest.mark.parametrize("option", ["block_size", "jobs"])
+    def test_rejects_non_positive_options(self, option: str) -> None:
+        with pytest.raises(ValueError, match=f"{option} must be positive"):
+            BlockCompressor(**{option: 0})
+
+
+class TestStoredBlocks:
+    @pytest.mark.parametrize("use_numpy", [False, True], ids=["python", "numpy"])
+    def test_stores_blocks_that_would_not_shrink(self, use_numpy: bool) -> None:
+        block = encode_block(_RANDOM, use_numpy=use_numpy, sync_interval=256)
+
+        assert block.block_type == BLOCK_STORED
+        assert block.payload == _RANDOM
+        assert decode_block(BLOCK_STORED, len(_RANDOM), block.payload) == _RANDOM
+
+    def test_encodes_blocks_that_shrink(self) -> None:
+        assert encode_block(_TEXT).block_type == BLOCK_HUFFMAN
+        assert encode_block(_TEXT, sync_interval=256).block_type == BLOCK_HUFFMAN_SYNC
+
+    def test_mixed_input_stores_only_incompressible_blocks(self) -> None:
+        compressed = _compress(_TEXT[:5000] + _RANDOM, block_size=5000)
+        stream = BytesIO(compressed)
+        stream.read(len(BLOCK_MAGIC))
+
+        types = [block.block_type for block in iter_blocks(stream)]
+
+        assert types == [BLOCK_HUFFMAN_SYNC, BLOCK_STORED]
+        assert _decompress(compressed, jobs=2) == _TEXT[:5000] + _RANDOM
+
+    def test_random_input_grows_by_framing_only(self) -> None:
+        compressed = _compress(_RANDOM, block_size=1000)
+
+        assert len(compressed) == stored_container_size(len(_RANDOM), 1000)
+        assert _decompress(compressed) == _RANDOM
+
+    @pytest.mark.parametrize("length", [0, 1, 999, 1000, 12345])
+    def test_stored_container_size_matches_written_size(self, length: int) -> None:
+        data = bytes(length)
+        output_stream = BytesIO()
+
+        write_stored_container(
+            [data[start : start + 1000] for start in range(0, length, 1000)],
+            output_stream,
+        )
+
+        assert len(output_stream.getvalue()) == stored_container_size(length, 1000)
+
+    def test_rejects_stored_payload_of_wrong_length(self) -> None:
+        with pytest.raises(ValueError, match="Stored block length"):
+            decode_block(BLOCK_STORED, 10, b"short")
+
+
+class TestBlockDecompressor:
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_decompresses_through_index(self, jobs: int) -> None:
+        assert _decompress(_compress(_TEXT, block_size=700), jobs) == _TEXT
+
+    def test_parallel_decompression_reads_containers_without_index(self) -> None:
+        compressed = _compress(_TEXT, block_size=700)
+        without_index = compressed[: compressed.rindex(bytes([BLOCK_END])) + 1]
+
+        assert _decompress(without_index, jobs=2) == _TEXT
+
+    def test_container_may_start_mid_stream(self) -> None:
+        stream = BytesIO(b"prefix" + _compress(_TEXT, block_size=700))
+        stream.read(len(b"prefix"))
+        output_stream = BytesIO()
+
+        BlockDecompressor(jobs=2).decompress(stream, output_stream)
+
+        assert output_stream.getvalue() == _TEXT
+
+    def test_rejects_index_that_disagrees_with_blocks(self) -> None:
+        compressed = _compress(_TEXT, block_size=700)
+        index = read_block_index(BytesIO(compressed), 0)
+        assert index is not None
+        index_offset = int.from_bytes(compressed[-12:-4], "big")
+        corrupt = BytesIO(compressed[:index_offset])
+        corrupt.seek(index_offset)
+        write_block_index(
+            corrupt, [index[0]._replace(uncompressed_length=1)], index_offset
+        )
+
+        with pytest.raises(ValueError, match="Block index does not match"):
+            _decompress(corrupt.getvalue(), jobs=2)
+
+    def test_rejects_stream_without_magic(self) -> None:
+        with pytest.raises(ValueError, match="Not a Huffman block container"):
+            _decompress(b"\x00\x00\x00\x01")
+
+    def test_huffman_decompressor_detects_containers(self) -> None:
+        output_stream = BytesIO()
+
+        HuffmanDecompressor().decompress(
+            BytesIO(_compress(_TEXT, block_size=1000)), output_stream
+        )
+
+        assert output_stream.getvalue() == _TEXT
+
+
+class TestDecompressRange:
+    @pytest.mark.parametrize("use_numpy", [False, True], ids=["python", "numpy"])
+    @pytest.mark.parametrize(
+        "start, length",
+        [(0, 700), (10, 5), (650, 100), (1000, 2500), (len(_TEXT) - 3, 10), (0, 0)],
+    )
+    def test_returns_the_slice(self, use_numpy: bool, start: int, length: int) -> None:
+        compressed = _compress(_TEXT, block_size=700)
+        decompressor = BlockDecompressor(use_numpy=use_numpy)
+
+        data = decompressor.decompress_range(BytesIO(compressed), start, length)
+
+        assert data == _TEXT[start : start + length]
+
+    def test_decodes_only_blocks_in_range(self) -> None:
+        compressed = bytearray(_compress(_TEXT, block_size=700))
+        index = read_block_index(BytesIO(compressed), 0)
+        assert index is not None
+        compressed[index[0].offset] = 0x7F  # an unknown block type
+
+        data = BlockDecompressor().decompress_range(BytesIO(compressed), 1500, 100)
+
+        assert data == _TEXT[1500:1600]
+        with pytest.raises(ValueError, match="Unknown block type"):
+            _decompress(bytes(compressed))
+
+    def test_reads_containers_without_index(self) -> None:
+        compressed = _compress(_TEXT + _RANDOM, block_size=700)
+        without_index = compressed[: compressed.rindex(bytes([BLOCK_END])) + 1]
+        start = len(_TEXT) - 100
+
+        data = BlockDecompressor().decompress_range(BytesIO(without_index), start, 400)
+
+        assert data == (_TEXT + _RANDOM)[start : start + 400]
+
+    def test_rejects_stream_without_magic(self) -> None:
+        with pytest.raises(ValueError, match="Not a Huffman block container"):
+            BlockDecompressor().decompress_range(BytesIO(b"\x00\x00\x00\x01"), 0, 1)
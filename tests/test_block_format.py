@@ -0,0 +1,83 @@
+from io import BytesIO
+
+import pytest
+
+from tdd_ai_py.compression.block_format import (
+    BLOCK_HUFFMAN,
+    EncodedBlock,
+    decode_sync_points,
+    decode_varint,
+    encode_sync_points,
+    encode_varint,
+    parse_block,
+    read_varint,
+    write_block,
+)
+from tdd_ai_py.decompression.block_decompressor import iter_blocks
+
+
+class TestVarint:
+    @pytest.mark.parametrize(
+        "value, encoded",
+        [(0, b"\x00"), (127, b"\x7f"), (128, b"\x80\x01"), (300, b"\xac\x02")],
+    )
+    def test_encodes_varint(self, value: int, encoded: bytes) -> None:
+        assert encode_varint(value) == encoded
+        assert read_varint(BytesIO(encoded)) == value
+
+    def test_round_trips_lengths_beyond_32_bits(self) -> None:
+        value = 5 << 40
+
+        assert read_varint(BytesIO(encode_varint(value))) == value
+
+    def test_truncated_varint_raises(self) -> None:
+        with pytest.raises(ValueError, match="Truncated varint"):
+            read_varint(BytesIO(b"\x80"))
+
+    def test_decodes_varint_from_buffer_position(self) -> None:
+        buffer = memoryview(b"\xff" + encode_varint(300) + b"\xff")
+
+        assert decode_varint(buffer, 1) == (300, 3)
+
+    def test_round_trips_sync_points_as_deltas(self) -> None:
+        encoded = encode_sync_points(256, [19, 600, 1300])
+
+        assert encoded == b"\x80\x02\x03\x13\xc5\x04\xbc\x05"
+        assert decode_sync_points(memoryview(encoded + b"bits")) == (
+            256,
+            [19, 600, 1300],
+            len(encoded),
+        )
+
+
+class TestBlockFraming:
+    def test_writes_and_reads_framed_block(self) -> None:
+        block = EncodedBlock(BLOCK_HUFFMAN, 1000, b"payload")
+        stream = BytesIO()
+
+        written = write_block(stream, block)
+        stream.write(b"\x00")  # end marker
+        stream.seek(0)
+
+        assert written == 1 + 2 + 1 + len(b"payload")
+        assert list(iter_blocks(stream)) == [block]
+
+    def test_missing_end_marker_raises(self) -> None:
+        stream = BytesIO()
+        write_block(stream, EncodedBlock(BLOCK_HUFFMAN, 3, b"abc"))
+        stream.seek(0)
+
+        with pytest.raises(ValueError, match="end marker"):
+            list(iter_blocks(stream))
+
+    def test_parses_block_from_buffer_without_copying(self) -> None:
+        stream = BytesIO()
+        write_block(stream, EncodedBlock(BLOCK_HUFFMAN, 3, b"abc"))
+        stream.write(b"\x00")
+        buffer = memoryview(stream.getvalue())
+
+        block, position = parse_block(buffer, 0)
+
+        assert block == EncodedBlock(BLOCK_HUFFMAN, 3, memoryview(b"abc"))
+        assert block is not None and isinstance(block.payload, memoryview)
+        assert parse_block(buffer, position) == (None, len(buffer))
@@ -0,0 +1,111 @@
+from io import BytesIO
+
+import pytest
+
+from tdd_ai_py.compression.canonical_codes import (
+    assign_canonical_codes,
+    compute_code_lengths,
+    encoded_bit_count,
+    package_merge_code_lengths,
+)
+from tdd_ai_py.compression.frequency_counter import create_frequency_map
+from tdd_ai_py.compression.huffman_encoder import generate_code_table
+from tdd_ai_py.compression.huffman_tree_builder import build_huffman_tree
+
+
+class TestComputeCodeLengths:
+    def test_abracadabra_lengths(self) -> None:
+        frequency_map = {ord("a"): 5, ord("b"): 2, ord("r"): 2, ord("c"): 1, ord("d"): 1}
+
+        lengths = compute_code_lengths(frequency_map)
+
+        assert lengths[ord("a")] == 1
+        assert sum(frequency_map[s] * lengths[s] for s in frequency_map) == 23
+
+    def test_single_symbol_gets_one_bit(self) -> None:
+        assert compute_code_lengths({ord("a"): 7}) == {ord("a"): 1}
+
+    def test_empty_frequency_map(self) -> None:
+        assert not compute_code_lengths({})
+
+    def test_total_cost_matches_tree_builder(self) -> None:
+        frequency_map = create_frequency_map(
+            BytesIO(b"she sells seashells on the seashore, " * 3 + bytes(range(40)))
+        )
+        tree_codes = generate_code_table(build_huffman_tree(frequency_map))
+
+        lengths = compute_code_lengths(frequency_map)
+
+        tree_cost = sum(frequency_map[s] * tree_codes[s][1] for s in frequency_map)
+        assert sum(frequency_map[s] * lengths[s] for s in frequency_map) == tree_cost
+
+
+def _fibonacci_frequencies(count: int) -> dict[int, int]:
+    weights = [1, 1]
+    while len(weights) < count:
+        weights.append(weights[-1] + weights[-2])
+    return dict(enumerate(weights))
+
+
+class TestLengthLimitedCodeLengths:
+    @pytest.mark.parametrize("max_code_length", [6, 8, 12, 15])
+    def test_caps_code_lengths(self, max_code_length: int) -> None:
+        frequency_map = _fibonacci_frequencies(30)
+
+        lengths = compute_code_lengths(frequency_map, max_code_length)
+
+        assert max(lengths.values()) == max_code_length
+        assign_canonical_codes(lengths)  # still a complete prefix code
+
+    def test_cost_never_beats_unlimited_huffman(self) -> None:
+        frequency_map = _fibonacci_frequencies(30)
+        unlimited = compute_code_lengths(frequency_map)
+
+        limited = compute_code_lengths(frequency_map, 12)
+
+        assert max(unlimited.values()) == 29
+        limited_bits = encoded_bit_count(frequency_map, limited)
+        unlimited_bits = encoded_bit_count(frequency_map, unlimited)
+        assert unlimited_bits < limited_bits < unlimited_bits * 1.001
+
+    def test_loose_cap_keeps_huffman_lengths(self) -> None:
+        frequency_map = {ord("a"): 5, ord("b"): 2, ord("r"): 2, ord("c"): 1, ord("d"): 1}
+
+        assert compute_code_lengths(frequency_map, 15) == compute_code_lengths(
+            frequency_map
+        )
+
+    def test_package_merge_matches_huffman_when_cap_is_not_binding(self) -> None:
+        frequency_map = {ord("a"): 5, ord("b"): 2, ord("r"): 2, ord("c"): 1, ord("d"): 1}
+
+        lengths = package_merge_code_lengths(frequency_map, 8)
+
+        assert encoded_bit_count(frequency_map, lengths) == 23
+
+    def test_uniform_alphabet_at_exact_cap(self) -> None:
+        lengths = package_merge_code_lengths(dict.fromkeys(range(256), 1), 8)
+
+        assert set(lengths.values()) == {8}
+
+    def test_rejects_cap_too_small_for_alphabet(self) -> None:
+        with pytest.raises(ValueError, match="cannot encode 5 symbols"):
+            package_merge_code_lengths(dict.fromkeys(range(5), 1), 2)
+
+
+class TestAssignCanonicalCodes:
+    def test_assigns_codes_in_length_then_symbol_order(self) -> None:
+        lengths = {ord("a"): 1, ord("b"): 3, ord("r"): 3, ord("c"): 3, ord("d"): 3}
+
+        codes = assign_canonical_codes(lengths)
+
+        assert codes == {
+            ord("a"): (0b0, 1),
+            ord("b"): (0b100, 3),
+            ord("c"): (0b101, 3),
+            ord("d"): (0b110, 3),
+            ord("r"): (0b111, 3),
+        }
+
+    def test_rejects_oversubscribed_lengths(self) -> None:
+        with pytest.raises(ValueError, match="valid prefix code"):
+            assign_canonical_codes({1: 1, 2: 1, 3: 1})
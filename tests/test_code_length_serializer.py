@@ -0,0 +1,81 @@
+from io import BytesIO
+from typing import Dict
+
+import pytest
+
+from tdd_ai_py.compression.bit_writer import BitWriter
+from tdd_ai_py.compression.code_length_serializer import (
+    serialize_code_lengths,
+    serialized_code_lengths_bits,
+)
+from tdd_ai_py.decompression.bit_reader import BitReader
+from tdd_ai_py.decompression.code_length_deserializer import deserialize_code_lengths
+
+
+def _serialize(code_lengths: Dict[int, int]) -> bytes:
+    output_stream = BytesIO()
+    bit_writer = BitWriter(output_stream)
+    serialize_code_lengths(code_lengths, bit_writer)
+    bit_writer.flush()
+    return output_stream.getvalue()
+
+
+class TestCodeLengthSerializer:
+    @pytest.mark.parametrize(
+        "code_lengths",
+        [
+            {},
+            {ord("a"): 1},
+            {ord("a"): 1, ord("b"): 3, ord("r"): 3, ord("c"): 3, ord("d"): 3},
+            {0: 2, 255: 2, 128: 2, 1: 2},
+            {symbol: 8 for symbol in range(256)},
+        ],
+        ids=["empty", "single_symbol", "abracadabra", "sparse_extremes", "full_alphabet"],
+    )
+    def test_round_trips_code_lengths(self, code_lengths: Dict[int, int]) -> None:
+        data = _serialize(code_lengths)
+
+        assert deserialize_code_lengths(BitReader(BytesIO(data))) == code_lengths
+
+    @pytest.mark.parametrize(
+        "code_lengths",
+        [{}, {ord("a"): 1}, {0: 2, 255: 2, 128: 2, 1: 2}, {7: 1, 9: 3, 10: 3, 200: 2}],
+    )
+    def test_predicts_header_size(self, code_lengths: Dict[int, int]) -> None:
+        output_stream = BytesIO()
+        bit_writer = BitWriter(output_stream)
+
+        serialize_code_lengths(code_lengths, bit_writer)
+
+        assert serialized_code_lengths_bits(code_lengths) == bit_writer.bit_position
+
+    def test_round_trips_sixteen_bit_alphabet(self) -> None:
+        code_lengths = {0: 2, 0x6162: 2, 0xFFFE: 2, 0xFFFF: 2}
+        output_stream = BytesIO()
+        bit_writer = BitWriter(output_stream)
+
+        serialize_code_lengths(code_lengths, bit_writer, symbol_bits=16)
+        header_bits = bit_writer.bit_position
+        bit_writer.flush()
+
+        bit_reader = BitReader(BytesIO(output_stream.getvalue()))
+        assert deserialize_code_lengths(bit_reader, symbol_bits=16) == code_lengths
+        assert serialized_code_lengths_bits(code_lengths, 16) == header_bits
+
+    def test_header_is_smaller_than_preorder_tree(self) -> None:
+        # Preorder tree for a full byte alphabet: 256 * 9 + 255 bits = 320 bytes
+        data = _serialize({symbol: 8 for symbol in range(256)})
+
+        assert len(data) < 320
+
+    def test_rejects_symbols_outside_byte_alphabet(self) -> None:
+        output_stream = BytesIO()
+        bit_writer = BitWriter(output_stream)
+        bit_writer.write_code(2, 9)  # two symbols
+        bit_writer.write_code(0, 5)  # zero-width lengths
+        bit_writer.write_code(256, 17)  # gamma(256): symbol 255
+        bit_writer.write_code(1, 1)  # gamma(1): symbol 256
+        bit_writer.flush()
+
+        with pytest.raises(ValueError, match="Corrupt code length header"):
+            deserialize_code_lengths(BitReader(BytesIO(output_stream.getvalue())))
@@ -0,0 +1,224 @@
+from io import BytesIO
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from tdd_ai_py import compress
+from tdd_ai_py.compress import compress_file, compress_stream, parse_args
+from tdd_ai_py.compression.block_compressor import BlockCompressor
+from tdd_ai_py.compression.block_format import BLOCK_MAGIC
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.frequency_counter import count_byte_frequencies
+from tdd_ai_py.compression.stream_utils import map_file, mapped_view
+from tdd_ai_py.decompress import decompress_file
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor
+
+_TEXT = b"Hello, World! This is a test. " * 500
+
+
+class _PipeStream(BytesIO):
+    """Non-seekable stream that records the largest single read."""
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.largest_read = 0
+
+    def seekable(self) -> bool:
+        return False
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            raise AssertionError("stream was read to the end in one call")
+        self.largest_read = max(self.largest_read, size)
+        return super().read(size)
+
+
+def _decompress(compressed: bytes) -> bytes:
+    output_stream = BytesIO()
+    HuffmanDecompressor().decompress(BytesIO(compressed), output_stream)
+    return output_stream.getvalue()
+
+
+class TestCompressStream:
+    def test_seekable_input_uses_single_table_format(self) -> None:
+        output_stream = BytesIO()
+
+        compress_stream(BytesIO(_TEXT), output_stream)
+
+        assert output_stream.getvalue()[:4] == len(_TEXT).to_bytes(4, "big")
+        assert _decompress(output_stream.getvalue()) == _TEXT
+
+    def test_non_seekable_input_is_streamed_in_windows(self) -> None:
+        input_stream = _PipeStream(_TEXT)
+        output_stream = BytesIO()
+
+        compress_stream(input_stream, output_stream, block_size=1024)
+
+        assert input_stream.largest_read == 1024
+        assert output_stream.getvalue().startswith(BLOCK_MAGIC)
+        assert _decompress(output_stream.getvalue()) == _TEXT
+
+    def test_block_size_selects_block_container(self) -> None:
+        output_stream = BytesIO()
+        expected = BytesIO()
+        BlockCompressor(block_size=1024).compress(BytesIO(_TEXT), expected)
+
+        compress_stream(BytesIO(_TEXT), output_stream, block_size=1024)
+
+        assert output_stream.getvalue() == expected.getvalue()
+
+    def test_samples_seekable_input(self) -> None:
+        output_stream = BytesIO()
+        sampled = BytesIO()
+        HuffmanCompressor(sample_chunks=4).compress(BytesIO(_TEXT), sampled)
+
+        compress_stream(BytesIO(_TEXT), output_stream, sample_chunks=4)
+
+        assert output_stream.getvalue() == sampled.getvalue()
+
+    def test_rejects_sampling_non_seekable_input(self) -> None:
+        with pytest.raises(ValueError, match="sample_chunks needs a seekable input"):
+            compress_stream(_PipeStream(_TEXT), BytesIO(), sample_chunks=4)
+
+    def test_rejects_unknown_mode(self) -> None:
+        with pytest.raises(ValueError, match="Unknown mode 'lz77'"):
+            compress_stream(BytesIO(_TEXT), BytesIO(), mode="lz77")
+
+    def test_huffman_compressor_rejects_non_seekable_input(self) -> None:
+        with pytest.raises(ValueError, match="seekable"):
+            HuffmanCompressor().compress(_PipeStream(_TEXT), BytesIO())
+
+
+class TestCompressBuffer:
+    def test_matches_stream_compression(self) -> None:
+        from_stream = BytesIO()
+        from_buffer = BytesIO()
+
+        HuffmanCompressor().compress(BytesIO(_TEXT), from_stream)
+        HuffmanCompressor().compress_buffer(memoryview(_TEXT), from_buffer)
+
+        assert from_buffer.getvalue() == from_stream.getvalue()
+
+    @pytest.mark.parametrize("jobs", [1, 2], ids=["serial", "parallel"])
+    def test_block_container_matches_stream_compression(self, jobs: int) -> None:
+        from_stream = BytesIO()
+        from_buffer = BytesIO()
+
+        BlockCompressor(block_size=1024, jobs=jobs).compress(BytesIO(_TEXT), from_stream)
+        BlockCompressor(block_size=1024, jobs=jobs).compress_buffer(
+            memoryview(_TEXT), from_buffer
+        )
+
+        assert from_buffer.getvalue() == from_stream.getvalue()
+
+    @pytest.mark.parametrize("jobs", [1, 2], ids=["serial", "parallel"])
+    def test_decompresses_from_buffer(self, jobs: int) -> None:
+        single_table = BytesIO()
+        container = BytesIO()
+        HuffmanCompressor().compress(BytesIO(_TEXT), single_table)
+        BlockCompressor(block_size=1024).compress(BytesIO(_TEXT), container)
+
+        for compressed in (single_table.getvalue(), container.getvalue()):
+            output_stream = BytesIO()
+            HuffmanDecompressor(jobs=jobs).decompress_buffer(
+                memoryview(compressed), output_stream
+            )
+            assert output_stream.getvalue() == _TEXT
+
+    def test_rejects_inputs_beyond_length_header(self) -> None:
+        frequency_map = count_byte_frequencies(b"ab")
+        frequency_map[ord("a")] = 2**32
+
+        with pytest.raises(ValueError, match="4 GiB"):
+            HuffmanCompressor()._write_header(frequency_map, BytesIO())
+
+
+class TestMappedFiles:
+    def test_map_file_maps_regular_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "input.txt"
+        path.write_bytes(_TEXT)
+
+        with open(path, "rb") as input_file:
+            mapped = map_file(input_file)
+            assert mapped is not None
+            with mapped:
+                assert mapped[:] == _TEXT
+
+    def test_map_file_skips_unmappable_inputs(self, tmp_path: Path) -> None:
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+
+        assert map_file(BytesIO(_TEXT)) is None
+        with open(path, "rb") as input_file:
+            assert map_file(input_file) is None
+
+    def test_mapped_view_closes_map_after_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "input.txt"
+        path.write_bytes(_TEXT)
+
+        def fail(view: memoryview) -> None:
+            head = view[:10]
+            raise ValueError(f"bad {len(head)}")
+
+        with open(path, "rb") as input_file:
+            mapped = map_file(input_file)
+            assert mapped is not None
+            with pytest.raises(ValueError, match="bad 10"):
+                with mapped_view(mapped) as view:
+                    fail(view)
+        assert mapped.closed
+
+    @pytest.mark.parametrize("jobs", [None, 2], ids=["single_table", "blocks"])
+    def test_file_round_trip(self, tmp_path: Path, jobs: int | None) -> None:
+        source = tmp_path / "input.txt"
+        compressed = tmp_path / "input.txt.huf"
+        source.write_bytes(_TEXT)
+
+        with open(compressed, "wb") as output_stream:
+            compress_file(str(source), output_stream, jobs=jobs, block_size=1024)
+        restored = BytesIO()
+        decompress_file(str(compressed), restored, jobs=jobs or 1)
+
+        assert restored.getvalue() == _TEXT
+
+    def test_block_size_selects_block_container(self, tmp_path: Path) -> None:
+        source = tmp_path / "input.txt"
+        source.write_bytes(_TEXT)
+        output_stream = BytesIO()
+        expected = BytesIO()
+        BlockCompressor(block_size=1024).compress(BytesIO(_TEXT), expected)
+
+        compress_file(str(source), output_stream, block_size=1024)
+
+        assert output_stream.getvalue() == expected.getvalue()
+
+    def test_oversized_files_use_block_container(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(compress, "MAX_INPUT_LENGTH", len(_TEXT) - 1)
+        source = tmp_path / "input.txt"
+        source.write_bytes(_TEXT)
+        output_stream = BytesIO()
+
+        compress_file(str(source), output_stream)
+
+        assert output_stream.getvalue().startswith(BLOCK_MAGIC)
+        assert _decompress(output_stream.getvalue()) == _TEXT
+
+
+class TestParseArgs:
+    def test_block_size_defaults_to_unset(self) -> None:
+        assert parse_args(["input.txt"]).block_size is None
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            ["--block-size", "1024", "--sample-chunks", "4"],
+            ["--jobs", "2", "--sample-chunks", "4"],
+            ["--block-size", "1024", "--context"],
+        ],
+    )
+    def test_rejects_options_that_would_be_ignored(self, options: List[str]) -> None:
+        with pytest.raises(SystemExit):
+            parse_args([*options, "input.txt"])
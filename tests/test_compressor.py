@@ -1,8 +1,19 @@
 """Tests for the Huffman compressor."""
 
+import random
 from io import BytesIO
 
-from tdd_ai_py.compression.compressor import HuffmanCompressor
+import pytest
+
+from tdd_ai_py.compression import compressor
+from tdd_ai_py.compression.block_compressor import stored_container_size
+from tdd_ai_py.compression.block_format import BLOCK_MAGIC
+from tdd_ai_py.compression.compressor import HuffmanCompressor, compress_bytes
+from tdd_ai_py.compression.stage_metrics import MetricsCollector
+from tdd_ai_py.decompression.decompressor import decompress_bytes
+
+# Magic, block framing, end marker and index of a one-block stored container
+_STORED_HEADER_BOUND = 32
 
 
 class TestHuffmanCompressor:
@@ -29,3 +40,99 @@ class TestHuffmanCompressor:
             [0xB0, 0x80]
         )  # "1011000010000000" = 0xB080
         assert result == expected
+
+    def test_canonical_header_holds_code_lengths_only(self) -> None:
+        output_stream = BytesIO()
+
+        HuffmanCompressor(canonical=True).compress(BytesIO(b"a"), output_stream)
+
+        # Length 1, then: count=1 (000000001), width=0 (00000),
+        # gamma(98) for 'a' (000000 1100010), no length bits, data "0"
+        bits = "000000001" + "00000" + "0000001100010" + "0"
+        bits += "0" * (-len(bits) % 8)
+        expected_data = int(bits, 2).to_bytes(len(bits) // 8, "big")
+        assert output_stream.getvalue() == bytes([0, 0, 0, 1]) + expected_data
+
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_stores_incompressible_input_in_a_block_container(
+        self, canonical: bool
+    ) -> None:
+        data = random.Random(24).randbytes(20_000)
+        output_stream = BytesIO()
+        collector = MetricsCollector()
+
+        HuffmanCompressor(canonical=canonical, metrics=collector).compress(
+            BytesIO(data), output_stream
+        )
+
+        compressed = output_stream.getvalue()
+        assert compressed.startswith(BLOCK_MAGIC)
+        assert len(compressed) == stored_container_size(len(data))
+        code_stage = "code_lengths" if canonical else "build_tree"
+        assert [m.stage for m in collector.stages] == [
+            "count_frequencies",
+            code_stage,
+            "store",
+        ]
+        assert compress_bytes(data, canonical) == compressed
+        assert decompress_bytes(compressed) == data
+
+    @pytest.mark.parametrize("length", [300, 5000, 70_000])
+    def test_stored_output_is_bounded_by_input_length(self, length: int) -> None:
+        data = random.Random(length).randbytes(length)
+
+        compressed = compress_bytes(data)
+
+        assert compressed.startswith(BLOCK_MAGIC)
+        assert len(compressed) <= length + _STORED_HEADER_BOUND
+        assert decompress_bytes(compressed) == data
+
+    @pytest.mark.parametrize("buffer", [False, True], ids=["stream", "buffer"])
+    def test_length_matching_a_magic_uses_block_container(
+        self, monkeypatch: pytest.MonkeyPatch, buffer: bool
+    ) -> None:
+        data = b"abracadabra!"
+        monkeypatch.setattr(
+            compressor, "CONTAINER_MAGICS", (len(data).to_bytes(4, "big"),)
+        )
+        output_stream = BytesIO()
+
+        if buffer:
+            HuffmanCompressor().compress_buffer(data, output_stream)
+        else:
+            HuffmanCompressor().compress(BytesIO(data), output_stream)
+
+        assert output_stream.getvalue().startswith(BLOCK_MAGIC)
+        assert decompress_bytes(output_stream.getvalue()) == data
+
+    def test_max_code_length_requires_canonical_mode(self) -> None:
+        with pytest.raises(ValueError, match="requires canonical=True"):
+            HuffmanCompressor(max_code_length=12)
+
+
+class TestCompressBytes:
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_matches_stream_compression(self, canonical: bool) -> None:
+        data = b"she sells seashells on the seashore" * 20
+        output_stream = BytesIO()
+        HuffmanCompressor(canonical=canonical).compress(BytesIO(data), output_stream)
+
+        assert compress_bytes(data, canonical) == output_stream.getvalue()
+        assert decompress_bytes(compress_bytes(data, canonical), canonical) == data
+
+    def test_oversized_input_uses_block_container(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(compressor, "MAX_INPUT_LENGTH", 10)
+        data = b"abracadabra!"
+
+        compressed = compress_bytes(bytearray(data))
+
+        assert compressed.startswith(BLOCK_MAGIC)
+        assert decompress_bytes(compressed) == data
+
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_round_trips_empty_input(self, canonical: bool) -> None:
+        compressed = compress_bytes(b"", canonical)
+
+        assert decompress_bytes(compressed, canonical) == b""
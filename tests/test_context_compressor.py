@@ -0,0 +1,165 @@
+import random
+from io import BytesIO
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from tdd_ai_py.compress import compress_file, compress_stream, parse_args
+from tdd_ai_py.compression.bit_writer import BitWriter
+from tdd_ai_py.compression.block_format import DEFAULT_MAX_CODE_LENGTH
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.context_compressor import ContextCompressor
+from tdd_ai_py.compression.context_model import (
+    CONTEXT_MAGIC,
+    SHARED_TABLE,
+    ContextModel,
+    build_context_model,
+    serialize_context_model,
+)
+from tdd_ai_py.compression.frequency_counter import count_context_frequencies
+from tdd_ai_py.compression.stage_metrics import MetricsCollector
+from tdd_ai_py.decompression.bit_reader import BitReader
+from tdd_ai_py.decompression.context_decoder import deserialize_context_model
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor, decompress_bytes
+
+_RANDOM = random.Random(21)
+_INPUTS = {
+    "empty": b"",
+    "single_byte": b"q" * 300,
+    "two_bytes": b"ab",
+    "all_bytes": bytes(range(256)) * 2,
+    "text": b"Each byte is coded with the table of the byte before it. " * 90,
+    "random": bytes(_RANDOM.randrange(256) for _ in range(3000)),
+}
+
+
+def _compress(data: bytes, use_numpy: bool = False) -> bytes:
+    output_stream = BytesIO()
+    ContextCompressor(use_numpy=use_numpy).compress(BytesIO(data), output_stream)
+    return output_stream.getvalue()
+
+
+def _model(data: bytes) -> ContextModel:
+    return build_context_model(count_context_frequencies([data]), DEFAULT_MAX_CODE_LENGTH)
+
+
+class TestContextModel:
+    def test_frequent_contexts_get_their_own_table(self) -> None:
+        model = _model(_INPUTS["text"])
+
+        assert model.table_of_context[ord("t")] != SHARED_TABLE
+        assert model.table_of_context[ord("q")] == SHARED_TABLE
+        assert len(model.tables) > 1
+
+    def test_rare_contexts_share_one_table(self) -> None:
+        model = _model(_INPUTS["random"])
+
+        assert set(model.table_of_context) == {SHARED_TABLE}
+        assert len(model.tables[SHARED_TABLE]) == 256
+
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_header_round_trips(self, data: bytes) -> None:
+        model = _model(data)
+        output_stream = BytesIO()
+        bit_writer = BitWriter(output_stream)
+
+        serialize_context_model(model, bit_writer)
+        bit_writer.flush()
+
+        bit_reader = BitReader(BytesIO(output_stream.getvalue()))
+        assert deserialize_context_model(bit_reader) == model
+
+
+class TestContextCompressor:
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_round_trips_through_huffman_decompressor(self, data: bytes) -> None:
+        compressed = _compress(data)
+        output_stream = BytesIO()
+
+        HuffmanDecompressor().decompress(BytesIO(compressed), output_stream)
+
+        assert compressed.startswith(CONTEXT_MAGIC)
+        assert output_stream.getvalue() == data
+        assert decompress_bytes(compressed) == data
+
+    def test_buffer_matches_stream_compression(self) -> None:
+        data = _INPUTS["text"]
+        from_buffer = BytesIO()
+
+        ContextCompressor(use_numpy=False).compress_buffer(memoryview(data), from_buffer)
+
+        assert from_buffer.getvalue() == _compress(data)
+
+    def test_beats_single_table_on_text(self) -> None:
+        single_table = BytesIO()
+        HuffmanCompressor().compress(BytesIO(_INPUTS["text"]), single_table)
+
+        assert len(_compress(_INPUTS["text"])) < len(single_table.getvalue()) * 0.6
+
+    def test_decodes_in_small_chunks(self) -> None:
+        compressed = _compress(_INPUTS["text"])
+
+        chunks = list(HuffmanDecompressor().iter_decompress_buffer(compressed, 100))
+
+        assert b"".join(chunks) == _INPUTS["text"]
+        assert max(len(chunk) for chunk in chunks) == 100
+
+    def test_reports_stages(self) -> None:
+        collector = MetricsCollector()
+        ContextCompressor(metrics=collector).compress_buffer(_INPUTS["text"], BytesIO())
+
+        assert [metrics.stage for metrics in collector.stages] == [
+            "count_frequencies",
+            "code_lengths",
+            "write_header",
+            "assign_codes",
+            "encode",
+            "flush",
+        ]
+
+    def test_rejects_truncated_stream(self) -> None:
+        compressed = _compress(_INPUTS["text"])
+
+        with pytest.raises(ValueError, match="Truncated"):
+            decompress_bytes(compressed[:-20])
+
+    def test_rejects_non_seekable_input(self) -> None:
+        class _PipeStream(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        with pytest.raises(ValueError, match="seekable"):
+            ContextCompressor().compress(_PipeStream(b"abc"), BytesIO())
+
+    @pytest.mark.parametrize("max_code_length", [0, 33])
+    def test_rejects_unsupported_code_length_cap(self, max_code_length: int) -> None:
+        with pytest.raises(ValueError, match="max_code_length"):
+            ContextCompressor(max_code_length=max_code_length)
+
+    def test_cli_file_round_trip(self, tmp_path: Path) -> None:
+        input_path = tmp_path / "input.txt"
+        input_path.write_bytes(_INPUTS["text"])
+        output_stream = BytesIO()
+
+        compress_file(str(input_path), output_stream, mode="context")
+
+        assert output_stream.getvalue() == _compress(_INPUTS["text"])
+
+    def test_cli_spools_non_seekable_input(self) -> None:
+        class _PipeStream(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        output_stream = BytesIO()
+
+        compress_stream(_PipeStream(_INPUTS["text"]), output_stream, mode="context")
+
+        assert output_stream.getvalue() == _compress(_INPUTS["text"])
+
+    @pytest.mark.parametrize(
+        "option", [["--jobs", "2"], ["--sample-chunks", "4"], ["--adaptive"]]
+    )
+    def test_cli_rejects_context_with_other_modes(self, option: List[str]) -> None:
+        with pytest.raises(SystemExit):
+            parse_args(["--context", *option, "input.txt"])
@@ -3,9 +3,9 @@ from typing import Callable
 
 import pytest
 
-from tdd_ai_py.compression.huffman_tree_builder import HuffmanNode
+from tdd_ai_py.compression.huffman_tree_builder import HuffmanNode, flatten_tree
 from tdd_ai_py.decompression.bit_reader import BitReader
-from tdd_ai_py.decompression.data_decoder import decode_data
+from tdd_ai_py.decompression.data_decoder import decode_characters, decode_data
 
 from .test_helpers import bits_and_bytes
 
@@ -60,3 +60,26 @@ class TestDataDecoder:
         decode_data(tree, bit_reader, length, output_stream)
         result = output_stream.getvalue()
         assert result == expected
+
+    @pytest.mark.parametrize("flat", [False, True], ids=["nodes", "flat"])
+    def test_reference_walker_accepts_either_tree(self, flat: bool) -> None:
+        tree = _create_three_character_tree()
+        _, data_bytes = bits_and_bytes("101110110010")
+        bit_reader = BitReader(BytesIO(data_bytes))
+
+        decoded = decode_characters(flatten_tree(tree) if flat else tree, bit_reader)
+
+        assert bytes(symbol for symbol, _ in zip(decoded, range(7))) == b"bcbcaab"
+
+    def test_decodes_with_flat_tree(self) -> None:
+        _, data_bytes = bits_and_bytes("01100011")
+        output_stream = BytesIO()
+
+        decode_data(
+            flatten_tree(_create_two_character_tree()),
+            BitReader(BytesIO(data_bytes)),
+            8,
+            output_stream,
+        )
+
+        assert output_stream.getvalue() == b"abbaaabb"
@@ -0,0 +1,60 @@
+from io import BytesIO
+
+import pytest
+
+from tdd_ai_py.decompression.bit_reader import BitReader
+from tdd_ai_py.decompression.decode_table import build_decode_table, decode_symbols
+
+from .test_helpers import bits_and_bytes
+
+# a=0, b=10, c=110, d=111
+_CODES = {
+    ord("a"): (0b0, 1),
+    ord("b"): (0b10, 2),
+    ord("c"): (0b110, 3),
+    ord("d"): (0b111, 3),
+}
+
+
+def _reader(bit_string: str) -> BitReader:
+    _, data = bits_and_bytes(bit_string)
+    return BitReader(BytesIO(data))
+
+
+class TestDecodeTable:
+    def test_table_bits_are_capped_at_longest_code(self) -> None:
+        table = build_decode_table(_CODES, table_bits=11)
+
+        assert table.table_bits == 3
+        assert len(table.entries) == 8
+        assert not table.long_codes
+
+    def test_codes_longer_than_table_go_to_fallback(self) -> None:
+        table = build_decode_table(_CODES, table_bits=2)
+
+        assert set(table.long_codes.values()) == {ord("c"), ord("d")}
+
+    @pytest.mark.parametrize("table_bits", [1, 2, 3, 11], ids=lambda bits: f"{bits}bit")
+    def test_decodes_symbols(self, table_bits: int) -> None:
+        table = build_decode_table(_CODES, table_bits)
+        bit_reader = _reader("0" + "10" + "110" + "111" + "0" + "10")
+
+        result = decode_symbols(table, bit_reader, 6)
+
+        assert result == b"abcdab"
+
+    def test_stops_when_bits_run_out(self) -> None:
+        table = build_decode_table(_CODES)
+        # 8 bits: "0 10 111 0 1" -> the dangling "1" starts a code that never ends
+        bit_reader = _reader("01011101")
+
+        result = decode_symbols(table, bit_reader, 10)
+
+        assert result == b"abda"
+
+    def test_rejects_bits_that_match_no_code(self) -> None:
+        table = build_decode_table({ord("a"): (0b0, 1), ord("b"): (0b10, 2)}, 1)
+        bit_reader = _reader("11")
+
+        with pytest.raises(ValueError, match="Invalid Huffman code"):
+            decode_symbols(table, bit_reader, 1)
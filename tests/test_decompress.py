@@ -0,0 +1,50 @@
+from io import BytesIO, TextIOWrapper
+from pathlib import Path
+
+import pytest
+
+from tdd_ai_py.compression.block_compressor import BlockCompressor
+from tdd_ai_py.compression.block_format import BLOCK_MAGIC
+from tdd_ai_py.decompress import main
+
+_TEXT = b"Hello, World! This is a test. " * 500
+
+
+def _container() -> bytes:
+    output_stream = BytesIO()
+    BlockCompressor(block_size=1024).compress(BytesIO(_TEXT), output_stream)
+    return output_stream.getvalue()
+
+
+class TestMain:
+    def test_corrupt_mapped_file_exits_with_error(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        corrupt = bytearray(_container())
+        corrupt[len(BLOCK_MAGIC)] = 9
+        path = tmp_path / "corrupt.huf"
+        path.write_bytes(corrupt)
+        monkeypatch.setattr("sys.argv", ["huffman-decompress", str(path)])
+
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+
+        assert exit_info.value.code == 1
+        assert capsys.readouterr().err == "Error: Unknown block type 9\n"
+
+    def test_truncated_container_on_stdin_exits_with_error(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        container = _container()
+        truncated = container[: len(container) // 2]
+        monkeypatch.setattr("sys.stdin", TextIOWrapper(BytesIO(truncated)))
+        monkeypatch.setattr("sys.argv", ["huffman-decompress", "-"])
+
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+
+        assert exit_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error: Truncated")
@@ -1,7 +1,16 @@
 from io import BytesIO
 from typing import List
 
-from tdd_ai_py.decompression.decompressor import HuffmanDecompressor
+import pytest
+
+from tdd_ai_py.compression.block_compressor import BlockCompressor
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.decompression.decompressor import (
+    HuffmanDecompressor,
+    decompress_bytes,
+    decompress_range,
+    iter_decompress,
+)
 
 from .test_helpers import bits_and_bytes
 
@@ -67,3 +76,110 @@ class TestDecompressor:
 
         decoded_data = output_stream.getvalue()
         assert len(decoded_data) == length
+
+
+_TEXT = b"Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 100
+
+
+class _PipeStream(BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+
+def _compress(data: bytes, block_size: int | None = None) -> bytes:
+    output_stream = BytesIO()
+    if block_size is None:
+        HuffmanCompressor().compress(BytesIO(data), output_stream)
+    else:
+        BlockCompressor(block_size=block_size).compress(BytesIO(data), output_stream)
+    return output_stream.getvalue()
+
+
+class TestIterDecompress:
+    @pytest.mark.parametrize("block_size", [None, 1000], ids=["single_table", "blocks"])
+    def test_yields_bounded_chunks(self, block_size: int | None) -> None:
+        chunks = list(iter_decompress(BytesIO(_compress(_TEXT, block_size)), 256))
+
+        assert b"".join(chunks) == _TEXT
+        assert max(len(chunk) for chunk in chunks) == 256
+
+    def test_single_character_input_is_chunked(self) -> None:
+        chunks = list(iter_decompress(BytesIO(_compress(b"z" * 1000)), 300))
+
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+
+    @pytest.mark.parametrize("block_size", [None, 1000], ids=["single_table", "blocks"])
+    def test_reads_non_seekable_input(self, block_size: int | None) -> None:
+        output_stream = BytesIO()
+
+        HuffmanDecompressor().decompress(
+            _PipeStream(_compress(_TEXT, block_size)), output_stream
+        )
+
+        assert output_stream.getvalue() == _TEXT
+
+    def test_is_lazy(self) -> None:
+        chunks = iter_decompress(BytesIO(_compress(_TEXT)), 100)
+
+        assert next(chunks) == _TEXT[:100]
+
+    def test_rejects_missing_length_header(self) -> None:
+        with pytest.raises(ValueError, match="missing its length header"):
+            list(iter_decompress(BytesIO(b"\x00\x01")))
+
+    @pytest.mark.parametrize("block_size", [None, 1000], ids=["single_table", "blocks"])
+    @pytest.mark.parametrize("chunk_size", [0, -1])
+    def test_rejects_non_positive_chunk_size(
+        self, block_size: int | None, chunk_size: int
+    ) -> None:
+        compressed = _compress(_TEXT, block_size)
+        decompressor = HuffmanDecompressor()
+
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            iter_decompress(BytesIO(compressed), chunk_size)
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            decompressor.iter_decompress(BytesIO(compressed), chunk_size)
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            decompressor.iter_decompress_buffer(compressed, chunk_size)
+
+
+class TestDecompressBytes:
+    @pytest.mark.parametrize("block_size", [None, 1000], ids=["single_table", "blocks"])
+    def test_decompresses_either_format(self, block_size: int | None) -> None:
+        compressed = _compress(_TEXT, block_size)
+
+        assert decompress_bytes(compressed) == _TEXT
+        assert decompress_bytes(memoryview(compressed)) == _TEXT
+
+    def test_canonical_mode(self) -> None:
+        compressed = BytesIO()
+        HuffmanCompressor(canonical=True).compress(BytesIO(_TEXT), compressed)
+
+        assert decompress_bytes(compressed.getvalue(), canonical=True) == _TEXT
+
+
+class TestDecompressRange:
+    @pytest.mark.parametrize("block_size", [None, 1000], ids=["single_table", "blocks"])
+    @pytest.mark.parametrize(
+        "start, length", [(0, 10), (999, 2), (1234, 3000), (len(_TEXT) - 5, 100)]
+    )
+    def test_returns_the_slice(
+        self, block_size: int | None, start: int, length: int
+    ) -> None:
+        compressed = BytesIO(_compress(_TEXT, block_size))
+
+        data = decompress_range(compressed, start, length)
+
+        assert data == _TEXT[start : start + length]
+
+    @pytest.mark.parametrize("block_size", [None, 1000], ids=["single_table", "blocks"])
+    def test_reads_non_seekable_input(self, block_size: int | None) -> None:
+        compressed = _PipeStream(_compress(_TEXT, block_size))
+
+        data = HuffmanDecompressor().decompress_range(compressed, 5, 9)
+
+        assert data == _TEXT[5:14]
+
+    def test_rejects_negative_range(self) -> None:
+        with pytest.raises(ValueError, match="non-negative"):
+            decompress_range(BytesIO(_compress(_TEXT)), -1, 10)
@@ -0,0 +1,60 @@
+from io import BytesIO
+
+import pytest
+
+from tdd_ai_py.compression.dictionary_compressor import DictionaryCompressor
+from tdd_ai_py.compression.static_table import train_static_table
+from tdd_ai_py.decompression.dictionary_decompressor import DictionaryDecompressor
+
+_CORPUS = [b'{"user": "alice", "event": "click"}', b'{"user": "bob", "event": "view"}']
+_TABLE = train_static_table(_CORPUS, table_id=5)
+_OTHER_TABLE = train_static_table([bytes(range(256))], table_id=6)
+
+
+def _compress(data: bytes) -> bytes:
+    output_stream = BytesIO()
+    DictionaryCompressor(_TABLE).compress(BytesIO(data), output_stream)
+    return output_stream.getvalue()
+
+
+class TestDictionaryCompressor:
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"x", b'{"user": "carol", "event": "purchase"}', bytes(range(256)) * 3],
+        ids=["empty", "one", "message", "unseen_bytes"],
+    )
+    def test_round_trips(self, data: bytes) -> None:
+        decompressor = DictionaryDecompressor([_OTHER_TABLE, _TABLE])
+        from_stream = BytesIO()
+        from_buffer = BytesIO()
+
+        decompressor.decompress(BytesIO(_compress(data)), from_stream)
+        decompressor.decompress_buffer(memoryview(_compress(data)), from_buffer)
+
+        assert from_stream.getvalue() == from_buffer.getvalue() == data
+
+    def test_frame_holds_only_table_id_length_and_data(self) -> None:
+        data = b'{"user": "alice"}'
+        data_bits = sum(_TABLE.code_lengths[byte_value] for byte_value in data)
+
+        compressed = _compress(data)
+
+        assert compressed[:2] == bytes([5, len(data)])
+        assert len(compressed) == 2 + (data_bits + 7) // 8
+
+    def test_compresses_small_messages_below_their_size(self) -> None:
+        data = b'{"user": "bob", "event": "click"}'
+
+        assert len(_compress(data)) < len(data)
+
+    def test_rejects_unknown_table_id(self) -> None:
+        with pytest.raises(ValueError, match="Unknown static code table 5"):
+            DictionaryDecompressor([_OTHER_TABLE]).decompress_buffer(
+                _compress(b"abc"), BytesIO()
+            )
+
+    def test_rejects_truncated_frame(self) -> None:
+        compressed = _compress(b'{"user": "alice", "event": "click"}')
+
+        with pytest.raises(ValueError, match="Truncated dictionary frame"):
+            DictionaryDecompressor([_TABLE]).decompress_buffer(compressed[:-3], BytesIO())
@@ -1,7 +1,11 @@
 from io import BytesIO
 from typing import Dict
 
-from tdd_ai_py.compression.frequency_counter import create_frequency_map
+from tdd_ai_py.compression.frequency_counter import (
+    count_chunk_frequencies,
+    count_context_frequencies,
+    create_frequency_map,
+)
 
 
 class TestCreateFrequencyMap:
@@ -47,3 +51,23 @@ class TestCreateFrequencyMap:
         result = create_frequency_map(input_stream)
 
         assert result == expected_frequency_map
+
+    def test_counts_chunks_in_first_occurrence_order(self) -> None:
+        result = count_chunk_frequencies([b"hel", memoryview(b"lo"), b""])
+
+        assert list(result.items()) == [
+            (ord("h"), 1),
+            (ord("e"), 1),
+            (ord("l"), 2),
+            (ord("o"), 1),
+        ]
+
+    def test_counts_pairs_with_preceding_byte_across_chunks(self) -> None:
+        counts = count_context_frequencies([b"ab", memoryview(b"b"), b"", b"a"], 0)
+
+        assert {index: count for index, count in enumerate(counts) if count} == {
+            ord("a"): 1,
+            ord("a") << 8 | ord("b"): 1,
+            ord("b") << 8 | ord("b"): 1,
+            ord("b") << 8 | ord("a"): 1,
+        }
@@ -0,0 +1,110 @@
+from io import BytesIO
+
+import pytest
+
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.frequency_sampler import (
+    add_escape_counts,
+    sample_offsets,
+    slice_buffer_samples,
+)
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor
+
+_TEXT = b"Sampling builds the code from a few chunks. " * 400
+
+
+class _CountingStream(BytesIO):
+    """Seekable stream that records how many bytes were read in total."""
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _round_trip(data: bytes, compressor: HuffmanCompressor, canonical: bool) -> bytes:
+    compressed = BytesIO()
+    compressor.compress(BytesIO(data), compressed)
+    output_stream = BytesIO()
+    HuffmanDecompressor(canonical=canonical).decompress(
+        BytesIO(compressed.getvalue()), output_stream
+    )
+    return output_stream.getvalue()
+
+
+class TestSampleOffsets:
+    def test_spreads_chunks_from_start_to_end(self) -> None:
+        assert sample_offsets(1000, 3, 100) == [0, 450, 900]
+
+    def test_single_chunk_samples_the_start(self) -> None:
+        assert sample_offsets(1000, 1, 100) == [0]
+
+    def test_tiles_input_that_the_chunks_cover(self) -> None:
+        assert sample_offsets(250, 3, 100) == [0, 100, 200]
+        assert sample_offsets(0, 3, 100) == []
+
+    def test_buffer_samples_are_views(self) -> None:
+        samples = slice_buffer_samples(memoryview(b"abcdefgh"), [0, 6], 3)
+
+        assert [bytes(sample) for sample in samples] == [b"abc", b"gh"]
+        assert all(isinstance(sample, memoryview) for sample in samples)
+
+
+class TestAddEscapeCounts:
+    def test_unseen_bytes_get_escape_counts_after_seen_ones(self) -> None:
+        escaped = add_escape_counts({ord("b"): 5, ord("a"): 2})
+
+        assert len(escaped) == 256
+        assert list(escaped.items())[:3] == [(ord("b"), 5), (ord("a"), 2), (0, 1)]
+
+
+class TestSampledCompression:
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_round_trips_bytes_missing_from_sample(self, canonical: bool) -> None:
+        data = _TEXT + bytes(range(256)) + _TEXT
+        compressor = HuffmanCompressor(
+            canonical=canonical, sample_chunks=2, sample_chunk_size=64
+        )
+
+        assert _round_trip(data, compressor, canonical) == data
+
+    def test_reads_input_once_plus_sample(self) -> None:
+        input_stream = _CountingStream(_TEXT)
+
+        HuffmanCompressor(sample_chunks=4, sample_chunk_size=100).compress(
+            input_stream, BytesIO()
+        )
+
+        assert input_stream.bytes_read == len(_TEXT) + 4 * 100
+
+    def test_covering_sample_is_exact_and_read_once(self) -> None:
+        input_stream = _CountingStream(_TEXT)
+        sampled = BytesIO()
+        exact = BytesIO()
+
+        HuffmanCompressor(sample_chunks=8, sample_chunk_size=4096).compress(
+            input_stream, sampled
+        )
+        HuffmanCompressor().compress(BytesIO(_TEXT), exact)
+
+        assert input_stream.bytes_read == len(_TEXT)
+        assert sampled.getvalue() == exact.getvalue()
+
+    def test_buffer_matches_stream_compression(self) -> None:
+        compressor = HuffmanCompressor(sample_chunks=3, sample_chunk_size=500)
+        from_stream = BytesIO()
+        from_buffer = BytesIO()
+
+        compressor.compress(BytesIO(_TEXT), from_stream)
+        compressor.compress_buffer(memoryview(_TEXT), from_buffer)
+
+        assert from_buffer.getvalue() == from_stream.getvalue()
+
+    @pytest.mark.parametrize("option", ["sample_chunks", "sample_chunk_size"])
+    def test_rejects_non_positive_options(self, option: str) -> None:
+        with pytest.raises(ValueError, match=f"{option} must be positive"):
+            HuffmanCompressor(**{option: 0})
@@ -2,7 +2,10 @@ from io import BytesIO
 from typing import Dict, List
 
 from tdd_ai_py.compression.frequency_counter import create_frequency_map
-from tdd_ai_py.compression.huffman_encoder import generate_huffman_codes
+from tdd_ai_py.compression.huffman_encoder import (
+    generate_code_table,
+    generate_huffman_codes,
+)
 from tdd_ai_py.compression.huffman_tree_builder import HuffmanNode, build_huffman_tree
 
 
@@ -63,3 +66,22 @@ class TestHuffmanEncoder:
 
         _assert_codes_are_prefix_free(codes)
         _assert_optimal_code_lengths(codes, frequencies)
+
+    def test_code_table_matches_bit_list_codes(self) -> None:
+        frequencies = create_frequency_map(
+            BytesIO(b"she sells seashells on the seashore")
+        )
+        huffman_tree = build_huffman_tree(frequencies)
+
+        table = generate_code_table(huffman_tree)
+
+        expected = {
+            symbol: (int("".join(map(str, bits)), 2), len(bits))
+            for symbol, bits in generate_huffman_codes(huffman_tree).items()
+        }
+        assert table == expected
+
+    def test_code_table_for_single_root_node(self) -> None:
+        root_node = HuffmanNode(weight=1, character=ord("a"))
+
+        assert generate_code_table(root_node) == {ord("a"): (0, 1)}
@@ -3,13 +3,29 @@
 import pytest
 
 from tdd_ai_py.compression.huffman_tree_builder import (
+    FlatTree,
     HuffmanNode,
+    build_flat_tree,
     build_huffman_tree,
     create_internal_node,
     create_leaf_node,
     find_two_lowest_items,
+    flat_tree_to_nodes,
+    flatten_tree,
 )
 
+_FREQUENCIES = {ord("a"): 5, ord("b"): 2, ord("r"): 2, ord("c"): 1, ord("d"): 1}
+
+
+def _chain(depth: int) -> HuffmanNode:
+    """Degenerate tree ``depth`` levels deep."""
+    node = HuffmanNode(weight=1, character=0)
+    for level in range(1, depth + 1):
+        node = HuffmanNode(
+            weight=level, left=HuffmanNode(weight=1, character=level % 256), right=node
+        )
+    return node
+
 
 class TestHuffmanNode:
     """Test cases for the HuffmanNode data class."""
@@ -60,6 +76,13 @@ class TestHuffmanNode:
         assert node1 != node3
         assert node1 != "not a node"
 
+    def test_deep_tree_equality_does_not_recurse(self) -> None:
+        assert _chain(5000) == _chain(5000)
+        assert _chain(5000) != _chain(4999)
+
+    def test_nodes_have_no_instance_dict(self) -> None:
+        assert not hasattr(HuffmanNode(weight=1, character=0), "__dict__")
+
 
 class TestBuildHuffmanTree:
     """Test cases for the build_huffman_tree function."""
@@ -96,6 +119,38 @@ class TestBuildHuffmanTree:
         assert result.is_leaf
 
 
+class TestFlatTree:
+    def test_children_precede_parents_and_root_is_last(self) -> None:
+        tree = build_flat_tree(_FREQUENCIES)
+
+        assert tree.root == len(tree.symbol) - 1 == 2 * len(_FREQUENCIES) - 2
+        assert tree.weight[tree.root] == 11
+        for index, (left, right) in enumerate(zip(tree.left, tree.right)):
+            assert (left < 0) == (right < 0) == (tree.symbol[index] >= 0)
+            assert left < index and right < index
+
+    def test_nodes_match_linked_builder(self) -> None:
+        flat = build_flat_tree(_FREQUENCIES)
+
+        assert flat_tree_to_nodes(flat) == build_huffman_tree(_FREQUENCIES)
+
+    def test_flatten_numbers_nodes_in_preorder(self) -> None:
+        tree = flatten_tree(build_huffman_tree({ord("a"): 1, ord("b"): 2}))
+
+        assert tree == FlatTree(
+            symbol=[-1, ord("a"), ord("b")],
+            left=[1, -1, -1],
+            right=[2, -1, -1],
+            weight=[3, 1, 2],
+            root=0,
+        )
+
+    def test_flatten_round_trips_deep_trees(self) -> None:
+        root = _chain(3000)
+
+        assert flat_tree_to_nodes(flatten_tree(root)) == root
+
+
 class TestHuffmanTreeBuilderFunctions:
     """Test cases for standalone tree builder functions."""
 
@@ -0,0 +1,132 @@
+import random
+from io import BytesIO
+from typing import Callable, List
+
+import pytest
+
+from tdd_ai_py.compression.block_compressor import BlockCompressor
+from tdd_ai_py.compression.block_encoder import encode_block
+from tdd_ai_py.compression.block_format import (
+    BLOCK_HUFFMAN,
+    BLOCK_HUFFMAN_SYNC,
+    decode_sync_points,
+    encode_sync_points,
+)
+from tdd_ai_py.decompression.block_decoder import (
+    decode_block,
+    decode_block_range,
+    decode_encoded_block,
+)
+from tdd_ai_py.decompression.block_decompressor import BlockDecompressor
+
+np = pytest.importorskip("numpy")
+
+_RANDOM = random.Random(11)
+_INPUTS = {
+    "text": b"The quick brown fox jumps over the lazy dog. " * 3001,
+    "random": bytes(_RANDOM.randrange(256) for _ in range(100_003)),
+    "skewed": bytes(min(int(_RANDOM.expovariate(0.3)), 255) for _ in range(50_000)),
+    "single_byte": b"z" * 70_001,
+}
+
+
+def _compress(data: bytes, sync_interval: int) -> bytes:
+    output_stream = BytesIO()
+    BlockCompressor(block_size=1 << 16, sync_interval=sync_interval).compress(
+        BytesIO(data), output_stream
+    )
+    return output_stream.getvalue()
+
+
+def _decompress(compressed: bytes, use_numpy: bool, jobs: int = 1) -> bytes:
+    output_stream = BytesIO()
+    BlockDecompressor(jobs, use_numpy=use_numpy).decompress(
+        BytesIO(compressed), output_stream
+    )
+    return output_stream.getvalue()
+
+
+def _replace_sync_points(block_payload: bytes, offsets: List[int]) -> bytes:
+    sync_interval, _, position = decode_sync_points(block_payload)
+    return encode_sync_points(sync_interval, offsets) + block_payload[position:]
+
+
+class TestNumpyDecoder:
+    @pytest.mark.parametrize("sync_interval", [1, 100, 256])
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_output_matches_python_engine(self, data: bytes, sync_interval: int) -> None:
+        compressed = _compress(data, sync_interval)
+
+        assert _decompress(compressed, True) == _decompress(compressed, False) == data
+
+    def test_decodes_sync_blocks_on_worker_processes(self) -> None:
+        data = _INPUTS["text"]
+
+        assert _decompress(_compress(data, 256), True, jobs=2) == data
+
+    def test_writes_sync_points_only_past_one_interval(self) -> None:
+        data = _INPUTS["skewed"][:1000]
+
+        assert encode_block(data, sync_interval=1000).block_type == BLOCK_HUFFMAN
+        assert encode_block(data, sync_interval=999).block_type == BLOCK_HUFFMAN_SYNC
+
+    @pytest.mark.parametrize("use_numpy", [False, True], ids=["python", "numpy"])
+    def test_sync_offsets_match_either_encoder(self, use_numpy: bool) -> None:
+        data = _INPUTS["skewed"]
+
+        block = encode_block(data, use_numpy=use_numpy, sync_interval=300)
+
+        assert block == encode_block(data, use_numpy=not use_numpy, sync_interval=300)
+        assert decode_encoded_block(block, use_numpy=True) == data
+
+    def test_python_engine_ignores_sync_points(self) -> None:
+        data = _INPUTS["text"][:5000]
+        block = encode_block(data, sync_interval=256)
+        _, offsets, _ = decode_sync_points(block.payload)
+        payload = _replace_sync_points(block.payload, [0] * len(offsets))
+
+        assert decode_block(BLOCK_HUFFMAN_SYNC, len(data), payload, False) == data
+
+    @pytest.mark.parametrize(
+        "corrupt",
+        [lambda offsets: offsets[:-1], lambda offsets: offsets[:-1] + [1 << 30]],
+        ids=["missing_sync_point", "sync_point_past_end"],
+    )
+    def test_rejects_inconsistent_sync_points(
+        self, corrupt: Callable[[List[int]], List[int]]
+    ) -> None:
+        data = _INPUTS["text"][:5000]
+        block = encode_block(data, sync_interval=256)
+        _, offsets, _ = decode_sync_points(block.payload)
+        payload = _replace_sync_points(block.payload, corrupt(offsets))
+
+        with pytest.raises(ValueError):
+            decode_block(BLOCK_HUFFMAN_SYNC, len(data), payload, True)
+
+    def test_rejects_truncated_sync_block(self) -> None:
+        data = _INPUTS["text"][:5000]
+        block = encode_block(data, sync_interval=256)
+
+        with pytest.raises(ValueError):
+            decode_block(BLOCK_HUFFMAN_SYNC, len(data), block.payload[:-20], True)
+
+    @pytest.mark.parametrize("use_numpy", [False, True], ids=["python", "numpy"])
+    @pytest.mark.parametrize(
+        "start, end", [(0, 1), (255, 257), (300, 4000), (4800, 5000), (4999, 5000)]
+    )
+    def test_range_starts_at_the_nearest_sync_point(
+        self, use_numpy: bool, start: int, end: int
+    ) -> None:
+        data = _INPUTS["skewed"][:5000]
+        block = encode_block(data, sync_interval=256)
+        _, offsets, _ = decode_sync_points(block.payload)
+        # Earlier lanes are never read, so pointing them anywhere is harmless
+        first_lane = start // 256
+        offsets[:first_lane] = [0] * first_lane
+        payload = _replace_sync_points(block.payload, offsets)
+
+        block = block._replace(payload=payload)
+
+        decoded = decode_block_range(block, start, end, use_numpy)
+
+        assert decoded == data[start:end]
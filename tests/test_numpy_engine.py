@@ -0,0 +1,164 @@
+import random
+from collections import Counter
+from io import BytesIO
+from typing import List, Tuple
+
+import pytest
+
+from tdd_ai_py.compression import numpy_engine, run_length
+from tdd_ai_py.compression.bit_writer import BitWriter
+from tdd_ai_py.compression.block_compressor import BlockCompressor
+from tdd_ai_py.compression.block_encoder import encode_block
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.context_compressor import ContextCompressor
+from tdd_ai_py.compression.frequency_counter import (
+    count_context_frequencies,
+    count_wide_frequencies,
+)
+from tdd_ai_py.compression.numpy_engine import (
+    count_contexts,
+    count_frequencies,
+    count_run_length_symbols,
+    count_wide_symbols,
+    encode_chunks,
+    resolve_use_numpy,
+)
+from tdd_ai_py.compression.run_length import count_run_symbols, iter_run_tokens
+from tdd_ai_py.compression.run_length_compressor import RunLengthCompressor
+from tdd_ai_py.compression.wide_compressor import WideCompressor
+
+np = pytest.importorskip("numpy")
+
+_RANDOM = random.Random(10)
+_INPUTS = {
+    "text": b"The quick brown fox jumps over the lazy dog. " * 3001,
+    "random": bytes(_RANDOM.randrange(256) for _ in range(200_001)),
+    "skewed": bytes(min(int(_RANDOM.expovariate(0.3)), 255) for _ in range(100_000)),
+    "single_byte": b"z" * 70_001,
+    "two_bytes": b"ab",
+}
+
+
+def _compress(data: bytes, use_numpy: bool, canonical: bool) -> bytes:
+    output_stream = BytesIO()
+    HuffmanCompressor(canonical=canonical, use_numpy=use_numpy).compress(
+        BytesIO(data), output_stream
+    )
+    return output_stream.getvalue()
+
+
+def _write(
+    chunks: List[bytes], codes_by_byte: List[Tuple[int, int]], use_numpy: bool
+) -> bytes:
+    output_stream = BytesIO()
+    bit_writer = BitWriter(output_stream)
+    bit_writer.write_code(0b101, 3)
+    if use_numpy:
+        encode_chunks(chunks, codes_by_byte, bit_writer)
+    else:
+        for chunk in chunks:
+            bit_writer.write_codes(map(codes_by_byte.__getitem__, chunk))
+    bit_writer.flush()
+    return output_stream.getvalue()
+
+
+class TestNumpyEngine:
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_output_matches_python_engine(self, data: bytes, canonical: bool) -> None:
+        assert _compress(data, True, canonical) == _compress(data, False, canonical)
+
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_block_output_matches_python_engine(self, data: bytes) -> None:
+        assert encode_block(data, use_numpy=True) == encode_block(data, use_numpy=False)
+
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_context_output_matches_python_engine(self, data: bytes) -> None:
+        outputs = []
+        for use_numpy in (True, False):
+            output_stream = BytesIO()
+            ContextCompressor(use_numpy=use_numpy).compress_buffer(data, output_stream)
+            outputs.append(output_stream.getvalue())
+
+        assert outputs[0] == outputs[1]
+
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_wide_output_matches_python_engine(self, data: bytes) -> None:
+        outputs = []
+        for use_numpy in (True, False):
+            output_stream = BytesIO()
+            WideCompressor(use_numpy=use_numpy).compress_buffer(data, output_stream)
+            outputs.append(output_stream.getvalue())
+
+        assert outputs[0] == outputs[1]
+
+    def test_counts_wide_symbols_by_value(self) -> None:
+        chunks = [_INPUTS["skewed"][:5000], _INPUTS["skewed"][5000:9000]]
+
+        assert list(count_wide_symbols(chunks).items()) == list(
+            count_wide_frequencies(chunks).items()
+        )
+
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_run_length_output_matches_python_engine(self, data: bytes) -> None:
+        outputs = []
+        for use_numpy in (True, False):
+            output_stream = BytesIO()
+            RunLengthCompressor(use_numpy=use_numpy).compress_buffer(data, output_stream)
+            outputs.append(output_stream.getvalue())
+
+        assert outputs[0] == outputs[1]
+
+    def test_cuts_and_carries_runs_like_python_engine(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(run_length, "MAX_RUN", 6)
+        monkeypatch.setattr(numpy_engine, "MAX_RUN", 6)
+        data = _INPUTS["skewed"][:3000] + bytes(50) + b"\x01" * 9
+        chunks = [data[i : i + 7] for i in range(0, len(data), 7)]
+
+        assert count_run_length_symbols(chunks) == count_run_symbols(
+            iter_run_tokens(chunks)
+        )
+
+    def test_counts_contexts_across_chunks(self) -> None:
+        data = _INPUTS["skewed"]
+        chunks = [data[i : i + 999] for i in range(0, len(data), 999)] + [b""]
+
+        assert count_contexts(chunks, 7) == count_context_frequencies(chunks, 7)
+
+    def test_counts_in_first_occurrence_order(self) -> None:
+        data = _INPUTS["skewed"]
+        chunks = [data[i : i + 999] for i in range(0, len(data), 999)]
+
+        frequency_map = count_frequencies(chunks)
+
+        assert list(frequency_map.items()) == list(Counter(data).items())
+
+    def test_carries_partial_bytes_across_odd_chunks(self) -> None:
+        codes_by_byte = [
+            (byte_value % 7, 3 + byte_value % 5) for byte_value in range(256)
+        ]
+        chunks = [bytes(range(size)) for size in (1, 3, 0, 8, 255, 2, 1)]
+
+        assert _write(chunks, codes_by_byte, True) == _write(chunks, codes_by_byte, False)
+
+    def test_long_codes_fall_back_to_python(self) -> None:
+        codes_by_byte = [(byte_value, 40) for byte_value in range(256)]
+        chunks = [bytes(range(256))]
+
+        assert _write(chunks, codes_by_byte, True) == _write(chunks, codes_by_byte, False)
+
+    def test_short_inputs_stay_on_python_path(self) -> None:
+        assert resolve_use_numpy(None, 10) is False
+        assert resolve_use_numpy(None, 1 << 20) is True
+        assert resolve_use_numpy(True, 10) is True
+
+    def test_requiring_missing_numpy_raises(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(numpy_engine, "NUMPY_AVAILABLE", False)
+
+        with pytest.raises(ImportError, match="NumPy"):
+            BlockCompressor(use_numpy=True)
+        assert resolve_use_numpy(None) is False
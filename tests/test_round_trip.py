@@ -46,7 +46,8 @@ consequuntur magni dolores eos qui ratione voluptate sequi nesciunt.""",
             "lorem_ipsum",
         ],
     )
-    def test_round_trip_compression(self, test_data: str) -> None:
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_round_trip_compression(self, test_data: str, canonical: bool) -> None:
         """Test that decompress(compress(x)) == x for various inputs."""
         # Convert string to bytes for binary processing
         original_bytes = test_data.encode("utf-8")
@@ -54,7 +55,7 @@ consequuntur magni dolores eos qui ratione voluptate sequi nesciunt.""",
         # Compress the data
         input_stream = BytesIO(original_bytes)
         compressed_stream = BytesIO()
-        compressor = HuffmanCompressor()
+        compressor = HuffmanCompressor(canonical=canonical)
         compressor.compress(input_stream, compressed_stream)
 
         # Get compressed data
@@ -63,7 +64,7 @@ consequuntur magni dolores eos qui ratione voluptate sequi nesciunt.""",
         # Decompress the data
         compressed_input = BytesIO(compressed_data)
         decompressed_stream = BytesIO()
-        decompressor = HuffmanDecompressor()
+        decompressor = HuffmanDecompressor(canonical=canonical)
         decompressor.decompress(compressed_input, decompressed_stream)
         decompressed_bytes = decompressed_stream.getvalue()
 
@@ -73,3 +74,39 @@ consequuntur magni dolores eos qui ratione voluptate sequi nesciunt.""",
         # Convert back to string for additional verification
         decompressed_text = decompressed_bytes.decode("utf-8")
         assert decompressed_text == test_data
+
+    @pytest.mark.parametrize(
+        "original_bytes",
+        [b"", bytes(range(256)) * 4, b"\x00" * 1000 + b"\x01"],
+        ids=["empty", "full_alphabet", "skewed"],
+    )
+    def test_canonical_round_trip_binary(self, original_bytes: bytes) -> None:
+        compressed_stream = BytesIO()
+        HuffmanCompressor(canonical=True).compress(
+            BytesIO(original_bytes), compressed_stream
+        )
+
+        decompressed_stream = BytesIO()
+        HuffmanDecompressor(canonical=True).decompress(
+            BytesIO(compressed_stream.getvalue()), decompressed_stream
+        )
+
+        assert decompressed_stream.getvalue() == original_bytes
+
+    @pytest.mark.parametrize("max_code_length", [9, 12])
+    def test_length_limited_round_trip(self, max_code_length: int) -> None:
+        # Geometric weights give an unlimited Huffman depth of ~16 bits
+        original_bytes = b"".join(
+            bytes([symbol]) * (1 << max(0, 16 - symbol)) for symbol in range(40)
+        )
+        compressed_stream = BytesIO()
+        HuffmanCompressor(canonical=True, max_code_length=max_code_length).compress(
+            BytesIO(original_bytes), compressed_stream
+        )
+
+        decompressed_stream = BytesIO()
+        HuffmanDecompressor(canonical=True).decompress(
+            BytesIO(compressed_stream.getvalue()), decompressed_stream
+        )
+
+        assert decompressed_stream.getvalue() == original_bytes
@@ -0,0 +1,187 @@
+import random
+from io import BytesIO
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from tdd_ai_py.compress import compress_file, compress_stream, parse_args
+from tdd_ai_py.compression import run_length
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.run_length import (
+    RUN_LENGTH_MAGIC,
+    count_run_symbols,
+    iter_run_tokens,
+    run_symbol,
+)
+from tdd_ai_py.compression.run_length_compressor import RunLengthCompressor
+from tdd_ai_py.compression.stage_metrics import MetricsCollector
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor, decompress_bytes
+
+_RANDOM = random.Random(23)
+_INPUTS = {
+    "empty": b"",
+    "one_byte": b"x",
+    "short_runs": b"aabbbcdd" * 40,
+    "zeros": bytes(100_000),
+    "runs_at_edges": b"\xff" * 9 + b"middle" + b"\x00" * 9,
+    "sparse": b"".join(
+        bytes(_RANDOM.randrange(3000)) + _RANDOM.randbytes(_RANDOM.randrange(40))
+        for _ in range(50)
+    ),
+    "random": _RANDOM.randbytes(3000),
+}
+
+
+def _compress(data: bytes) -> bytes:
+    output_stream = BytesIO()
+    RunLengthCompressor(use_numpy=False).compress(BytesIO(data), output_stream)
+    return output_stream.getvalue()
+
+
+def _expand(tokens: List[Tuple[bytes, int]]) -> bytes:
+    output = bytearray()
+    for literals, repeats in tokens:
+        output += literals
+        output += output[-1:] * repeats
+    return bytes(output)
+
+
+class TestRunTokens:
+    def test_codes_long_runs_as_repeats(self) -> None:
+        tokens = list(iter_run_tokens([b"abcccccd" + bytes(1000)]))
+
+        assert tokens == [(b"abc", 4), (b"d", 0), (b"\x00", 999)]
+
+    def test_leaves_runs_below_the_minimum_as_literals(self) -> None:
+        tokens = list(iter_run_tokens([b"aaabbbc"]))
+
+        assert _expand(tokens) == b"aaabbbc"
+        assert all(repeats == 0 for _, repeats in tokens)
+
+    @pytest.mark.parametrize("size", [1, 3, 64, 1000])
+    def test_runs_carry_across_chunks(self, size: int) -> None:
+        data = _INPUTS["sparse"]
+        chunks = [data[start : start + size] for start in range(0, len(data), size)]
+
+        tokens = list(iter_run_tokens(chunks))
+
+        assert _expand(tokens) == data
+        assert count_run_symbols(tokens) == count_run_symbols(iter_run_tokens([data]))
+
+    def test_cuts_runs_beyond_the_largest_class(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(run_length, "MAX_RUN", 6)
+
+        tokens = list(iter_run_tokens([b"x" + b"\x07" * 15]))
+
+        assert tokens == [(b"x", 0), (b"\x07", 5), (b"\x07", 5), (b"\x07\x07\x07", 0)]
+
+    @pytest.mark.parametrize(
+        "repeats, expected",
+        [(1, (256, 0)), (3, (257, 1)), (4, (258, 2)), (1000, (265, 9))],
+    )
+    def test_classes_repeats_by_bit_length(
+        self, repeats: int, expected: Tuple[int, int]
+    ) -> None:
+        assert run_symbol(repeats) == expected
+
+
+class TestRunLengthCompressor:
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_round_trips_through_huffman_decompressor(self, data: bytes) -> None:
+        compressed = _compress(data)
+        output_stream = BytesIO()
+
+        HuffmanDecompressor().decompress(BytesIO(compressed), output_stream)
+
+        assert compressed.startswith(RUN_LENGTH_MAGIC)
+        assert output_stream.getvalue() == data
+        assert decompress_bytes(compressed) == data
+
+    def test_buffer_matches_stream_compression(self) -> None:
+        data = _INPUTS["sparse"]
+        from_buffer = BytesIO()
+        compressor = RunLengthCompressor(use_numpy=False)
+
+        compressor.compress_buffer(memoryview(data), from_buffer)
+
+        assert from_buffer.getvalue() == _compress(data)
+
+    def test_goes_below_one_bit_per_byte(self) -> None:
+        single_table = BytesIO()
+        HuffmanCompressor().compress(BytesIO(_INPUTS["zeros"]), single_table)
+
+        assert len(single_table.getvalue()) > len(_INPUTS["zeros"]) // 8
+        assert len(_compress(_INPUTS["zeros"])) < 16
+
+    def test_beats_single_table_on_sparse_data(self) -> None:
+        single_table = BytesIO()
+        HuffmanCompressor().compress(BytesIO(_INPUTS["sparse"]), single_table)
+
+        assert len(_compress(_INPUTS["sparse"])) < len(single_table.getvalue()) / 4
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_splits_runs_across_output_chunks(self, chunk_size: int) -> None:
+        compressed = _compress(_INPUTS["sparse"])
+        decompressor = HuffmanDecompressor()
+
+        chunks = list(decompressor.iter_decompress(BytesIO(compressed), chunk_size))
+
+        assert b"".join(chunks) == _INPUTS["sparse"]
+        assert max(len(chunk) for chunk in chunks) == chunk_size
+
+    def test_reports_stages(self) -> None:
+        collector = MetricsCollector()
+        compressor = RunLengthCompressor(metrics=collector)
+
+        compressor.compress_buffer(_INPUTS["zeros"], BytesIO())
+
+        encode = next(m for m in collector.stages if m.stage == "encode")
+        assert encode.byte_count == len(_INPUTS["zeros"])
+        assert encode.symbol_count == 2
+
+    def test_rejects_truncated_stream(self) -> None:
+        compressed = _compress(_INPUTS["random"])
+
+        with pytest.raises(ValueError, match="Truncated"):
+            decompress_bytes(compressed[:-20])
+
+    def test_rejects_non_seekable_input(self) -> None:
+        class _PipeStream(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        with pytest.raises(ValueError, match="seekable"):
+            RunLengthCompressor().compress(_PipeStream(b"abc"), BytesIO())
+
+    @pytest.mark.parametrize("max_code_length", [0, 33])
+    def test_rejects_unsupported_code_length_cap(self, max_code_length: int) -> None:
+        with pytest.raises(ValueError, match="max_code_length"):
+            RunLengthCompressor(max_code_length=max_code_length)
+
+    def test_cli_file_round_trip(self, tmp_path: Path) -> None:
+        input_path = tmp_path / "input.bin"
+        input_path.write_bytes(_INPUTS["sparse"])
+        output_stream = BytesIO()
+
+        compress_file(str(input_path), output_stream, mode="run_length")
+
+        assert output_stream.getvalue() == _compress(_INPUTS["sparse"])
+
+    def test_cli_spools_non_seekable_input(self) -> None:
+        class _PipeStream(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        output_stream = BytesIO()
+
+        compress_stream(_PipeStream(_INPUTS["sparse"]), output_stream, mode="run_length")
+
+        assert output_stream.getvalue() == _compress(_INPUTS["sparse"])
+
+    @pytest.mark.parametrize("option", [["--jobs", "2"], ["--wide"], ["--context"]])
+    def test_cli_rejects_run_length_with_other_modes(self, option: List[str]) -> None:
+        with pytest.raises(SystemExit):
+            parse_args(["--run-length", *option, "input.txt"])
@@ -0,0 +1,155 @@
+from io import BytesIO
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from tdd_ai_py.compress import compress_file, compress_stream
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.stage_metrics import (
+    NULL_RECORDER,
+    MetricsCollector,
+    StageMetrics,
+    stage_recorder,
+)
+from tdd_ai_py.decompress import decompress_file
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor
+
+_TEXT = b"Each stage reports its own time, bytes, symbols and bits. " * 200
+
+
+def _stages(collector: MetricsCollector) -> List[str]:
+    return [metrics.stage for metrics in collector.stages]
+
+
+def _compress(canonical: bool, collector: MetricsCollector) -> bytes:
+    output_stream = BytesIO()
+    HuffmanCompressor(canonical=canonical, metrics=collector).compress(
+        BytesIO(_TEXT), output_stream
+    )
+    return output_stream.getvalue()
+
+
+class TestCompressorMetrics:
+    @pytest.mark.parametrize(
+        "canonical, stages",
+        [
+            (False, ["build_tree", "write_header", "generate_codes"]),
+            (True, ["code_lengths", "write_header", "assign_codes"]),
+        ],
+        ids=["tree", "canonical"],
+    )
+    def test_reports_each_stage_in_order(
+        self, canonical: bool, stages: List[str]
+    ) -> None:
+        collector = MetricsCollector()
+
+        _compress(canonical, collector)
+
+        assert _stages(collector) == ["count_frequencies", *stages, "encode", "flush"]
+        assert all(metrics.seconds >= 0 for metrics in collector.stages)
+
+    def test_counts_bytes_symbols_and_bits(self) -> None:
+        collector = MetricsCollector()
+
+        compressed = _compress(False, collector)
+
+        stages = {metrics.stage: metrics for metrics in collector.stages}
+        assert stages["count_frequencies"].byte_count == len(_TEXT)
+        assert stages["build_tree"].symbol_count == len(set(_TEXT))
+        assert stages["encode"].symbol_count == len(_TEXT)
+        total_bits = sum(metrics.bit_count for metrics in collector.stages)
+        assert total_bits == (len(compressed) - 4) * 8
+
+    def test_metrics_do_not_change_output(self) -> None:
+        output_stream = BytesIO()
+        HuffmanCompressor().compress(BytesIO(_TEXT), output_stream)
+
+        assert _compress(False, MetricsCollector()) == output_stream.getvalue()
+
+    def test_sampled_compression_counts_sampled_bytes(self) -> None:
+        collector = MetricsCollector()
+        compressor = HuffmanCompressor(
+            sample_chunks=2, sample_chunk_size=100, metrics=collector
+        )
+
+        compressor.compress_buffer(_TEXT, BytesIO())
+
+        assert collector.stages[0] == collector.stages[0]._replace(byte_count=200)
+
+
+class TestDecompressorMetrics:
+    @pytest.mark.parametrize("canonical", [False, True], ids=["tree", "canonical"])
+    def test_reports_header_and_decode(self, canonical: bool) -> None:
+        compressed = _compress(canonical, MetricsCollector())
+        collector = MetricsCollector()
+
+        data = b"".join(
+            HuffmanDecompressor(canonical=canonical, metrics=collector).iter_decompress(
+                BytesIO(compressed)
+            )
+        )
+
+        assert data == _TEXT
+        assert _stages(collector) == ["read_header", "decode"]
+        assert collector.stages[1].byte_count == len(_TEXT)
+
+
+class TestRecorder:
+    def test_disabled_metrics_use_the_null_recorder(self) -> None:
+        chunks = [b"a", b"b"]
+
+        assert stage_recorder(None) is NULL_RECORDER
+        assert NULL_RECORDER.timed_chunks("decode", chunks) is chunks
+
+    def test_accepts_any_callable(self) -> None:
+        reported: List[StageMetrics] = []
+        recorder = stage_recorder(reported.append)
+
+        recorder.lap("first", byte_count=3)
+        assert list(recorder.timed_chunks("second", [b"ab", b"c"])) == [b"ab", b"c"]
+
+        assert [(m.stage, m.byte_count, m.bit_count) for m in reported] == [
+            ("first", 3, 0),
+            ("second", 3, 24),
+        ]
+
+    def test_collector_totals_repeated_stages(self) -> None:
+        collector = MetricsCollector()
+        collector(StageMetrics("decode", 0.5, 10, 10, 80))
+        collector(StageMetrics("decode", 0.25, 5, 5, 40))
+
+        assert collector.totals() == [StageMetrics("decode", 0.75, 15, 15, 120)]
+        assert collector.format_report().splitlines()[1].startswith("decode")
+
+
+class TestCliStats:
+    @pytest.mark.parametrize("jobs", [None, 2], ids=["single_table", "blocks"])
+    def test_file_round_trip_reports_stages(
+        self, tmp_path: Path, jobs: int | None
+    ) -> None:
+        input_path = tmp_path / "input.txt"
+        input_path.write_bytes(_TEXT)
+        compress_stats = MetricsCollector()
+        decompress_stats = MetricsCollector()
+        compressed = BytesIO()
+        restored = BytesIO()
+
+        compress_file(str(input_path), compressed, jobs, metrics=compress_stats)
+        (tmp_path / "input.huf").write_bytes(compressed.getvalue())
+        decompress_file(str(tmp_path / "input.huf"), restored, metrics=decompress_stats)
+
+        assert restored.getvalue() == _TEXT
+        assert compress_stats.stages and decompress_stats.stages
+        if jobs is not None:
+            assert _stages(compress_stats) == ["compress_blocks"]
+            assert _stages(decompress_stats) == ["decode_blocks"]
+
+    def test_stream_reports_block_bytes(self) -> None:
+        collector = MetricsCollector()
+
+        compress_stream(BytesIO(_TEXT), BytesIO(), jobs=1, metrics=collector)
+
+        (blocks,) = collector.stages
+        assert blocks.stage == "compress_blocks"
+        assert blocks.byte_count == blocks.symbol_count == len(_TEXT)
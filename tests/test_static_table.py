@@ -0,0 +1,50 @@
+from io import BytesIO
+
+import pytest
+
+from tdd_ai_py.compression.static_table import (
+    TABLE_MAGIC,
+    StaticCodeTable,
+    static_codes_by_byte,
+    train_static_table,
+    write_static_table,
+)
+from tdd_ai_py.decompression.static_table_reader import read_static_table
+
+_CORPUS = [b'{"user": "alice", "event": "click"}', b'{"user": "bob", "event": "view"}']
+
+
+class TestStaticTable:
+    def test_trained_table_codes_every_byte(self) -> None:
+        table = train_static_table(_CORPUS, table_id=7)
+
+        assert table.table_id == 7
+        assert sorted(table.code_lengths) == list(range(256))
+        assert max(table.code_lengths.values()) <= 15
+
+    def test_corpus_bytes_get_shorter_codes_than_unseen_ones(self) -> None:
+        table = train_static_table(_CORPUS, table_id=1)
+
+        assert table.code_lengths[ord('"')] < table.code_lengths[0]
+
+    def test_round_trips_through_table_file(self) -> None:
+        table = train_static_table(_CORPUS, table_id=300)
+        stream = BytesIO()
+
+        write_static_table(table, stream)
+        stream.seek(0)
+
+        assert stream.getvalue().startswith(TABLE_MAGIC + b"\xac\x02")
+        assert read_static_table(stream) == table
+
+    def test_rejects_file_without_magic(self) -> None:
+        with pytest.raises(ValueError, match="Not a Huffman static code table"):
+            read_static_table(BytesIO(b"\x00\x00\x00\x00"))
+
+    def test_rejects_negative_table_id(self) -> None:
+        with pytest.raises(ValueError, match="table_id must be non-negative"):
+            train_static_table(_CORPUS, table_id=-1)
+
+    def test_rejects_tables_missing_byte_values(self) -> None:
+        with pytest.raises(ValueError, match="must cover all 256 byte values"):
+            static_codes_by_byte(StaticCodeTable(3, {ord("a"): 1, ord("b"): 1}))
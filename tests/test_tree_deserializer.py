@@ -3,9 +3,12 @@ from typing import Callable, List
 
 import pytest
 
-from tdd_ai_py.compression.huffman_tree_builder import HuffmanNode
+from tdd_ai_py.compression.huffman_tree_builder import FlatTree, HuffmanNode
 from tdd_ai_py.decompression.bit_reader import BitReader
-from tdd_ai_py.decompression.tree_deserializer import deserialize_tree
+from tdd_ai_py.decompression.tree_deserializer import (
+    deserialize_flat_tree,
+    deserialize_tree,
+)
 
 from .test_helpers import bits_and_bytes
 
@@ -111,3 +114,36 @@ class TestTreeDeserializer:
         bit_reader = BitReader(byte_stream)
         result = deserialize_tree(bit_reader)
         validator(result)
+
+    def test_deserializes_flat_tree_in_preorder(self) -> None:
+        bits, _ = bits_and_bytes(
+            "0" + "1" + "01100001" + "0" + "1" + "01100010" + "1" + "01100011"
+        )
+
+        tree = deserialize_flat_tree(BitReader(_bits_to_byte_stream(bits)))
+
+        assert tree == FlatTree(
+            symbol=[-1, ord("a"), -1, ord("b"), ord("c")],
+            left=[1, -1, 3, -1, -1],
+            right=[2, -1, 4, -1, -1],
+            weight=[0] * 5,
+            root=0,
+        )
+
+    def test_deserializes_maximal_depth_tree(self) -> None:
+        # 255 internal nodes, each with a leaf on the left: the deepest tree
+        # a 256-symbol alphabet allows.
+        bits = "".join("01" + format(value, "08b") for value in range(255))
+        bits += "1" + format(255, "08b")
+        serialized, _ = bits_and_bytes(bits)
+
+        tree = deserialize_flat_tree(BitReader(_bits_to_byte_stream(serialized)))
+
+        assert len(tree.symbol) == 511
+        assert sorted(value for value in tree.symbol if value >= 0) == list(range(256))
+
+    def test_rejects_more_nodes_than_bytes_allow(self) -> None:
+        serialized, _ = bits_and_bytes("0" * 600)
+
+        with pytest.raises(ValueError, match="too many nodes"):
+            deserialize_flat_tree(BitReader(_bits_to_byte_stream(serialized)))
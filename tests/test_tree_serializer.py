@@ -1,5 +1,9 @@
-from tdd_ai_py.compression.huffman_tree_builder import HuffmanNode
-from tdd_ai_py.compression.tree_serializer import serialize_tree
+from tdd_ai_py.compression.huffman_tree_builder import (
+    HuffmanNode,
+    build_flat_tree,
+    build_huffman_tree,
+)
+from tdd_ai_py.compression.tree_serializer import serialize_flat_tree, serialize_tree
 
 from .test_helpers import bits_and_bytes
 
@@ -55,3 +59,10 @@ class TestTreeSerializer:
         expected = "0" + "1" + "01100001" + "0" + "1" + "01100010" + "1" + "01100011"
         expected_bits, _ = bits_and_bytes(expected)
         assert result == expected_bits
+
+    def test_flat_tree_serializes_to_the_same_bits(self) -> None:
+        frequencies = {byte: byte % 17 + 1 for byte in range(0, 256, 3)}
+
+        assert serialize_flat_tree(build_flat_tree(frequencies)) == serialize_tree(
+            build_huffman_tree(frequencies)
+        )
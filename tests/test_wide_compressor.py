@@ -0,0 +1,146 @@
+import random
+from io import BytesIO
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from tdd_ai_py.compress import compress_file, compress_stream, parse_args
+from tdd_ai_py.compression.compressor import HuffmanCompressor
+from tdd_ai_py.compression.frequency_counter import count_wide_frequencies
+from tdd_ai_py.compression.stage_metrics import MetricsCollector
+from tdd_ai_py.compression.stream_utils import (
+    iter_even_chunks,
+    wide_symbol_bytes,
+    wide_symbols,
+)
+from tdd_ai_py.compression.wide_compressor import WIDE_MAGIC, WideCompressor
+from tdd_ai_py.decompression.decompressor import HuffmanDecompressor, decompress_bytes
+
+_RANDOM = random.Random(22)
+_INPUTS = {
+    "empty": b"",
+    "one_byte": b"x",
+    "odd_length": b"abcde" * 61,
+    "single_pair": b"qq" * 300,
+    "all_pairs_of_a_byte": bytes(range(256)) * 4 + b"!",
+    "text": b"Sixteen-bit symbols halve the work per byte. " * 80,
+    "skewed": bytes(min(int(_RANDOM.expovariate(3.0)), 255) for _ in range(6000)),
+}
+
+
+def _compress(data: bytes) -> bytes:
+    output_stream = BytesIO()
+    WideCompressor(use_numpy=False).compress(BytesIO(data), output_stream)
+    return output_stream.getvalue()
+
+
+class TestWideSymbols:
+    def test_reads_big_endian_pairs(self) -> None:
+        symbols = wide_symbols(b"\x01\x02\xff\x00")
+
+        assert list(symbols) == [0x0102, 0xFF00]
+        assert wide_symbol_bytes(symbols) == b"\x01\x02\xff\x00"
+
+    def test_even_chunks_carry_odd_bytes_and_pad_the_last(self) -> None:
+        chunks = list(iter_even_chunks([b"abc", memoryview(b"d"), b"", b"efg"]))
+
+        assert all(len(chunk) % 2 == 0 for chunk in chunks)
+        assert b"".join(bytes(chunk) for chunk in chunks) == b"abcdefg\x00"
+
+    def test_counts_symbols_by_value(self) -> None:
+        assert list(count_wide_frequencies([b"bbaabb"]).items()) == [
+            (0x6161, 1),
+            (0x6262, 2),
+        ]
+
+
+class TestWideCompressor:
+    @pytest.mark.parametrize("data", _INPUTS.values(), ids=_INPUTS.keys())
+    def test_round_trips_through_huffman_decompressor(self, data: bytes) -> None:
+        compressed = _compress(data)
+        output_stream = BytesIO()
+
+        HuffmanDecompressor().decompress(BytesIO(compressed), output_stream)
+
+        assert compressed.startswith(WIDE_MAGIC + bytes([16]))
+        assert output_stream.getvalue() == data
+        assert decompress_bytes(compressed) == data
+
+    def test_buffer_matches_stream_compression(self) -> None:
+        data = _INPUTS["odd_length"]
+        from_buffer = BytesIO()
+
+        WideCompressor(use_numpy=False).compress_buffer(memoryview(data), from_buffer)
+
+        assert from_buffer.getvalue() == _compress(data)
+
+    def test_beats_byte_codes_on_skewed_data(self) -> None:
+        byte_coded = BytesIO()
+        HuffmanCompressor().compress(BytesIO(_INPUTS["skewed"]), byte_coded)
+
+        assert len(_compress(_INPUTS["skewed"])) < len(byte_coded.getvalue()) * 0.8
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 100])
+    def test_decodes_in_small_chunks(self, chunk_size: int) -> None:
+        compressed = _compress(_INPUTS["odd_length"])
+        decompressor = HuffmanDecompressor()
+
+        chunks = list(decompressor.iter_decompress_buffer(compressed, chunk_size))
+
+        assert b"".join(chunks) == _INPUTS["odd_length"]
+        assert max(len(chunk) for chunk in chunks) <= max(2, chunk_size)
+
+    def test_reports_symbols_not_bytes(self) -> None:
+        collector = MetricsCollector()
+        WideCompressor(metrics=collector).compress_buffer(_INPUTS["text"], BytesIO())
+
+        encode = next(m for m in collector.stages if m.stage == "encode")
+        assert encode.byte_count == len(_INPUTS["text"])
+        assert encode.symbol_count == len(_INPUTS["text"]) // 2
+
+    def test_rejects_truncated_stream(self) -> None:
+        compressed = _compress(_INPUTS["text"])
+
+        with pytest.raises(ValueError, match="Truncated"):
+            decompress_bytes(compressed[:-20])
+
+    def test_rejects_unknown_symbol_width(self) -> None:
+        compressed = bytearray(_compress(_INPUTS["text"]))
+        compressed[len(WIDE_MAGIC)] = 12
+
+        with pytest.raises(ValueError, match="symbol width"):
+            decompress_bytes(bytes(compressed))
+
+    def test_rejects_non_seekable_input(self) -> None:
+        class _PipeStream(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        with pytest.raises(ValueError, match="seekable"):
+            WideCompressor().compress(_PipeStream(b"abc"), BytesIO())
+
+    def test_cli_file_round_trip(self, tmp_path: Path) -> None:
+        input_path = tmp_path / "input.bin"
+        input_path.write_bytes(_INPUTS["skewed"])
+        output_stream = BytesIO()
+
+        compress_file(str(input_path), output_stream, mode="wide")
+
+        assert decompress_bytes(output_stream.getvalue()) == _INPUTS["skewed"]
+
+    def test_cli_spools_non_seekable_input(self) -> None:
+        class _PipeStream(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        output_stream = BytesIO()
+
+        compress_stream(_PipeStream(_INPUTS["text"]), output_stream, mode="wide")
+
+        assert output_stream.getvalue() == _compress(_INPUTS["text"])
+
+    @pytest.mark.parametrize("option", [["--jobs", "2"], ["--adaptive"], ["--context"]])
+    def test_cli_rejects_wide_with_other_modes(self, option: List[str]) -> None:
+        with pytest.raises(SystemExit):
+            parse_args(["--wide", *option, "input.txt"])